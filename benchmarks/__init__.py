@@ -0,0 +1,6 @@
+"""
+Benchmarks, run as `python -m benchmarks.<name>`; see each module for options.
+"""
+
+# Registers every mapped class, which mapper configuration needs.
+from screenscout.auth import models  # noqa: F401
@@ -0,0 +1,136 @@
+"""
+Benchmark of catalog filters served by the `movie_catalog` read model against
+the join-based plan it replaced.
+
+    python -m benchmarks.catalog --movies 1000000 --runs 50
+
+Seeds synthetic movies with genres, countries and languages in a rolled back
+transaction. Each filter is timed through `movie.service.get_all`, which
+resolves it with array predicates on the read model, and as the equivalent
+EXISTS subqueries through the association tables.
+"""
+
+import argparse
+import asyncio
+from datetime import date
+from typing import Any
+
+from sqlalchemy import ColumnElement, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from screenscout.catalog import MatchMode
+from screenscout.country.models import Country
+from screenscout.fieldsets import Fieldset
+from screenscout.genre.models import Genre
+from screenscout.language.models import Language
+from screenscout.movie import service as movie_service
+from screenscout.movie.models import Movie
+
+from .common import Timing, measure, print_timings, rollback_session, seed_catalog
+
+# Only ids are loaded, so the timings are those of the filter itself.
+ID_ONLY = Fieldset(columns=[], relations=[])
+
+
+def _join_filters(
+    *,
+    genre_ids: list[int] | None = None,
+    genre_match: MatchMode = MatchMode.ANY,
+    country_ids: list[int] | None = None,
+    language_ids: list[int] | None = None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+) -> list[ColumnElement[bool]]:
+    """The same filters as EXISTS subqueries through the association tables."""
+    filters: list[ColumnElement[bool]] = []
+
+    if genre_ids and genre_match == MatchMode.ALL:
+        filters.extend(Movie.genres.any(Genre.id == genre_id) for genre_id in genre_ids)
+    elif genre_ids:
+        filters.append(Movie.genres.any(Genre.id.in_(genre_ids)))
+
+    if country_ids:
+        filters.append(Movie.country.any(Country.id.in_(country_ids)))
+
+    if language_ids:
+        filters.append(Movie.language.any(Language.id.in_(language_ids)))
+
+    if year_from is not None:
+        filters.append(Movie.production_year >= date(year_from, 1, 1))
+
+    if year_to is not None:
+        filters.append(Movie.production_year <= date(year_to, 12, 31))
+
+    return filters
+
+
+async def _join_query(db_session: AsyncSession, filters: dict[str, Any]) -> None:
+    query = (
+        select(Movie.id)
+        .where(and_(*_join_filters(**filters)))
+        .order_by(Movie.id)
+        .limit(20)
+    )
+    (await db_session.execute(query)).all()
+
+
+async def run(movies: int, runs: int) -> list[Timing]:
+    timings = []
+
+    async with rollback_session() as db_session:
+        ids = await seed_catalog(db_session, movies=movies)
+        genres, countries, languages = (
+            ids["genres"],
+            ids["countries"],
+            ids["languages"],
+        )
+
+        cases: dict[str, dict[str, Any]] = {
+            "common genre": dict(genre_ids=genres[:1]),
+            "rare genre": dict(genre_ids=genres[-1:]),
+            "any of 3 genres": dict(genre_ids=genres[3:6]),
+            "all of 2 genres": dict(genre_ids=genres[:2], genre_match=MatchMode.ALL),
+            "2 countries, 1990-1999": dict(
+                country_ids=countries[2:4], year_from=1990, year_to=1999
+            ),
+            "all of 2 genres, language, 2000-": dict(
+                genre_ids=genres[1:3],
+                genre_match=MatchMode.ALL,
+                language_ids=languages[4:5],
+                year_from=2000,
+            ),
+        }
+
+        for name, filters in cases.items():
+            timings.append(
+                await measure(
+                    f"read model  {name}",
+                    lambda: movie_service.get_all(
+                        db_session=db_session, fieldset=ID_ONLY, **filters
+                    ),
+                    runs=runs,
+                )
+            )
+            timings.append(
+                await measure(
+                    f"joins       {name}",
+                    lambda: _join_query(db_session, filters),
+                    runs=runs,
+                )
+            )
+
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark catalog filters.")
+    parser.add_argument("--movies", type=int, default=200_000)
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    print_timings(asyncio.run(run(args.movies, args.runs)))
+
+
+if __name__ == "__main__":
+    main()
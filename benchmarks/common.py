@@ -0,0 +1,175 @@
+"""
+Helpers shared by the benchmarks.
+
+Database benchmarks run against the configured database inside a transaction
+that is rolled back at the end, so synthetic rows never outlive a run.
+"""
+
+import statistics
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from screenscout.database.core import async_engine
+from screenscout.models import ScreenScoutBase
+
+TITLE_WORDS = (
+    "The Dark Godfather Star Night Return Lost City Silent River Last Empire "
+    "Golden Shadow Winter Road Iron Blue Secret Garden Storm King Ghost Summer"
+).split()
+
+SEED_PERSONS = """
+    INSERT INTO persons (name) VALUES ('Benchmark Director') RETURNING id
+"""
+
+SEED_MOVIES = """
+    INSERT INTO movies (
+        title, production_year, director_id, "IMDb_rating", description,
+        age_category, duration
+    )
+    SELECT
+        words[1 + g % array_length(words, 1)] || ' '
+            || words[1 + (g / 7) % array_length(words, 1)] || ' '
+            || words[1 + (g / 53) % array_length(words, 1)] || ' ' || g,
+        make_date(1950 + g % 75, 1 + g % 12, 1),
+        :director_id,
+        round((1 + (g * 37) % 90 / 10.0)::numeric, 1),
+        'A synthetic movie about '
+            || words[1 + (g / 3) % array_length(words, 1)] || ' and '
+            || words[1 + (g / 11) % array_length(words, 1)],
+        '16+',
+        80 + g % 100
+    FROM generate_series(1, :movies) AS g, (SELECT CAST(:words AS text[])) AS w(words)
+"""
+
+
+SEED_REFERENCES = """
+    INSERT INTO {table} (name)
+    SELECT 'Benchmark {table} ' || g FROM generate_series(1, :count) AS g
+    RETURNING id
+"""
+
+# Links every seeded movie to `per_movie` of `ids`, skewed towards the first
+# ones, so that some ids are common and others rare.
+SEED_LINKS = """
+    INSERT INTO {table} (movie_id, {target})
+    SELECT DISTINCT m.id, ids[
+        1 + floor(
+            array_length(ids, 1)
+            * power(((m.id * 7919 + k * 104729) % 10007) / 10007.0, 2)
+        )::integer
+    ]
+    FROM movies m, generate_series(1, :per_movie) AS k,
+        (SELECT CAST(:ids AS integer[])) AS r(ids)
+    WHERE m.director_id = :director_id
+"""
+
+
+class Timing(ScreenScoutBase):
+    name: str
+    runs: int
+    median_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+@asynccontextmanager
+async def rollback_session() -> AsyncIterator[AsyncSession]:
+    """A session whose whole transaction is rolled back on exit."""
+    async with async_engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            yield AsyncSession(bind=connection, expire_on_commit=False)
+        finally:
+            await transaction.rollback()
+
+
+async def seed_movies(db_session: AsyncSession, *, movies: int) -> int:
+    """Inserts `movies` synthetic movies, returning the id of their director."""
+    director_id: int = (await db_session.execute(text(SEED_PERSONS))).scalar_one()
+    await db_session.execute(
+        text(SEED_MOVIES),
+        {"director_id": director_id, "movies": movies, "words": TITLE_WORDS},
+    )
+    await db_session.execute(text("ANALYZE movies"))
+
+    return director_id
+
+
+async def seed_catalog(
+    db_session: AsyncSession, *, movies: int
+) -> dict[str, list[int]]:
+    """Inserts synthetic movies with genres, countries and languages.
+
+    Returns the ids of the new genres, countries and languages, most linked
+    first.
+    """
+    director_id = await seed_movies(db_session, movies=movies)
+
+    ids = {}
+    for table, link_table, target, count, per_movie in (
+        ("genres", "movie_genre", "genre_id", 20, 2),
+        ("countries", "movie_country", "country_id", 40, 2),
+        ("languages", "movie_language", "language_id", 15, 1),
+    ):
+        result = await db_session.execute(
+            text(SEED_REFERENCES.format(table=table)), {"count": count}
+        )
+        ids[table] = list(result.scalars())
+
+        await db_session.execute(
+            text(SEED_LINKS.format(table=link_table, target=target)),
+            {"ids": ids[table], "per_movie": per_movie, "director_id": director_id},
+        )
+
+    for table in ("movie_genre", "movie_country", "movie_language", "movie_catalog"):
+        await db_session.execute(text(f"ANALYZE {table}"))
+
+    return ids
+
+
+async def measure(
+    name: str, call: Callable[[], Awaitable[Any]], *, runs: int, warmup: int = 3
+) -> Timing:
+    """Times `runs` awaits of `call` after `warmup` untimed ones."""
+    for _ in range(warmup):
+        await call()
+
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return timing(name, samples)
+
+
+def timing(name: str, samples: list[float]) -> Timing:
+    ordered = sorted(samples)
+
+    return Timing(
+        name=name,
+        runs=len(ordered),
+        median_ms=round(statistics.median(ordered), 3),
+        p95_ms=round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        p99_ms=round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 3),
+        max_ms=round(ordered[-1], 3),
+    )
+
+
+def print_timings(timings: list[Timing]) -> None:
+    width = max(len(timing.name) for timing in timings)
+    print(
+        f"{'':<{width}}  {'runs':>6}  {'median ms':>10}  {'p95 ms':>10}  "
+        f"{'p99 ms':>10}  {'max ms':>10}"
+    )
+    for t in timings:
+        print(
+            f"{t.name:<{width}}  {t.runs:>6}  {t.median_ms:>10.3f}  "
+            f"{t.p95_ms:>10.3f}  {t.p99_ms:>10.3f}  {t.max_ms:>10.3f}"
+        )
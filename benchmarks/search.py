@@ -0,0 +1,66 @@
+"""
+Benchmark of catalog title search against the `ilike` title filter.
+
+    python -m benchmarks.search --movies 1000000 --runs 50
+
+Seeds synthetic movies in a rolled back transaction and times
+`movie.service.get_all` with `search` (full-text and trigram indexes, typo
+tolerant and ranked by relevance) and with `title` (`ilike '%term%'`, which
+the trigram index on `title` also answers, but only for exact substrings) for
+the same terms.
+"""
+
+import argparse
+import asyncio
+
+from screenscout.fieldsets import Fieldset
+from screenscout.movie import service as movie_service
+
+from .common import Timing, measure, print_timings, rollback_session, seed_movies
+
+TERMS = ["godfather", "dark city", "silent river", "godfahter", "ghost 4711"]
+
+# Only ids are loaded, so the timings are those of the filter itself.
+ID_ONLY = Fieldset(columns=[], relations=[])
+
+
+async def run(movies: int, runs: int) -> list[Timing]:
+    timings = []
+
+    async with rollback_session() as db_session:
+        await seed_movies(db_session, movies=movies)
+
+        for term in TERMS:
+            timings.append(
+                await measure(
+                    f"search {term!r}",
+                    lambda: movie_service.get_all(
+                        db_session=db_session, search=term, fieldset=ID_ONLY
+                    ),
+                    runs=runs,
+                )
+            )
+            timings.append(
+                await measure(
+                    f"ilike  {term!r}",
+                    lambda: movie_service.get_all(
+                        db_session=db_session, title=term, fieldset=ID_ONLY
+                    ),
+                    runs=runs,
+                )
+            )
+
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark title search.")
+    parser.add_argument("--movies", type=int, default=200_000)
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    print_timings(asyncio.run(run(args.movies, args.runs)))
+
+
+if __name__ == "__main__":
+    main()
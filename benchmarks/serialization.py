@@ -0,0 +1,152 @@
+"""
+Microbenchmark of the list response path, in requests per second on one core.
+
+    python -m benchmarks.serialization --items 100 --seconds 5
+
+Serves the same page of in-memory `Movie` rows from a bare FastAPI app four
+ways and drives each endpoint in-process for a fixed time:
+
+- `response_model`: FastAPI validates the rows against `list[MovieRead]`,
+  dumps them and encodes them with the stdlib json module (the old path).
+- `json_response`: one `TypeAdapter` validation and pydantic-core encoding.
+- `cache hit, JsonCoder`: fastapi-cache's default coder decodes the cached
+  JSON, which FastAPI then validates and encodes again (the old hit path).
+- `cache hit, ORJSONCoder`: the cached bytes are sent as they are.
+
+No database or Redis is needed.
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date
+from typing import Any
+
+import httpx
+from fastapi import FastAPI
+from fastapi_cache.coder import JsonCoder
+
+from screenscout.cache.coder import ORJSONCoder
+from screenscout.country.models import Country
+from screenscout.genre.models import Genre
+from screenscout.language.models import Language
+from screenscout.models import ScreenScoutBase
+from screenscout.movie.models import Movie, MovieRead
+from screenscout.responses import json_response
+
+
+class Throughput(ScreenScoutBase):
+    name: str
+    requests: int
+    requests_per_second: float
+    response_bytes: int
+
+
+def movies(count: int) -> list[Movie]:
+    """Builds `count` transient movies with a few related rows each."""
+    genres = [Genre(id=id, name=f"Genre {id}") for id in range(1, 21)]
+    countries = [Country(id=id, name=f"Country {id}") for id in range(1, 41)]
+    languages = [Language(id=id, name=f"Language {id}") for id in range(1, 16)]
+
+    return [
+        Movie(
+            id=id,
+            title=f"Movie {id}",
+            production_year=date(1950 + id % 75, 1 + id % 12, 1),
+            IMDb_rating=round(1 + id * 37 % 90 / 10, 1),
+            description="A synthetic movie description. " * 8,
+            director_id=1 + id % 500,
+            age_category="16+",
+            duration=80 + id % 100,
+            poster_url=f"https://example.com/posters/{id}.jpg",
+            trailer_url=f"https://example.com/trailers/{id}",
+            budget=1_000_000 * (1 + id % 90),
+            box_office=3_000_000 * (1 + id % 70),
+            genres=[genres[id % 20], genres[(id * 7) % 20]],
+            country=[countries[id % 40]],
+            language=[languages[id % 15]],
+        )
+        for id in range(1, count + 1)
+    ]
+
+
+def build_app(rows: list[Movie]) -> FastAPI:
+    app = FastAPI()
+    # Cache entries of the page as each coder stores it.
+    old_entry = bytes(json_response(list[MovieRead], rows).body)
+    new_entry = ORJSONCoder.encode(json_response(list[MovieRead], rows))
+
+    @app.get("/response_model", response_model=list[MovieRead])
+    async def response_model() -> Any:
+        return rows
+
+    @app.get("/json_response", response_model=list[MovieRead])
+    async def fast_response() -> Any:
+        return json_response(list[MovieRead], rows)
+
+    @app.get("/hit/json_coder", response_model=list[MovieRead])
+    async def json_coder_hit() -> Any:
+        return JsonCoder.decode_as_type(old_entry, type_=list[MovieRead])
+
+    @app.get("/hit/orjson_coder", response_model=list[MovieRead])
+    async def orjson_coder_hit() -> Any:
+        return ORJSONCoder.decode_as_type(new_entry, type_=list[MovieRead])
+
+    return app
+
+
+async def drive(client: httpx.AsyncClient, path: str, *, seconds: float) -> Throughput:
+    """Requests `path` back to back for `seconds`."""
+    for _ in range(10):
+        response = await client.get(path)
+        response.raise_for_status()
+
+    requests = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        await client.get(path)
+        requests += 1
+    elapsed = time.perf_counter() - start
+
+    return Throughput(
+        name=path,
+        requests=requests,
+        requests_per_second=round(requests / elapsed, 1),
+        response_bytes=len(response.content),
+    )
+
+
+async def run(items: int, seconds: float) -> list[Throughput]:
+    app = build_app(movies(items))
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        return [
+            await drive(client, path, seconds=seconds)
+            for path in (
+                "/response_model",
+                "/json_response",
+                "/hit/json_coder",
+                "/hit/orjson_coder",
+            )
+        ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark list serialization.")
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    for result in asyncio.run(run(args.items, args.seconds)):
+        print(
+            f"{result.name:<20}  {result.requests_per_second:>10.1f} req/s  "
+            f"{result.response_bytes:>8} bytes"
+        )
+
+
+if __name__ == "__main__":
+    main()
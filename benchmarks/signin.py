@@ -0,0 +1,153 @@
+"""
+Benchmark of catalog latency during a sign-in storm, in milliseconds.
+
+    python -m benchmarks.signin --storm 8 --seconds 5
+
+A bare FastAPI app serves a page of in-memory movies next to a sign-in
+endpoint that checks a bcrypt hash of cost `BCRYPT_ROUNDS`. The catalog is
+requested every `--interval` seconds, each request timed from when it was
+due, while `--storm` clients sign in back to back:
+
+- `idle`: no sign-ins, the baseline.
+- `storm, hash on the loop`: the handler calls `pwd_context.verify` itself
+  (the old path), so each check stalls every other request.
+- `storm, hash pool`: the handler awaits `verify_password`, which runs the
+  check on one of the `PASSWORD_HASH_WORKERS` threads.
+
+Compare the p99 column. No database or Redis is needed.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any
+
+import httpx
+from fastapi import FastAPI
+
+from screenscout.movie.models import Movie, MovieRead
+from screenscout.responses import json_response
+from screenscout.security import password_hasher, pwd_context, verify_password
+
+from .common import Timing, print_timings, timing
+from .serialization import movies
+
+PASSWORD = "benchmark-password"
+
+
+def build_app(rows: list[Movie], hashed_password: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/movies", response_model=list[MovieRead])
+    async def get_movies() -> Any:
+        return json_response(list[MovieRead], rows)
+
+    @app.post("/signin/loop")
+    async def signin_on_loop() -> Any:
+        return {"valid": pwd_context.verify(PASSWORD, hashed_password)}
+
+    @app.post("/signin/pool")
+    async def signin_in_pool() -> Any:
+        valid, _ = await verify_password(PASSWORD, hashed_password)
+        return {"valid": valid}
+
+    return app
+
+
+async def sign_in(client: httpx.AsyncClient, path: str, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        response = await client.post(path)
+        response.raise_for_status()
+        # In-process requests need not suspend, so yield to the other clients.
+        await asyncio.sleep(0)
+
+
+async def get_catalog(
+    client: httpx.AsyncClient, due: float, samples: list[float]
+) -> None:
+    response = await client.get("/movies")
+    response.raise_for_status()
+    samples.append((time.perf_counter() - due) * 1000)
+
+
+async def probe(
+    client: httpx.AsyncClient,
+    name: str,
+    *,
+    signin_path: str | None,
+    storm: int,
+    seconds: float,
+    interval: float,
+) -> Timing:
+    """Times catalog requests for `seconds` while `storm` clients sign in.
+
+    A request is sent every `interval` seconds whatever the previous ones are
+    doing and is timed from when it was due, so a stalled event loop delays
+    every request that should have been served meanwhile.
+    """
+    stop = asyncio.Event()
+    signing_in = []
+    if signin_path is not None:
+        signing_in = [
+            asyncio.create_task(sign_in(client, signin_path, stop))
+            for _ in range(storm)
+        ]
+
+    samples: list[float] = []
+    requests = []
+    start = time.perf_counter()
+    for n in range(int(seconds / interval)):
+        due = start + n * interval
+        if due > time.perf_counter():
+            await asyncio.sleep(due - time.perf_counter())
+        requests.append(asyncio.create_task(get_catalog(client, due, samples)))
+
+    stop.set()
+    await asyncio.gather(*requests, *signing_in)
+
+    return timing(name, samples)
+
+
+async def run(items: int, storm: int, seconds: float, interval: float) -> list[Timing]:
+    hashed_password = pwd_context.hash(PASSWORD)
+    app = build_app(movies(items), hashed_password)
+    transport = httpx.ASGITransport(app=app)
+
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            return [
+                await probe(
+                    client,
+                    name,
+                    signin_path=signin_path,
+                    storm=storm,
+                    seconds=seconds,
+                    interval=interval,
+                )
+                for name, signin_path in (
+                    ("idle", None),
+                    ("storm, hash on the loop", "/signin/loop"),
+                    ("storm, hash pool", "/signin/pool"),
+                )
+            ]
+    finally:
+        password_hasher.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark catalog latency during a sign-in storm."
+    )
+    parser.add_argument("--items", type=int, default=20)
+    parser.add_argument("--storm", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--interval", type=float, default=0.01)
+    args = parser.parse_args()
+
+    print_timings(asyncio.run(run(args.items, args.storm, args.seconds, args.interval)))
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,9 @@ from screenscout.database.core import Base
 from screenscout.genre import models
 from screenscout.language import models
 from screenscout.movie import models
+from screenscout.movie_list import models
 from screenscout.person import models
+from screenscout.series_list import models
 from screenscout.config import settings
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,153 @@
+"""Primary keys and reverse indexes for association tables
+
+Revision ID: 29119163f5d9
+Revises: 9a7075061ccd
+Create Date: 2026-10-18 13:26:51.204417
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "29119163f5d9"
+down_revision: Union[str, None] = "9a7075061ccd"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, owner column, target column). The primary key covers lookups by
+# owner, the reverse index covers `.any()` filters and lookups by target.
+ASSOCIATION_TABLES = [
+    ("movie_genre", "movie_id", "genre_id"),
+    ("movie_country", "movie_id", "country_id"),
+    ("movie_language", "movie_id", "language_id"),
+    ("series_genre", "series_id", "genre_id"),
+    ("series_country", "series_id", "country_id"),
+    ("series_language", "series_id", "language_id"),
+    ("series_director", "series_id", "director_id"),
+    ("person_genre", "person_id", "genre_id"),
+    ("person_career_role", "person_id", "career_role_id"),
+    ("movie_list_movie", "movie_list_id", "movie_id"),
+    ("series_list_series", "series_list_id", "series_id"),
+]
+
+FOREIGN_KEY_INDEXES = [
+    ("movies", "director_id"),
+    ("user_watchlist_movies", "movie_id"),
+    ("user_watchlist_series", "series_id"),
+]
+
+
+def _create_list_tables() -> None:
+    """Creates the list tables, which were never part of a migration."""
+    inspector = sa.inspect(op.get_bind())
+
+    for name, link_table, item_table, item_column in (
+        ("movie_list", "movie_list_movie", "movies", "movie_id"),
+        ("series_list", "series_list_series", "series", "series_id"),
+    ):
+        if not inspector.has_table(f"{name}s"):
+            op.create_table(
+                f"{name}s",
+                sa.Column("id", sa.Integer(), nullable=False),
+                sa.Column("name", sa.String(), nullable=False),
+                sa.Column("description", sa.Text(), nullable=False),
+                sa.PrimaryKeyConstraint("id", name=op.f(f"pk_{name}s")),
+            )
+
+        if not inspector.has_table(link_table):
+            op.create_table(
+                link_table,
+                sa.Column(f"{name}_id", sa.Integer(), nullable=True),
+                sa.Column(item_column, sa.Integer(), nullable=True),
+                sa.ForeignKeyConstraint(
+                    [f"{name}_id"],
+                    [f"{name}s.id"],
+                    name=op.f(f"fk_{link_table}_{name}_id_{name}s"),
+                ),
+                sa.ForeignKeyConstraint(
+                    [item_column],
+                    [f"{item_table}.id"],
+                    name=op.f(f"fk_{link_table}_{item_column}_{item_table}"),
+                ),
+            )
+
+
+def upgrade() -> None:
+    _create_list_tables()
+
+    # Drop incomplete and duplicate links so the primary keys can be built.
+    for table, owner, target in ASSOCIATION_TABLES:
+        op.execute(f"DELETE FROM {table} WHERE {owner} IS NULL OR {target} IS NULL")
+        op.execute(
+            f"DELETE FROM {table} a USING {table} b "
+            f"WHERE a.ctid < b.ctid AND a.{owner} = b.{owner} "
+            f"AND a.{target} = b.{target}"
+        )
+        op.alter_column(table, owner, existing_type=sa.Integer(), nullable=False)
+        op.alter_column(table, target, existing_type=sa.Integer(), nullable=False)
+
+    # Build every index concurrently so that the catalog stays writable, then
+    # promote the unique ones to primary keys, which only takes a brief lock.
+    with op.get_context().autocommit_block():
+        for table, owner, target in ASSOCIATION_TABLES:
+            op.create_index(
+                f"pk_{table}",
+                table,
+                [owner, target],
+                unique=True,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+            op.create_index(
+                f"ix_{table}_{target}_{owner}",
+                table,
+                [target, owner],
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+        for table, column in FOREIGN_KEY_INDEXES:
+            op.create_index(
+                f"ix_{table}_{column}",
+                table,
+                [column],
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+    for table, _, _ in ASSOCIATION_TABLES:
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT pk_{table} "
+            f"PRIMARY KEY USING INDEX pk_{table}"
+        )
+
+
+def downgrade() -> None:
+    for table, _, _ in ASSOCIATION_TABLES:
+        op.drop_constraint(f"pk_{table}", table, type_="primary")
+
+    with op.get_context().autocommit_block():
+        for table, column in FOREIGN_KEY_INDEXES:
+            op.drop_index(
+                f"ix_{table}_{column}",
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+        for table, owner, target in ASSOCIATION_TABLES:
+            op.drop_index(
+                f"ix_{table}_{target}_{owner}",
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+    for table, owner, target in ASSOCIATION_TABLES:
+        op.alter_column(table, owner, existing_type=sa.Integer(), nullable=True)
+        op.alter_column(table, target, existing_type=sa.Integer(), nullable=True)
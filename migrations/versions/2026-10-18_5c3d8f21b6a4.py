@@ -0,0 +1,194 @@
+"""Denormalized movie and series catalog read models
+
+Revision ID: 5c3d8f21b6a4
+Revises: 29119163f5d9
+Create Date: 2026-10-18 15:42:08.517306
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "5c3d8f21b6a4"
+down_revision: Union[str, None] = "29119163f5d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (catalog table, title table, owner column, association tables as
+# (table, target column, array column)).
+CATALOGS = [
+    (
+        "movie_catalog",
+        "movies",
+        "movie_id",
+        [
+            ("movie_genre", "genre_id", "genre_ids"),
+            ("movie_country", "country_id", "country_ids"),
+            ("movie_language", "language_id", "language_ids"),
+        ],
+    ),
+    (
+        "series_catalog",
+        "series",
+        "series_id",
+        [
+            ("series_genre", "genre_id", "genre_ids"),
+            ("series_country", "country_id", "country_ids"),
+            ("series_language", "language_id", "language_ids"),
+        ],
+    ),
+]
+
+# Association tables get one trigger per event and transition table, since
+# Postgres does not allow transition tables on multi-event triggers.
+LINK_TRIGGERS = [
+    ("insert", "INSERT", "NEW"),
+    ("delete", "DELETE", "OLD"),
+    ("update_old", "UPDATE", "OLD"),
+    ("update_new", "UPDATE", "NEW"),
+]
+
+
+def _refresh_function(catalog: str, table: str, owner: str, links: list) -> str:
+    arrays = ",\n".join(
+        f"ARRAY(SELECT {target} FROM {link} "
+        f"WHERE {owner} = t.id ORDER BY {target})"
+        for link, target, _ in links
+    )
+    array_columns = [column for _, _, column in links]
+    updates = ", ".join(
+        f"{column} = excluded.{column}" for column in ["year", *array_columns]
+    )
+
+    # Transactions changing links of the same title would each rebuild its
+    # arrays from a snapshot without the other's changes, and the last to
+    # commit would win. The titles are locked first, in id order to avoid
+    # deadlocks, so refreshes of a title run one after the other; the upsert
+    # is a separate statement and so sees links committed while waiting.
+    return f"""
+        CREATE FUNCTION refresh_{catalog}(ids integer[]) RETURNS void
+        LANGUAGE sql AS $$
+            SELECT id FROM {table} WHERE id = ANY(ids) ORDER BY id
+            FOR NO KEY UPDATE;
+            INSERT INTO {catalog} ({owner}, year, {", ".join(array_columns)})
+            SELECT t.id, extract(year FROM t.production_year)::integer,
+            {arrays}
+            FROM {table} t
+            WHERE t.id = ANY(ids)
+            ON CONFLICT ({owner}) DO UPDATE SET {updates}
+        $$
+    """
+
+
+def _sync_function(name: str, catalog: str, column: str) -> str:
+    return f"""
+        CREATE FUNCTION {name}() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM refresh_{catalog}(ARRAY(SELECT DISTINCT {column} FROM changed));
+            RETURN NULL;
+        END
+        $$
+    """
+
+
+def _trigger(name: str, table: str, event: str, transition: str, function: str) -> str:
+    return (
+        f"CREATE TRIGGER {name} AFTER {event} ON {table} "
+        f"REFERENCING {transition} TABLE AS changed "
+        f"FOR EACH STATEMENT EXECUTE FUNCTION {function}()"
+    )
+
+
+def upgrade() -> None:
+    for catalog, table, owner, _ in CATALOGS:
+        op.create_table(
+            catalog,
+            sa.Column(owner, sa.Integer(), nullable=False),
+            sa.Column("year", sa.Integer(), nullable=False),
+            sa.Column(
+                "genre_ids",
+                postgresql.ARRAY(sa.Integer()),
+                server_default="{}",
+                nullable=False,
+            ),
+            sa.Column(
+                "country_ids",
+                postgresql.ARRAY(sa.Integer()),
+                server_default="{}",
+                nullable=False,
+            ),
+            sa.Column(
+                "language_ids",
+                postgresql.ARRAY(sa.Integer()),
+                server_default="{}",
+                nullable=False,
+            ),
+            sa.ForeignKeyConstraint(
+                [owner],
+                [f"{table}.id"],
+                name=op.f(f"fk_{catalog}_{owner}_{table}"),
+                ondelete="CASCADE",
+            ),
+            sa.PrimaryKeyConstraint(owner, name=op.f(f"pk_{catalog}")),
+        )
+
+    for catalog, table, owner, links in CATALOGS:
+        op.execute(_refresh_function(catalog, table, owner, links))
+        op.execute(_sync_function(f"sync_{catalog}_titles", catalog, "id"))
+        op.execute(_sync_function(f"sync_{catalog}_links", catalog, owner))
+
+        op.execute(
+            _trigger(
+                f"{catalog}_insert", table, "INSERT", "NEW", f"sync_{catalog}_titles"
+            )
+        )
+        op.execute(
+            _trigger(
+                f"{catalog}_update", table, "UPDATE", "NEW", f"sync_{catalog}_titles"
+            )
+        )
+        for link, _, _ in links:
+            for suffix, event, transition in LINK_TRIGGERS:
+                op.execute(
+                    _trigger(
+                        f"{link}_catalog_{suffix}",
+                        link,
+                        event,
+                        transition,
+                        f"sync_{catalog}_links",
+                    )
+                )
+
+        # Backfill before the indexes exist, which is faster than maintaining
+        # them row by row.
+        op.execute(f"SELECT refresh_{catalog}(ARRAY(SELECT id FROM {table}))")
+
+        op.create_index(op.f(f"ix_{catalog}_year"), catalog, ["year"], unique=False)
+        for _, _, column in links:
+            op.create_index(
+                f"ix_{catalog}_{column}",
+                catalog,
+                [column],
+                unique=False,
+                postgresql_using="gin",
+            )
+
+
+def downgrade() -> None:
+    for catalog, table, _, links in CATALOGS:
+        for link, _, _ in links:
+            for suffix, _, _ in LINK_TRIGGERS:
+                op.execute(f"DROP TRIGGER {link}_catalog_{suffix} ON {link}")
+        op.execute(f"DROP TRIGGER {catalog}_update ON {table}")
+        op.execute(f"DROP TRIGGER {catalog}_insert ON {table}")
+
+        op.execute(f"DROP FUNCTION sync_{catalog}_links()")
+        op.execute(f"DROP FUNCTION sync_{catalog}_titles()")
+        op.execute(f"DROP FUNCTION refresh_{catalog}(integer[])")
+
+        op.drop_table(catalog)
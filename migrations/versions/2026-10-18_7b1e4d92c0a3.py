@@ -0,0 +1,39 @@
+"""Row versions of catalog entities and lists
+
+Revision ID: 7b1e4d92c0a3
+Revises: 5c3d8f21b6a4
+Create Date: 2026-10-18 17:05:31.402118
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7b1e4d92c0a3"
+down_revision: Union[str, None] = "5c3d8f21b6a4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ["movies", "series", "persons", "movie_lists", "series_lists"]
+
+
+def upgrade() -> None:
+    # `now()` is stable, so existing rows get the default without a rewrite.
+    for table in TABLES:
+        op.add_column(
+            table,
+            sa.Column(
+                "updated_at",
+                sa.TIMESTAMP(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=False,
+            ),
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_column(table, "updated_at")
@@ -0,0 +1,81 @@
+"""Full-text and trigram title search for movies and series
+
+Revision ID: 9a7075061ccd
+Revises: ee947e92a7fd
+Create Date: 2026-10-18 11:03:27.914652
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "9a7075061ccd"
+down_revision: Union[str, None] = "ee947e92a7fd"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for table in ("movies", "series"):
+        op.add_column(
+            table,
+            sa.Column(
+                "search_vector",
+                postgresql.TSVECTOR(),
+                sa.Computed(SEARCH_VECTOR, persisted=True),
+                nullable=False,
+            ),
+        )
+
+    with op.get_context().autocommit_block():
+        for table in ("movies", "series"):
+            op.create_index(
+                f"ix_{table}_search_vector",
+                table,
+                ["search_vector"],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+            op.create_index(
+                f"ix_{table}_title_trgm",
+                table,
+                ["title"],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_ops={"title": "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in ("movies", "series"):
+            op.drop_index(
+                f"ix_{table}_title_trgm",
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+            op.drop_index(
+                f"ix_{table}_search_vector",
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+    for table in ("movies", "series"):
+        op.drop_column(table, "search_vector")
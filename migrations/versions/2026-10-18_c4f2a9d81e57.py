@@ -0,0 +1,31 @@
+"""Token version of users
+
+Revision ID: c4f2a9d81e57
+Revises: 7b1e4d92c0a3
+Create Date: 2026-10-18 18:42:10.915204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4f2a9d81e57"
+down_revision: Union[str, None] = "7b1e4d92c0a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column(
+            "token_version", sa.Integer(), server_default="0", nullable=False
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "token_version")
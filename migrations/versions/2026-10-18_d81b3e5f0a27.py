@@ -0,0 +1,43 @@
+"""Time of the last token version bump of users
+
+Revision ID: d81b3e5f0a27
+Revises: c4f2a9d81e57
+Create Date: 2026-10-18 21:07:33.284519
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d81b3e5f0a27"
+down_revision: Union[str, None] = "c4f2a9d81e57"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column(
+            "token_version_bumped_at", sa.TIMESTAMP(timezone=True), nullable=True
+        ),
+    )
+    # When versions were bumped before is unknown, so they count as bumped now
+    # and stay tracked for one token lifetime.
+    op.execute(
+        "UPDATE users SET token_version_bumped_at = now() WHERE token_version > 0"
+    )
+    op.create_index(
+        op.f("ix_users_token_version_bumped_at"),
+        "users",
+        ["token_version_bumped_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_users_token_version_bumped_at"), table_name="users")
+    op.drop_column("users", "token_version_bumped_at")
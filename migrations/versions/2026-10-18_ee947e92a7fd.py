@@ -0,0 +1,50 @@
+"""Keyset pagination indexes for movies and series
+
+Revision ID: ee947e92a7fd
+Revises: 3e2eb3390afc
+Create Date: 2026-10-18 09:12:40.381025
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "ee947e92a7fd"
+down_revision: Union[str, None] = "3e2eb3390afc"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SORT_INDEXES = [
+    ("title", "id"),
+    ("production_year", "id"),
+    ("IMDb_rating", "id"),
+]
+
+
+def upgrade() -> None:
+    # Built concurrently so that the catalog stays writable on large tables.
+    with op.get_context().autocommit_block():
+        for table in ("movies", "series"):
+            for columns in SORT_INDEXES:
+                op.create_index(
+                    f"ix_{table}_{'_'.join(columns)}",
+                    table,
+                    list(columns),
+                    unique=False,
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in ("movies", "series"):
+            for columns in SORT_INDEXES:
+                op.drop_index(
+                    f"ix_{table}_{'_'.join(columns)}",
+                    table_name=table,
+                    postgresql_concurrently=True,
+                    if_exists=True,
+                )
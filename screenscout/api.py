@@ -1,7 +1,9 @@
 from fastapi import APIRouter
 
 from screenscout.auth.views import auth_router, users_router
+from screenscout.cache.views import router as cache_router
 from screenscout.career_role.views import router as career_roles_router
+from screenscout.catalog_import.views import router as import_router
 from screenscout.country.views import router as countries_router
 from screenscout.genre.views import router as genres_router
 from screenscout.language.views import router as languages_router
@@ -32,6 +34,8 @@ api_router.include_router(
 api_router.include_router(
     series_lists_router, prefix="/lists/series", tags=["series lists"]
 )
+api_router.include_router(import_router, prefix="/import", tags=["import"])
+api_router.include_router(cache_router, prefix="/cache", tags=["cache"])
 
 
 @api_router.get("/healthcheck", include_in_schema=False)
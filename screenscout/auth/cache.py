@@ -0,0 +1,85 @@
+"""
+Module for the principal cache.
+
+Authorization only needs the id, role, status and token version of a user, so
+these are cached as a `Principal` instead of loading the user on every
+authenticated request. Principals are stored through the response cache
+backend: each worker keeps recent ones in memory in front of Redis, where they
+live for `PRINCIPAL_CACHE_TTL` seconds.
+
+`forget_principal` must be called after every write to a user's role or
+status. It deletes the principal from Redis and, through the backend's
+eviction channel, from the memory of every worker.
+"""
+
+import logging
+
+from fastapi_cache import FastAPICache
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from screenscout.cache.breaker import bypass_breaker
+from screenscout.config import settings
+
+from .models import Principal, User
+
+logger = logging.getLogger(__name__)
+
+
+def _key(user_id: int) -> str:
+    return f"{FastAPICache.get_prefix()}:principal:{user_id}"
+
+
+async def _load(*, db_session: AsyncSession, user_id: int) -> Principal | None:
+    result = await db_session.execute(
+        select(User.id, User.role, User.is_active, User.token_version).where(
+            User.id == user_id
+        )
+    )
+    row = result.first()
+
+    return Principal.model_validate(row._asdict()) if row else None
+
+
+async def get_principal(*, db_session: AsyncSession, user_id: int) -> Principal | None:
+    """Returns the principal of a user, loading it from the database on a miss."""
+    try:
+        backend = FastAPICache.get_backend()
+    except AssertionError:
+        return await _load(db_session=db_session, user_id=user_id)
+
+    key = _key(user_id)
+    try:
+        cached = await backend.get(key)
+    except Exception:
+        logger.warning("Could not read cached principal", exc_info=True)
+        cached = None
+    if cached is not None:
+        return Principal.model_validate_json(cached)
+
+    principal = await _load(db_session=db_session, user_id=user_id)
+    if principal is not None:
+        try:
+            await backend.set(
+                key, principal.model_dump_json().encode(), settings.PRINCIPAL_CACHE_TTL
+            )
+        except Exception:
+            logger.warning("Could not cache principal", exc_info=True)
+
+    return principal
+
+
+async def forget_principal(user_id: int) -> None:
+    """Drops the cached principal of a user whose access changed."""
+    try:
+        backend = FastAPICache.get_backend()
+    except AssertionError:
+        return
+
+    # Written even while the circuit breaker skips the cache, or the old role
+    # would be served once Redis recovers.
+    try:
+        with bypass_breaker():
+            await backend.clear(key=_key(user_id))
+    except Exception:
+        logger.warning("Could not drop cached principal", exc_info=True)
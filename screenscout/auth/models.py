@@ -23,6 +23,13 @@ class User(Base):
     password: Mapped[str] = mapped_column(unique=False, nullable=False)
     role: Mapped[UserRole] = mapped_column(default=UserRole.MEMBER)
     is_active: Mapped[bool] = mapped_column(nullable=False, default=True)
+    # Bumped whenever the user's access changes.
+    token_version: Mapped[int] = mapped_column(
+        nullable=False, default=0, server_default="0"
+    )
+    token_version_bumped_at: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True, index=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), nullable=False, server_default=func.now()
     )
@@ -58,3 +65,12 @@ class UserUpdate(UserBase):
 
 class UserRead(UserBase):
     id: int
+
+
+class Principal(ScreenScoutBase):
+    """The part of a user that authorization depends on."""
+
+    id: int
+    role: UserRole
+    is_active: bool
+    token_version: int
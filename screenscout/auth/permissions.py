@@ -13,7 +13,8 @@ Roles:
 
 Functions:
 - `role_required`: Creates a dependency that ensures the current user
-  has one of the required roles.
+  has one of the required roles. It resolves the user's cached `Principal`,
+  so checking a role does not load the user from the database.
 - `Owner`: Dependency for users with the OWNER role.
 - `OwnerAdmin`: Dependency for users with either the OWNER or ADMIN role.
 - `OwnerAdminManager`: Dependency for users with either the OWNER,
@@ -27,11 +28,13 @@ from typing import Callable
 from fastapi import Depends, HTTPException, status
 
 from .enums import UserRole
-from .models import User
-from .service import get_current_user
+from .models import Principal
+from .service import get_current_principal
 
 
-def role_required(required_roles: list[UserRole]) -> Callable[[User], User]:
+def role_required(
+    required_roles: list[UserRole],
+) -> Callable[[Principal], Principal]:
     """
     Decorator to check the user's role.
 
@@ -40,7 +43,7 @@ def role_required(required_roles: list[UserRole]) -> Callable[[User], User]:
     Forbidden exception.
     """
 
-    def role_checker(user: User = Depends(get_current_user)) -> User:
+    def role_checker(user: Principal = Depends(get_current_principal)) -> Principal:
         if user.role not in required_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,303 @@
+"""
+Module for revoking tokens without a network round trip per request.
+
+Access tokens carry the `token_version` of their user. Whenever a user's
+access changes, such as a new password, role or status, the version is bumped
+and tokens of older versions stop being accepted. With
+`AUTH_TRUST_TOKEN_CLAIMS`, requests are authorized from the claims of their
+token alone, so each worker needs the current versions in memory, which
+`TokenVersions` keeps. Only versions bumped within the lifetime of an access
+token are tracked: tokens issued before an older bump have expired anyway.
+Postgres holds the versions themselves, so they are reconciled with
+`users.token_version` on every load, in case a bump never reached Redis or was
+lost there.
+
+Single tokens, such as the access token of a session that signed out, are
+revoked by id until they expire. `RevokedTokens` keeps the revoked ids of each
+worker in a Bloom filter: most tokens are found absent in memory, and only
+possible matches are confirmed in Redis.
+
+Both are mirrors of state kept in Redis, and every change is published on a
+channel that all workers subscribe to. While a worker is not subscribed, such
+as right after startup or once the connection is lost, it is not `synced` and
+callers must check Redis or the database instead. The whole state is reloaded
+after reconnecting, since messages may have been missed.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from datetime import timedelta
+
+from redis.asyncio.client import Redis
+from sqlalchemy import func, select
+
+from screenscout.config import settings
+from screenscout.database.core import async_session
+
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+
+class RedisMirror(ABC):
+    """State mirrored from Redis, updated through a pub/sub channel."""
+
+    # Seconds after which the state is reloaded even if no message was missed.
+    reload_interval: float | None = None
+
+    def __init__(self, *, key: str, channel: str) -> None:
+        self.key = key
+        self.channel = channel
+        self._redis: "Redis[bytes] | None" = None
+        self._synced = False
+        self._listener: asyncio.Task[None] | None = None
+
+    @property
+    def synced(self) -> bool:
+        return self._synced
+
+    async def start(self, redis: "Redis[bytes]") -> None:
+        self._redis = redis
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self._synced = False
+
+    @abstractmethod
+    async def _load(self, redis: "Redis[bytes]") -> None:
+        """Replaces the mirrored state with the one in Redis."""
+
+    @abstractmethod
+    def _on_message(self, data: str) -> None:
+        """Applies a change published on the channel."""
+
+    async def _listen(self) -> None:
+        assert self._redis is not None
+        delay = 1.0
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    # Loaded once subscribed, so no change falls in between.
+                    await self._load(self._redis)
+                    loaded_at = time.monotonic()
+                    self._synced = True
+                    delay = 1.0
+                    while True:
+                        # A blocking read would fail once the client's socket
+                        # timeout passes, so wait a second at a time instead.
+                        message = await pubsub.get_message(timeout=1.0)
+                        if message and message["type"] == "message":
+                            self._on_message(message["data"].decode())
+
+                        if (
+                            self.reload_interval is not None
+                            and time.monotonic() - loaded_at > self.reload_interval
+                        ):
+                            await self._load(self._redis)
+                            loaded_at = time.monotonic()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning(
+                    "Channel `%s` lost, retrying in %.0fs", self.channel, delay
+                )
+            finally:
+                self._synced = False
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+
+class TokenVersions(RedisMirror):
+    """The token versions of users bumped within `lifetime` seconds.
+
+    Redis holds them in a sorted set of `{user_id} {version}` members scored by
+    when they stop mattering, like revoked tokens. Reloaded every five minutes
+    along with the versions bumped in Postgres over the same period, so a bump
+    never published is picked up and older ones are dropped.
+    """
+
+    reload_interval = 300.0
+
+    def __init__(
+        self,
+        *,
+        lifetime: float,
+        key: str = "token-version-bumps",
+        channel: str = "token-versions",
+    ) -> None:
+        super().__init__(key=key, channel=channel)
+        self.lifetime = lifetime
+        self._versions: dict[int, int] = {}
+
+    def get(self, user_id: int) -> int:
+        return self._versions.get(user_id, 0)
+
+    async def publish(self, user_id: int, version: int) -> None:
+        """Records a bumped version in Redis and announces it to every worker."""
+        _merge(self._versions, user_id, version)
+        if self._redis is None:
+            return
+
+        bump = f"{user_id} {version}"
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.zadd(self.key, {bump: time.time() + self.lifetime})
+                pipe.publish(self.channel, bump)
+                await pipe.execute()
+        except Exception:
+            logger.error(
+                "Could not publish token version of user `%s`", user_id, exc_info=True
+            )
+
+    async def _load(self, redis: "Redis[bytes]") -> None:
+        versions: dict[int, int] = {}
+
+        await redis.zremrangebyscore(self.key, "-inf", time.time())
+        for bump in await redis.zrange(self.key, 0, -1):
+            user_id, _, version = bump.decode().partition(" ")
+            _merge(versions, int(user_id), int(version))
+
+        async with async_session() as db_session:
+            result = await db_session.execute(
+                select(User.id, User.token_version).where(
+                    User.token_version_bumped_at
+                    > func.now() - timedelta(seconds=self.lifetime)
+                )
+            )
+            for user_id, version in result.tuples():
+                _merge(versions, user_id, version)
+
+        self._versions = versions
+
+    def _on_message(self, data: str) -> None:
+        user_id, _, version = data.partition(" ")
+        _merge(self._versions, int(user_id), int(version))
+
+
+def _merge(versions: dict[int, int], user_id: int, version: int) -> None:
+    # Messages may arrive out of order, and versions only grow.
+    if version > versions.get(user_id, 0):
+        versions[user_id] = version
+
+
+class BloomFilter:
+    """A set of strings that may report false positives but no false negatives.
+
+    Sized for `capacity` items at `error_rate`; beyond that false positives
+    grow more frequent.
+    """
+
+    def __init__(self, *, capacity: int, error_rate: float) -> None:
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray(math.ceil(self.size / 8))
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # Double hashing: the bits are a + i * b for two halves of one digest.
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], "big")
+        b = int.from_bytes(digest[8:], "big") | 1
+        return ((a + i * b) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class RevokedTokens(RedisMirror):
+    """Ids of revoked tokens, kept in Redis until the tokens expire.
+
+    Redis holds them in a sorted set scored by expiry. Each worker adds them
+    to a Bloom filter, rebuilt hourly so expired ids are dropped.
+    """
+
+    reload_interval = 3600.0
+
+    def __init__(
+        self,
+        *,
+        capacity: int,
+        error_rate: float,
+        key: str = "revoked-tokens",
+        channel: str = "revoked-tokens",
+    ) -> None:
+        super().__init__(key=key, channel=channel)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._filter = self._new_filter()
+
+    def _new_filter(self) -> BloomFilter:
+        return BloomFilter(capacity=self.capacity, error_rate=self.error_rate)
+
+    async def revoke(self, token_id: str, expires_at: int) -> None:
+        """Revokes a token until `expires_at`, a Unix timestamp."""
+        if expires_at <= time.time():
+            return
+
+        self._filter.add(token_id)
+        if self._redis is None:
+            return
+
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(self.key, {token_id: expires_at})
+            pipe.publish(self.channel, token_id)
+            await pipe.execute()
+
+    async def is_revoked(self, token_id: str) -> bool:
+        """Tells whether a token was revoked, asking Redis only if it might be.
+
+        Tokens are accepted if Redis cannot be asked; they are short-lived.
+        """
+        if self._synced and token_id not in self._filter:
+            return False
+        if self._redis is None:
+            return token_id in self._filter
+
+        try:
+            return await self._redis.zscore(self.key, token_id) is not None
+        except Exception:
+            logger.warning("Could not check token revocation", exc_info=True)
+            return False
+
+    async def _load(self, redis: "Redis[bytes]") -> None:
+        await redis.zremrangebyscore(self.key, "-inf", time.time())
+        token_ids = await redis.zrange(self.key, 0, -1)
+
+        revoked = self._new_filter()
+        for token_id in token_ids:
+            revoked.add(token_id.decode())
+        self._filter = revoked
+
+    def _on_message(self, data: str) -> None:
+        self._filter.add(data)
+
+
+# A minute of margin for clock skew between the workers and Postgres.
+token_versions = TokenVersions(lifetime=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60 + 60)
+revoked_tokens = RevokedTokens(
+    capacity=settings.REVOKED_TOKENS_CAPACITY,
+    error_rate=settings.REVOKED_TOKENS_ERROR_RATE,
+)
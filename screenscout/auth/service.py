@@ -3,18 +3,29 @@ from typing import Annotated
 from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from pydantic import EmailStr
+from pydantic import EmailStr, ValidationError
+from sqlalchemy import func, insert
+from sqlalchemy import update as sql_update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from screenscout.auth.enums import UserRole
 from screenscout.config import settings
 from screenscout.database.core import SessionDep
-from screenscout.exceptions import CredentialsException, UserDeactivatedException
+from screenscout.exceptions import (
+    CredentialsException,
+    EntityAlreadyExists,
+    RateLimitExceeded,
+    UserDeactivatedException,
+)
 from screenscout.jwt.models import TokenData
+from screenscout.ratelimit import Limit, limiter, retry_after
 from screenscout.security import get_password_hash
 
-from .models import User, UserCreate, UserUpdate
+from .cache import forget_principal, get_principal
+from .models import Principal, User, UserCreate, UserUpdate
+from .revocation import revoked_tokens, token_versions
 
 
 async def get(*, db_session: AsyncSession, user_id: int) -> User | None:
@@ -49,38 +60,120 @@ async def get_by_username(*, db_session: AsyncSession, username: str) -> User |
     return result.scalars().first()
 
 
+def _already_exists(
+    error: IntegrityError, user_in: UserCreate | UserUpdate
+) -> Exception:
+    """Maps a unique violation on `users` to the field that is taken."""
+    # asyncpg's error, with the constraint name, is the cause of the DBAPI one.
+    cause = getattr(error.orig, "__cause__", None)
+    constraint = getattr(cause, "constraint_name", None)
+    if constraint == "uq_users_email":
+        return EntityAlreadyExists(f"User with email `{user_in.email}` already exists.")
+    if constraint == "uq_users_username":
+        return EntityAlreadyExists(
+            f"User with username `{user_in.username}` already exists."
+        )
+
+    return error
+
+
 async def create(*, db_session: AsyncSession, user_in: UserCreate) -> User:
-    """Creates a new user."""
-    hashed_password = get_password_hash(user_in.password)
-    user_in.password = hashed_password
+    """
+    Creates a new user.
 
-    user = User(**user_in.model_dump())
-    db_session.add(user)
-    await db_session.commit()
-    await db_session.refresh(user)
+    The row is inserted and returned in one statement. A taken email or username
+    is reported by the unique constraints as `EntityAlreadyExists`.
+    """
+    user_data = user_in.model_dump()
+    user_data["password"] = await get_password_hash(user_in.password)
+
+    try:
+        result = await db_session.execute(
+            insert(User).values(**user_data).returning(User)
+        )
+        user = result.scalars().one()
+        await db_session.commit()
+    except IntegrityError as error:
+        await db_session.rollback()
+        raise _already_exists(error, user_in) from error
 
     return user
 
 
-async def update(*, db_session: AsyncSession, user: User, user_in: UserUpdate) -> User:
-    """Updates a user."""
-    user_data = user.dict()
-    update_data = user_in.model_dump(exclude={"password"}, exclude_unset=True)
+async def update(
+    *, db_session: AsyncSession, user_id: int, user_in: UserUpdate
+) -> User | None:
+    """
+    Updates a user.
 
-    for field in user_data:
-        if field in update_data:
-            setattr(user, field, update_data[field])
+    The row is updated and returned in one statement, without loading it first.
+    """
+    update_data = user_in.model_dump(
+        exclude={"password"}, exclude_unset=True, exclude_none=True
+    )
+    update_data["updated_at"] = func.now()
 
     if user_in.password:
-        hashed_password = get_password_hash(user_in.password)
-        user.password = hashed_password
+        update_data["password"] = await get_password_hash(user_in.password)
+        # Signs out every session of the old password.
+        update_data["token_version"] = User.token_version + 1
+        update_data["token_version_bumped_at"] = func.now()
 
-    await db_session.commit()
-    await db_session.refresh(user)
+    try:
+        result = await db_session.execute(
+            sql_update(User)
+            .where(User.id == user_id)
+            .values(**update_data)
+            .returning(User)
+        )
+        user = result.scalars().first()
+        await db_session.commit()
+    except IntegrityError as error:
+        await db_session.rollback()
+        raise _already_exists(error, user_in) from error
+
+    if user is None:
+        return None
+
+    await forget_principal(user.id)
+    if user_in.password:
+        await token_versions.publish(user.id, user.token_version)
 
     return user
 
 
+async def update_password_hash(
+    *, db_session: AsyncSession, user: User, hashed_password: str
+) -> None:
+    """Replaces a user's password hash with one of the current cost."""
+    user.password = hashed_password
+    await db_session.commit()
+
+
+async def check_rate_limit(*, action: str, ip: str | None, account: str) -> None:
+    """Refuses sign-ins or sign-ups, by `action`, beyond the limits of the client.
+
+    The account bucket is per client IP too, so failing to sign in as someone
+    else cannot lock them out.
+    """
+    client = ip or "unknown"
+    buckets = {
+        f"auth:{action}:account:{account.lower()}:{client}": Limit(
+            burst=settings.AUTH_RATE_LIMIT_ACCOUNT_BURST,
+            rate=settings.AUTH_RATE_LIMIT_ACCOUNT_PER_MINUTE / 60,
+        )
+    }
+    if ip is not None:
+        buckets[f"auth:{action}:ip:{ip}"] = Limit(
+            burst=settings.AUTH_RATE_LIMIT_IP_BURST,
+            rate=settings.AUTH_RATE_LIMIT_IP_PER_MINUTE / 60,
+        )
+
+    wait = await limiter.hit(buckets)
+    if wait > 0:
+        raise RateLimitExceeded(retry_after(wait))
+
+
 async def verify_access_token(
     token: str, credentials_exception: CredentialsException
 ) -> TokenData:
@@ -89,10 +182,16 @@ async def verify_access_token(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
         user_id = payload.get("user_id")
-        if user_id is None:
+        if user_id is None or payload.get("type") == "refresh":
             raise credentials_exception
-        token_data = TokenData(id=user_id)
-    except JWTError:
+        token_data = TokenData(
+            id=user_id,
+            role=payload.get("role"),
+            token_version=payload.get("token_version", 0),
+            jti=payload.get("jti"),
+            exp=payload.get("exp"),
+        )
+    except (JWTError, ValidationError):
         raise credentials_exception
     return token_data
 
@@ -100,15 +199,26 @@ async def verify_access_token(
 oauth2_scheme_v1 = OAuth2PasswordBearer(tokenUrl="api/v1/auth/signin")
 
 
-async def get_current_user(
-    db: SessionDep, token: Annotated[str, Depends(oauth2_scheme_v1)]
-) -> User:
+async def get_current_token(
+    token: Annotated[str, Depends(oauth2_scheme_v1)]
+) -> TokenData:
+    """Verifies the access token of a request and that it was not revoked."""
     token_data = await verify_access_token(token, CredentialsException())
 
+    if token_data.jti and await revoked_tokens.is_revoked(token_data.jti):
+        raise CredentialsException()
+
+    return token_data
+
+
+CurrentToken = Annotated[TokenData, Depends(get_current_token)]
+
+
+async def get_current_user(db: SessionDep, token_data: CurrentToken) -> User:
     result = await db.execute(select(User).where(User.id == token_data.id))
     user = result.scalars().first()
 
-    if user is None:
+    if user is None or token_data.token_version < user.token_version:
         raise CredentialsException()
 
     if user.is_active is False:
@@ -120,7 +230,46 @@ async def get_current_user(
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
-async def first_owner_create(db_session: AsyncSession):
+async def get_current_principal(db: SessionDep, token_data: CurrentToken) -> Principal:
+    """
+    Authenticates a request without loading the user.
+
+    With `AUTH_TRUST_TOKEN_CLAIMS`, the principal is read from the token itself
+    and only its version is checked, in memory (see `auth.revocation`).
+    Otherwise, or while the versions are not synced, it is read from the
+    principal cache (see `auth.cache`).
+    """
+    user_id: int = token_data.id  # type: ignore[assignment]
+
+    if (
+        settings.AUTH_TRUST_TOKEN_CLAIMS
+        and token_data.role is not None
+        and token_versions.synced
+    ):
+        if token_data.token_version < token_versions.get(user_id):
+            raise CredentialsException()
+
+        return Principal(
+            id=user_id,
+            role=token_data.role,
+            is_active=True,
+            token_version=token_data.token_version,
+        )
+
+    principal = await get_principal(db_session=db, user_id=user_id)
+    if principal is None or token_data.token_version < principal.token_version:
+        raise CredentialsException()
+
+    if principal.is_active is False:
+        raise UserDeactivatedException()
+
+    return principal
+
+
+CurrentPrincipal = Annotated[Principal, Depends(get_current_principal)]
+
+
+async def first_owner_create(db_session: AsyncSession) -> None:
     query = select(User).where(
         (User.username == settings.FIRST_OWNER_USERNAME)
         & (User.email == settings.FIRST_OWNER_EMAIL)
@@ -130,7 +279,7 @@ async def first_owner_create(db_session: AsyncSession):
     user = result.scalars().first()
 
     if not user:
-        hashed_password = get_password_hash(settings.FIRST_OWNER_PASSWORD)
+        hashed_password = await get_password_hash(settings.FIRST_OWNER_PASSWORD)
         user_in = User(
             username=settings.FIRST_OWNER_USERNAME,
             email=settings.FIRST_OWNER_EMAIL,
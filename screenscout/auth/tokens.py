@@ -0,0 +1,163 @@
+"""
+Module for issuing, refreshing and revoking tokens.
+
+Signing in returns a short-lived access token together with a refresh token,
+valid for `REFRESH_TOKEN_EXPIRE_DAYS`, which trades for a new pair at
+`/auth/refresh` without checking the password again. Refresh tokens are kept
+in Redis by id and are consumed when used, so each one works once: a stolen
+token that was already used is refused, and signing out deletes it. While
+Redis is unavailable, signing in returns an access token alone.
+
+Signing out also revokes the access token until it expires, see
+`auth.revocation`.
+"""
+
+import logging
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from typing import TypeVar
+
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from jose import JWTError, jwt
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from screenscout.cache.backends import TwoTierBackend
+from screenscout.config import settings
+from screenscout.exceptions import (
+    CredentialsException,
+    TokenStoreUnavailable,
+    UserDeactivatedException,
+)
+from screenscout.jwt.models import TokenData, TokenResponse
+from screenscout.security import create_access_token, create_refresh_token
+
+from .cache import get_principal
+from .models import Principal
+from .revocation import revoked_tokens
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _key(token_id: str) -> str:
+    return f"{FastAPICache.get_prefix()}:refresh:{token_id}"
+
+
+async def _store(operation: Callable[[RedisBackend], Awaitable[T]]) -> T:
+    try:
+        backend = FastAPICache.get_backend()
+    except AssertionError:
+        raise TokenStoreUnavailable()
+    if not isinstance(backend, RedisBackend):
+        raise TokenStoreUnavailable()
+
+    try:
+        if isinstance(backend, TwoTierBackend):
+            return await backend.call(lambda: operation(backend))
+        return await operation(backend)
+    except Exception:
+        logger.warning("Refresh token store unavailable", exc_info=True)
+        raise TokenStoreUnavailable()
+
+
+def _decode_refresh_token(token: str) -> TokenData:
+    try:
+        payload = jwt.decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+        if payload.get("type") != "refresh" or payload.get("jti") is None:
+            raise CredentialsException()
+        return TokenData(
+            id=payload.get("user_id"),
+            token_version=payload.get("token_version", 0),
+            jti=payload["jti"],
+            exp=payload.get("exp"),
+        )
+    except (JWTError, ValidationError):
+        raise CredentialsException()
+
+
+async def issue_tokens(*, principal: Principal) -> TokenResponse:
+    """Returns a new access token and a new stored refresh token.
+
+    If the refresh token cannot be stored, only the access token is returned:
+    signing in keeps working, and the client signs in again once it expires.
+    """
+    token_id = uuid.uuid4().hex
+    refresh_token: str | None = create_refresh_token(
+        {
+            "user_id": principal.id,
+            "token_version": principal.token_version,
+            "jti": token_id,
+        }
+    )
+    try:
+        await _store(
+            lambda backend: backend.redis.set(
+                _key(token_id),
+                principal.id,
+                ex=timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            )
+        )
+    except TokenStoreUnavailable:
+        logger.warning("Issuing no refresh token to user `%s`", principal.id)
+        refresh_token = None
+
+    access_token = create_access_token(
+        {
+            "user_id": principal.id,
+            "role": principal.role,
+            "token_version": principal.token_version,
+        }
+    )
+
+    return TokenResponse(
+        access_token=access_token, refresh_token=refresh_token, token_type="bearer"
+    )
+
+
+async def refresh_tokens(
+    *, db_session: AsyncSession, refresh_token: str
+) -> TokenResponse:
+    """Trades a refresh token for a new pair, consuming it."""
+    token_data = _decode_refresh_token(refresh_token)
+
+    # Missing once used, signed out or expired.
+    stored = await _store(
+        lambda backend: backend.redis.getdel(_key(token_data.jti))  # type: ignore
+    )
+    if stored is None:
+        raise CredentialsException()
+
+    principal = await get_principal(
+        db_session=db_session, user_id=token_data.id  # type: ignore[arg-type]
+    )
+    if principal is None or token_data.token_version < principal.token_version:
+        raise CredentialsException()
+
+    if principal.is_active is False:
+        raise UserDeactivatedException()
+
+    return await issue_tokens(principal=principal)
+
+
+async def revoke_tokens(*, access: TokenData, refresh_token: str | None) -> None:
+    """Revokes the access token of a session and deletes its refresh token."""
+    if refresh_token is not None:
+        token_data = _decode_refresh_token(refresh_token)
+        if token_data.id != access.id:
+            raise CredentialsException()
+        await _store(
+            lambda backend: backend.redis.delete(_key(token_data.jti))  # type: ignore
+        )
+
+    if access.jti is not None and access.exp is not None:
+        try:
+            await revoked_tokens.revoke(access.jti, access.exp)
+        except Exception:
+            logger.warning("Could not revoke access token", exc_info=True)
+            raise TokenStoreUnavailable()
@@ -1,14 +1,31 @@
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security.oauth2 import OAuth2PasswordRequestForm
 
 from screenscout.database.core import SessionDep
-from screenscout.jwt.models import TokenResponse
-from screenscout.security import create_access_token, verify_password
-
-from .models import UserCreate, UserRead, UserUpdate
-from .service import CurrentUser, create, get, get_by_email, get_by_username, update
+from screenscout.exceptions import (
+    CredentialsException,
+    EntityAlreadyExists,
+    UserDeactivatedException,
+)
+from screenscout.jwt.models import RefreshRequest, SignoutRequest, TokenResponse
+from screenscout.security import HashingStats, password_hasher, verify_password
+
+from .models import Principal, UserCreate, UserRead, UserUpdate
+from .permissions import OwnerAdmin
+from .service import (
+    CurrentPrincipal,
+    CurrentToken,
+    CurrentUser,
+    check_rate_limit,
+    create,
+    get,
+    get_by_email,
+    update,
+    update_password_hash,
+)
+from .tokens import issue_tokens, refresh_tokens, revoke_tokens
 
 auth_router = APIRouter()
 users_router = APIRouter()
@@ -17,42 +34,52 @@ users_router = APIRouter()
 @auth_router.post(
     "/signup", response_model=UserRead, status_code=status.HTTP_201_CREATED
 )
-async def signup(db_session: SessionDep, user_in: UserCreate) -> Any:
+async def signup(request: Request, db_session: SessionDep, user_in: UserCreate) -> Any:
     """Creates a new user account."""
-    user = await get_by_email(db_session=db_session, email=user_in.email)
-    if user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"User with email `{user_in.email}` already exists.",
-        )
-
-    user = await get_by_username(db_session=db_session, username=user_in.username)
-    if user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"User with username `{user_in.username}` already exists.",
-        )
+    await check_rate_limit(
+        action="signup",
+        ip=request.client.host if request.client else None,
+        account=user_in.email,
+    )
 
-    user = await create(db_session=db_session, user_in=user_in)
-
-    return user
+    try:
+        return await create(db_session=db_session, user_in=user_in)
+    except EntityAlreadyExists as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @auth_router.post("/signin")
 async def signin(
-    db_session: SessionDep, user_credentials: OAuth2PasswordRequestForm = Depends()
+    request: Request,
+    db_session: SessionDep,
+    user_credentials: OAuth2PasswordRequestForm = Depends(),
 ) -> TokenResponse:
-    """Authenticates a user and provides an access token."""
+    """Authenticates a user and provides an access token and a refresh token."""
+    await check_rate_limit(
+        action="signin",
+        ip=request.client.host if request.client else None,
+        account=user_credentials.username,
+    )
+
     user = await get_by_email(db_session=db_session, email=user_credentials.username)
 
-    if user and verify_password(user_credentials.password, user.password):
-        data = {
-            "user_id": user.id,
-            "role": user.role,
-        }
-        access_token = create_access_token(data=data)
+    verified, new_hash = False, None
+    if user:
+        verified, new_hash = await verify_password(
+            user_credentials.password, user.password
+        )
+
+    if user and verified:
+        # Tokens are authorized from their claims alone, see `auth.revocation`.
+        if user.is_active is False:
+            raise UserDeactivatedException()
+
+        if new_hash:
+            await update_password_hash(
+                db_session=db_session, user=user, hashed_password=new_hash
+            )
 
-        return TokenResponse(access_token=access_token, token_type="bearer")
+        return await issue_tokens(principal=Principal.model_validate(user))
 
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -61,6 +88,26 @@ async def signin(
     )
 
 
+@auth_router.post("/refresh")
+async def refresh(db_session: SessionDep, refresh_in: RefreshRequest) -> TokenResponse:
+    """Trades a refresh token for a new access token and refresh token."""
+    return await refresh_tokens(
+        db_session=db_session, refresh_token=refresh_in.refresh_token
+    )
+
+
+@auth_router.post("/signout", status_code=status.HTTP_204_NO_CONTENT)
+async def signout(token_data: CurrentToken, signout_in: SignoutRequest) -> None:
+    """Revokes the current access token and the given refresh token."""
+    await revoke_tokens(access=token_data, refresh_token=signout_in.refresh_token)
+
+
+@auth_router.get("/hashing/stats", response_model=HashingStats)
+async def get_hashing_stats(current_user: Principal = OwnerAdmin) -> Any:
+    """Return how many password hashes this worker is computing and queueing."""
+    return password_hasher.stats()
+
+
 @users_router.get("/me", response_model=UserRead)
 async def get_me(current_user: CurrentUser) -> Any:
     """Retrieve the current user's details."""
@@ -82,11 +129,17 @@ async def get_user(db_session: SessionDep, user_id: int) -> Any:
 
 @users_router.put("/{user_id}", response_model=UserRead)
 async def update_user(
-    db_session: SessionDep, current_user: CurrentUser, user_in: UserUpdate
+    db_session: SessionDep, current_user: CurrentPrincipal, user_in: UserUpdate
 ) -> Any:
     """Update a user."""
-    user = await get(db_session=db_session, user_id=current_user.id)
+    try:
+        user = await update(
+            db_session=db_session, user_id=current_user.id, user_in=user_in
+        )
+    except EntityAlreadyExists as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if user is None:
+        raise CredentialsException()
 
-    return await update(
-        db_session=db_session, user=user, user_in=user_in
-    )  # type: ignore
+    return user
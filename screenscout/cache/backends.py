@@ -0,0 +1,274 @@
+"""
+Module for the layered response cache backend.
+
+`TwoTierBackend` keeps a bounded LRU of recently used entries in each worker
+process in front of Redis. Local entries live for a short TTL of their own, so
+hot keys such as a popular movie page or a namespace version token are served
+without a network round trip.
+
+Whenever a key is written or cleared, the worker publishes it on a Redis
+channel and every other worker drops its local copy. If the subscription is
+lost, the local tier is emptied, since evictions may have been missed; the
+local TTL bounds staleness should a message be lost regardless.
+
+Redis calls go through a `CircuitBreaker`. While it is open, lookups miss
+without waiting on Redis and writes only reach the local tier.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from fastapi_cache.backends.redis import RedisBackend
+from redis.asyncio.client import Redis
+
+from screenscout.models import ScreenScoutBase
+
+from .breaker import BreakerState, CircuitBreaker, CircuitOpen
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Deletes a lock only if it is still held by the given token.
+RELEASE_LOCK = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class TierStats(ScreenScoutBase):
+    hits: int = 0
+    misses: int = 0
+
+
+class CacheStats(ScreenScoutBase):
+    local: TierStats
+    redis: TierStats
+    local_size: int
+    # Lookups that skipped Redis because the circuit breaker was open.
+    skipped: int
+    breaker: BreakerState | None
+
+
+class LocalCache:
+    """A bounded LRU mapping with a TTL per entry."""
+
+    def __init__(self, *, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> tuple[float, bytes] | None:
+        """Returns `(seconds left, value)` of a live entry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        remaining = expires_at - time.monotonic()
+        if remaining <= 0:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return remaining, value
+
+    def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            self._entries.pop(key, None)
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def evict(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def evict_namespace(self, namespace: str) -> None:
+        for key in [key for key in self._entries if key.startswith(f"{namespace}:")]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class TwoTierBackend(RedisBackend):
+    """A per-process LRU in front of Redis, kept coherent through pub/sub."""
+
+    def __init__(
+        self,
+        redis: "Redis[bytes]",
+        *,
+        maxsize: int,
+        ttl: float,
+        channel: str = "fastapi-cache:evict",
+        breaker: CircuitBreaker | None = None,
+    ) -> None:
+        super().__init__(redis)
+        self.breaker = breaker
+        self.skipped = 0
+        self.local = LocalCache(maxsize=maxsize, ttl=ttl)
+        self.channel = channel
+        self.local_stats = TierStats()
+        self.redis_stats = TierStats()
+        # Tags our own messages so a worker does not evict what it just set.
+        self._origin = uuid.uuid4().hex
+        self._listener: asyncio.Task[None] | None = None
+
+    async def get_with_ttl(self, key: str) -> tuple[int, bytes | None]:
+        local = self.local.get(key)
+        if local is not None:
+            self.local_stats.hits += 1
+            return int(local[0]), local[1]
+        self.local_stats.misses += 1
+
+        get_with_ttl = super().get_with_ttl
+        try:
+            ttl, value = await self.call(lambda: get_with_ttl(key))
+        except CircuitOpen:
+            self.skipped += 1
+            return 0, None
+        if value is None:
+            self.redis_stats.misses += 1
+            return ttl, value
+
+        self.redis_stats.hits += 1
+        # Redis reports -1 for keys without an expiry.
+        self.local.set(key, value, ttl if ttl >= 0 else None)
+        return ttl, value
+
+    async def get(self, key: str) -> bytes | None:
+        return (await self.get_with_ttl(key))[1]
+
+    async def set(self, key: str, value: bytes, expire: int | None = None) -> None:
+        self.local.set(key, value, expire)
+        set_ = super().set
+        try:
+            await self.call(lambda: set_(key, value, expire))
+            await self._publish(key)
+        except CircuitOpen:
+            pass
+
+    async def clear(self, namespace: str | None = None, key: str | None = None) -> int:
+        if namespace:
+            self.local.evict_namespace(namespace)
+        elif key:
+            self.local.evict(key)
+
+        clear = super().clear
+        try:
+            cleared = await self.call(lambda: clear(namespace, key))
+            if namespace:
+                await self._publish(f"{namespace}:*")
+            elif key:
+                await self._publish(key)
+        except CircuitOpen:
+            return 0
+
+        return cleared
+
+    async def acquire_lock(self, key: str, ttl: float) -> str | None:
+        """Takes the recompute lock of `key` across workers for `ttl` seconds.
+
+        Returns the token needed to release it, or `None` if it is taken. An
+        empty token means Redis is skipped and no lock could be taken.
+        """
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.call(
+                lambda: self.redis.set(
+                    f"{key}:lock", token, nx=True, px=int(ttl * 1000)
+                )
+            )
+        except CircuitOpen:
+            return ""
+
+        return token if acquired else None
+
+    async def release_lock(self, key: str, token: str) -> None:
+        try:
+            await self.call(
+                lambda: self.redis.eval(RELEASE_LOCK, 1, f"{key}:lock", token)
+            )
+        except CircuitOpen:
+            pass
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            local=self.local_stats,
+            redis=self.redis_stats,
+            local_size=len(self.local),
+            skipped=self.skipped,
+            breaker=self.breaker.state if self.breaker else None,
+        )
+
+    async def start(self) -> None:
+        """Starts listening for evictions published by other workers."""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def call(self, operation: Callable[[], Awaitable[T]]) -> T:
+        """Runs a Redis operation through the circuit breaker, if any."""
+        if self.breaker is None:
+            return await operation()
+        return await self.breaker.call(operation)
+
+    async def _publish(self, key: str) -> None:
+        await self.call(
+            lambda: self.redis.publish(self.channel, f"{self._origin} {key}")
+        )
+
+    def _on_message(self, data: bytes) -> None:
+        origin, _, key = data.decode().partition(" ")
+        if origin == self._origin:
+            return
+
+        if key.endswith(":*"):
+            self.local.evict_namespace(key[:-2])
+        else:
+            self.local.evict(key)
+
+    async def _listen(self) -> None:
+        delay = 1.0
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    delay = 1.0
+                    while True:
+                        # A blocking read would fail once the client's socket
+                        # timeout passes, so wait a second at a time instead.
+                        message = await pubsub.get_message(timeout=1.0)
+                        if message and message["type"] == "message":
+                            self._on_message(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Cache eviction channel lost, retrying in %.0fs", delay)
+
+            # Evictions may have been missed while disconnected.
+            self.local.clear()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
@@ -0,0 +1,134 @@
+"""
+Module for the circuit breaker in front of Redis.
+
+While Redis is slow or unreachable every cache lookup would wait for a socket
+timeout before falling back to the database. The breaker keeps the outcome of
+the last Redis calls, counting calls slower than `slow_call` as failures, and
+opens once the share of failures in that window reaches `failure_rate`. While
+open, calls fail at once with `CircuitOpen` and the cache is skipped. After
+`reset_timeout` one trial call is let through: if it succeeds the breaker
+closes, otherwise it stays open for another `reset_timeout`.
+"""
+
+import logging
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TypeVar
+
+from screenscout.enums import ScreenScoutEnum
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_bypassed: ContextVar[bool] = ContextVar("breaker_bypassed", default=False)
+
+
+class CircuitOpen(Exception):
+    pass
+
+
+class BreakerState(ScreenScoutEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@contextmanager
+def bypass_breaker() -> Iterator[None]:
+    """Lets calls made in this block through even while the breaker is open.
+
+    For writes that must not be dropped, such as cache invalidations, which
+    would otherwise leave entries stale once Redis recovers.
+    """
+    token = _bypassed.set(True)
+    try:
+        yield
+    finally:
+        _bypassed.reset(token)
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        *,
+        window: int,
+        min_calls: int,
+        failure_rate: float,
+        slow_call: float,
+        reset_timeout: float,
+    ) -> None:
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call = slow_call
+        self.reset_timeout = reset_timeout
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._state = BreakerState.CLOSED
+        self._opened_at = 0.0
+        self._trial_running = False
+
+    @property
+    def state(self) -> BreakerState:
+        return self._state
+
+    async def call(self, operation: Callable[[], Awaitable[T]]) -> T:
+        """Runs a Redis operation, unless the breaker is open."""
+        bypassed = _bypassed.get()
+        trial = False
+        if self._state != BreakerState.CLOSED and not bypassed:
+            if (
+                self._trial_running
+                or time.monotonic() - self._opened_at < self.reset_timeout
+            ):
+                raise CircuitOpen
+            self._state = BreakerState.HALF_OPEN
+            self._trial_running = trial = True
+
+        started = time.monotonic()
+        try:
+            result = await operation()
+        except Exception:
+            self._record(False, trial)
+            raise
+        finally:
+            if trial:
+                self._trial_running = False
+
+        self._record(time.monotonic() - started <= self.slow_call, trial)
+        return result
+
+    def _record(self, success: bool, trial: bool) -> None:
+        if trial:
+            if success:
+                logger.info("Redis recovered, closing the cache circuit breaker")
+                self._state = BreakerState.CLOSED
+                self._outcomes.clear()
+            else:
+                self._open()
+            return
+
+        if self._state != BreakerState.CLOSED:
+            return
+
+        self._outcomes.append(success)
+        failures = self._outcomes.count(False)
+        if (
+            len(self._outcomes) >= self.min_calls
+            and failures / len(self._outcomes) >= self.failure_rate
+        ):
+            logger.warning(
+                "%d of the last %d Redis calls failed or were slow, skipping the "
+                "cache for %.0fs",
+                failures,
+                len(self._outcomes),
+                self.reset_timeout,
+            )
+            self._open()
+
+    def _open(self) -> None:
+        self._state = BreakerState.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
@@ -0,0 +1,46 @@
+"""
+Command line entry point for warming the response cache.
+
+    python -m screenscout.cache.cli --top 500 --concurrency 8
+
+Runs the app in this process, with its startup and shutdown, requests the
+configured and the most requested cached URLs, and prints a report as JSON.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+
+from asgi_lifespan import LifespanManager
+
+from screenscout.config import settings
+from screenscout.main import app
+
+from .warmer import warm_app
+
+
+async def run(top: int, concurrency: int) -> int:
+    # This process only exists to warm the cache once, below.
+    settings.CACHE_WARM_ON_STARTUP = False
+    async with LifespanManager(app):
+        report = await warm_app(app, top=top, concurrency=concurrency)
+
+    print(report.model_dump_json())
+    return 1 if report.failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Warm the response cache.")
+    parser.add_argument("--top", type=int, default=settings.CACHE_WARM_TOP)
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.CACHE_WARM_CONCURRENCY
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(asyncio.run(run(args.top, args.concurrency)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import zlib
+from collections.abc import Callable
+from functools import partial
+from typing import Any
+
+import orjson
+from fastapi_cache.coder import Coder
+from pydantic_core import to_jsonable_python
+from starlette.responses import Response
+
+from screenscout.enums import ScreenScoutEnum
+from screenscout.responses import JSONBytesResponse
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+
+class Compression(ScreenScoutEnum):
+    NONE = "none"
+    ZLIB = "zlib"
+    ZSTD = "zstd"
+    LZ4 = "lz4"
+
+
+# Compressed payloads start with one of these tags. Uncompressed ones are
+# stored as plain JSON, which never starts with them.
+_TAGS = {Compression.ZLIB: b"\x01", Compression.ZSTD: b"\x02", Compression.LZ4: b"\x03"}
+
+
+def _compressor(compression: Compression) -> Callable[[bytes], bytes]:
+    if compression == Compression.ZLIB:
+        return partial(zlib.compress, level=1)
+    if compression == Compression.ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Cache compression `zstd` requires `zstandard`")
+        return zstandard.ZstdCompressor(level=3).compress
+    if compression == Compression.LZ4:
+        if lz4_frame is None:
+            raise RuntimeError("Cache compression `lz4` requires `lz4`")
+        return lz4_frame.compress
+    raise ValueError(f"No compressor for `{compression}`")
+
+
+def decompress(value: bytes) -> bytes:
+    """Returns the JSON of a stored payload, compressed or not."""
+    tag = value[:1]
+    if tag not in _TAGS.values():
+        return value
+
+    payload = value[1:]
+    if tag == _TAGS[Compression.ZLIB]:
+        return zlib.decompress(payload)
+    if tag == _TAGS[Compression.ZSTD] and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if tag == _TAGS[Compression.LZ4] and lz4_frame is not None:
+        return lz4_frame.decompress(payload)
+    raise RuntimeError("Cached payload needs a missing decompressor")
+
+
+class ORJSONCoder(Coder):
+    """Stores responses as their encoded JSON body.
+
+    Endpoints return `JSONBytesResponse`s, whose body is stored unchanged and
+    sent back unchanged on a hit, skipping decoding and response validation.
+    Other values are encoded with orjson. Entries written compressed are
+    decompressed, so compression can be turned off without flushing the cache.
+    """
+
+    @classmethod
+    def encode(cls, value: Any) -> bytes:
+        if isinstance(value, Response):
+            return bytes(value.body)
+        return orjson.dumps(value, default=to_jsonable_python)
+
+    @classmethod
+    def decode(cls, value: bytes) -> Any:
+        return orjson.loads(decompress(value))
+
+    @classmethod
+    def decode_as_type(cls, value: bytes, *, type_: Any) -> Any:
+        return JSONBytesResponse(decompress(value))
+
+
+def compressed_coder(compression: Compression, *, min_size: int) -> type[Coder]:
+    """Returns a coder compressing payloads of at least `min_size` bytes.
+
+    Entries are decompressed on every hit, whatever `compression` they were
+    written with, so the setting can change without flushing the cache.
+    """
+    if compression == Compression.NONE:
+        return ORJSONCoder
+
+    compress = _compressor(compression)
+    tag = _TAGS[compression]
+
+    class CompressedCoder(ORJSONCoder):
+        @classmethod
+        def encode(cls, value: Any) -> bytes:
+            encoded = super().encode(value)
+            if len(encoded) < min_size:
+                return encoded
+            return tag + compress(encoded)
+
+    return CompressedCoder
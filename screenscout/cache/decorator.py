@@ -0,0 +1,423 @@
+"""
+Module for the response cache decorator.
+
+A drop-in replacement for `fastapi_cache.decorator.cache` that keeps a popular
+entry from being recomputed by every request that finds it expired at once:
+
+- Entries are stored for `expire` seconds plus a grace period, with the time
+  they stop being fresh in front of the encoded body. Stale entries are only
+  served while another request recomputes them.
+- Within a worker, concurrent misses for a key await a single computation.
+- Across workers, a short Redis lock elects the one that recomputes. The
+  others serve the stale entry if there is one, or wait briefly for the
+  winner's result before falling back to computing it themselves.
+- With `stale_while_revalidate`, entries that went stale less than that many
+  seconds ago are served at once while a background task refreshes them.
+- With `etag`, entries also hold the ETag of the response, so hits carry it
+  and answer a matching `If-None-Match` with a 304 without further lookups.
+"""
+
+import asyncio
+import inspect
+import logging
+import struct
+import time
+from collections.abc import Awaitable, Callable
+from functools import wraps
+from typing import Any, NamedTuple
+
+from fastapi_cache import FastAPICache
+from fastapi_cache.types import KeyBuilder
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+from starlette.responses import Response
+
+from screenscout.database.core import async_session
+from screenscout.etags import ETagFunction, etag_matches, not_modified
+
+from .backends import TwoTierBackend
+from .warmer import WARMER_HEADER, access_log
+
+logger = logging.getLogger(__name__)
+
+# How long stale entries are kept to be served during a recomputation.
+STALE_GRACE = 300
+# How long a worker may hold the recompute lock of a key.
+LOCK_TTL = 10.0
+# How long a worker without the lock waits for another worker's result.
+LOCK_WAIT = 2.0
+POLL_INTERVAL = 0.05
+
+# Entries start with this marker, the time they stop being fresh and the
+# length of their ETag. Entries written before ETags were stored start with
+# the time alone, whose first byte is never the marker.
+_MARKER = b"\x02"
+_HEADER = struct.Struct(">dH")
+_LEGACY_HEADER = struct.Struct(">d")
+
+
+class Cached(NamedTuple):
+    body: bytes
+    etag: str | None = None
+
+
+# Results of the computations in progress in this worker, by cache key. A
+# result of `None` tells waiters that the computation failed.
+_in_flight: dict[str, asyncio.Future[Cached | None]] = {}
+# Background refreshes, referenced until done so they are not collected.
+_refreshes: set[asyncio.Task[None]] = set()
+
+
+def _pack(fresh_until: float, cached: Cached) -> bytes:
+    etag = (cached.etag or "").encode()
+    return _MARKER + _HEADER.pack(fresh_until, len(etag)) + etag + cached.body
+
+
+def _unpack(entry: bytes) -> tuple[float, Cached]:
+    if entry[:1] != _MARKER:
+        (fresh_until,) = _LEGACY_HEADER.unpack_from(entry)
+        size = _LEGACY_HEADER.size
+        return fresh_until, Cached(entry[size:])
+
+    fresh_until, etag_size = _HEADER.unpack_from(entry, 1)
+    etag_start = 1 + _HEADER.size
+    body_start = etag_start + etag_size
+    etag = entry[etag_start:body_start].decode() or None
+    return fresh_until, Cached(entry[body_start:], etag)
+
+
+def _uncacheable(request: Request | None) -> bool:
+    if not FastAPICache.get_enable() or FastAPICache._backend is None:
+        return True
+    if request is None:
+        return False
+    if request.method != "GET":
+        return True
+    return request.headers.get("Cache-Control") == "no-store"
+
+
+async def _read(key: str) -> tuple[float, Cached] | None:
+    try:
+        _, entry = await FastAPICache.get_backend().get_with_ttl(key)
+    except Exception:
+        logger.warning("Could not read cache key `%s`", key, exc_info=True)
+        return None
+
+    return _unpack(entry) if entry else None
+
+
+async def _build_key(
+    func: Callable[..., Any],
+    namespace: str,
+    key_builder: KeyBuilder | None,
+    *,
+    request: Request | None,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> str | None:
+    """Returns the cache key of a call, or `None` if it cannot be built.
+
+    Key builders read the namespace version from Redis, so like reads and
+    writes, a failure there only costs the cache, not the request.
+    """
+    build_key = key_builder or FastAPICache.get_key_builder()
+    try:
+        key = build_key(
+            func,
+            f"{FastAPICache.get_prefix()}:{namespace}",
+            request=request,
+            response=None,
+            args=args,
+            kwargs=kwargs,
+        )
+        if inspect.isawaitable(key):
+            key = await key
+    except Exception:
+        logger.warning(
+            "Could not build the cache key of `%s`", func.__name__, exc_info=True
+        )
+        return None
+
+    return key
+
+
+async def _write(key: str, cached: Cached, expire: int, grace: int) -> None:
+    entry = _pack(time.time() + expire, cached)
+    try:
+        await FastAPICache.get_backend().set(key, entry, expire + grace)
+    except Exception:
+        logger.warning("Could not write cache key `%s`", key, exc_info=True)
+
+
+async def _wait_for(key: str) -> Cached | None:
+    """Polls for a fresh entry that another worker is computing."""
+    deadline = time.monotonic() + LOCK_WAIT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(POLL_INTERVAL)
+        entry = await _read(key)
+        if entry is not None and entry[0] > time.time():
+            return entry[1]
+
+    return None
+
+
+async def _call(
+    func: Callable[..., Awaitable[Any]],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    etag: ETagFunction | None,
+) -> Any:
+    """Calls the endpoint, adding the ETag of its entity to the response.
+
+    The ETag is read first, so that a write racing the call leaves an entry
+    with an outdated ETag, which clients merely revalidate, rather than an
+    outdated body behind a current ETag.
+    """
+    tag = await etag(kwargs) if etag is not None else None
+    response = await func(*args, **kwargs)
+    if tag is not None and isinstance(response, Response):
+        response.headers["ETag"] = tag
+
+    return response
+
+
+async def _recompute(
+    key: str,
+    stale: Cached | None,
+    compute: Callable[[], Awaitable[Any]],
+    expire: int,
+    grace: int,
+) -> tuple[Cached, str]:
+    """Recomputes an entry unless another worker already does."""
+    backend = FastAPICache.get_backend()
+    lock = None
+    if isinstance(backend, TwoTierBackend):
+        try:
+            lock = await backend.acquire_lock(key, LOCK_TTL)
+        except Exception:
+            logger.warning("Could not lock cache key `%s`", key, exc_info=True)
+            lock = ""
+
+        if lock is None:
+            if stale is not None:
+                return stale, "STALE"
+            cached = await _wait_for(key)
+            if cached is not None:
+                return cached, "HIT"
+
+    try:
+        response = await compute()
+        etag = response.headers.get("ETag") if isinstance(response, Response) else None
+        cached = Cached(FastAPICache.get_coder().encode(response), etag)
+        await _write(key, cached, expire, grace)
+    finally:
+        if lock:
+            try:
+                await backend.release_lock(key, lock)  # type: ignore[attr-defined]
+            except Exception:
+                logger.warning("Could not unlock cache key `%s`", key, exc_info=True)
+
+    return cached, "MISS"
+
+
+async def _single_flight(
+    key: str,
+    stale: Cached | None,
+    compute: Callable[[], Awaitable[Any]],
+    expire: int,
+    grace: int,
+) -> tuple[Cached, str]:
+    """Lets concurrent misses for `key` in this worker share one computation."""
+    future = _in_flight.get(key)
+    if future is not None:
+        cached = await asyncio.shield(future)
+        if cached is not None:
+            return cached, "HIT"
+        # The computation failed; retry it for this request alone.
+        return await _recompute(key, stale, compute, expire, grace)
+
+    future = asyncio.get_running_loop().create_future()
+    _in_flight[key] = future
+    try:
+        cached, status = await _recompute(key, stale, compute, expire, grace)
+    except BaseException:
+        future.set_result(None)
+        raise
+    else:
+        future.set_result(cached)
+    finally:
+        del _in_flight[key]
+
+    return cached, status
+
+
+async def _refresh(
+    key: str,
+    stale: Cached,
+    compute: Callable[[], Awaitable[Any]],
+    expire: int,
+    grace: int,
+) -> None:
+    try:
+        await _single_flight(key, stale, compute, expire, grace)
+    except Exception:
+        logger.warning("Could not refresh cache key `%s`", key, exc_info=True)
+
+
+def _refresh_in_background(
+    key: str,
+    stale: Cached,
+    func: Callable[..., Awaitable[Any]],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    etag: ETagFunction | None,
+    expire: int,
+    grace: int,
+) -> None:
+    """Schedules a refresh of `key` unless this worker already computes it.
+
+    The request's database session is closed once the response is sent, so
+    the refresh runs the endpoint with a session of its own.
+    """
+    if key in _in_flight:
+        return
+
+    async def compute() -> Any:
+        async with async_session() as db_session:
+            return await _call(
+                func,
+                args,
+                {
+                    name: db_session if isinstance(value, AsyncSession) else value
+                    for name, value in kwargs.items()
+                },
+                etag,
+            )
+
+    task = asyncio.create_task(_refresh(key, stale, compute, expire, grace))
+    _refreshes.add(task)
+    task.add_done_callback(_refreshes.discard)
+
+
+def request_parameter(
+    func: Callable[..., Any], name: str
+) -> tuple[inspect.Signature, str, bool]:
+    """Returns the signature of `func` with a `Request` parameter.
+
+    The endpoint's own `Request` parameter is used if it has one. Otherwise one
+    called `name` is added and `True` is returned as the last item, so that the
+    wrapper knows to remove it from the arguments before calling `func`.
+    """
+    signature = inspect.signature(func)
+    for param in signature.parameters.values():
+        if param.annotation is Request:
+            return signature, param.name, False
+
+    param = inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+    signature = signature.replace(parameters=[*signature.parameters.values(), param])
+    return signature, name, True
+
+
+def cache(
+    expire: int,
+    namespace: str = "",
+    key_builder: KeyBuilder | None = None,
+    stale_while_revalidate: int = 0,
+    etag: ETagFunction | None = None,
+) -> Callable[[Callable[..., Awaitable[Any]]], Callable[..., Awaitable[Any]]]:
+    """Caches the response of an endpoint for `expire` seconds.
+
+    With `stale_while_revalidate`, an entry is still served for that many
+    seconds after it expires, while it is refreshed in the background.
+
+    With `etag`, responses carry the ETag it returns for the endpoint's
+    arguments, and requests whose `If-None-Match` matches get an empty 304.
+    The ETag is stored with the entry, so it is only looked up on a miss.
+    """
+    grace = max(STALE_GRACE, stale_while_revalidate)
+
+    def wrapper(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        signature, request_name, injected = request_parameter(func, "__cache_request")
+
+        @wraps(func)
+        async def inner(*args: Any, **kwargs: Any) -> Any:
+            if injected:
+                request = kwargs.pop(request_name, None)
+            else:
+                request = kwargs.get(request_name)
+
+            if_none_match = request.headers.get("If-None-Match") if request else None
+
+            async def revalidate() -> Response | None:
+                """Answers a conditional request without computing the body."""
+                if etag is None or not if_none_match:
+                    return None
+                tag = await etag(kwargs)
+                if tag is not None and etag_matches(if_none_match, tag):
+                    return not_modified(tag)
+                return None
+
+            if _uncacheable(request):
+                return await revalidate() or await _call(func, args, kwargs, etag)
+
+            if request is not None and WARMER_HEADER not in request.headers:
+                url = request.url
+                access_log.record(f"{url.path}?{url.query}" if url.query else url.path)
+
+            key = await _build_key(
+                func,
+                namespace,
+                key_builder,
+                request=request,
+                args=args,
+                kwargs={
+                    name: value
+                    for name, value in kwargs.items()
+                    if name != request_name
+                },
+            )
+            if key is None:
+                return await revalidate() or await _call(func, args, kwargs, etag)
+
+            now = time.time()
+            entry = await _read(key)
+            if entry is not None and entry[0] > now:
+                cached, status = entry[1], "HIT"
+            elif entry is not None and entry[0] + stale_while_revalidate > now:
+                cached, status = entry[1], "STALE"
+                _refresh_in_background(
+                    key, cached, func, args, kwargs, etag, expire, grace
+                )
+            else:
+                unchanged = await revalidate()
+                if unchanged is not None:
+                    return unchanged
+
+                stale = entry[1] if entry is not None else None
+                cached, status = await _single_flight(
+                    key,
+                    stale,
+                    lambda: _call(func, args, kwargs, etag),
+                    expire,
+                    grace,
+                )
+
+            if (
+                cached.etag
+                and if_none_match
+                and etag_matches(if_none_match, cached.etag)
+            ):
+                return not_modified(cached.etag)
+
+            response: Response = FastAPICache.get_coder().decode_as_type(
+                cached.body, type_=None
+            )
+            response.headers[FastAPICache.get_cache_status_header()] = status
+            if cached.etag:
+                response.headers["ETag"] = cached.etag
+            return response
+
+        inner.__signature__ = signature  # type: ignore[attr-defined]
+        return inner
+
+    return wrapper
@@ -0,0 +1,127 @@
+"""
+Module for building response cache keys.
+
+The default key builder of `fastapi-cache` hashes the `repr` of every endpoint
+argument, including the database session, whose `repr` differs per request,
+so cached responses were never found again. Keys are built here from the
+validated request parameters instead, normalized so that equivalent requests
+share an entry: unset parameters are dropped and multi-valued ones sorted,
+which makes `?genre_ids=2&genre_ids=1` and `?genre_ids=1&genre_ids=2` the same
+key. The session and the authenticated user are left out, since no cached
+response depends on who asked for it.
+
+Every key also carries a version token of its namespace, so writes can
+invalidate entries without scanning Redis (see `screenscout.cache.service`):
+
+- `{namespace}:lists:{version}:...` for list queries, whose version is replaced
+  on every write to the namespace;
+- `{namespace}:items:{version}:{id}` for single entities, which are deleted one
+  by one and whose version is only replaced when an entity they embed, such as
+  a genre, changes.
+"""
+
+import hashlib
+import json
+from collections.abc import Awaitable, Callable
+from enum import Enum
+from typing import Any
+
+from fastapi_cache import FastAPICache
+from fastapi_cache.types import Backend
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+from starlette.responses import Response
+
+from screenscout.database.core import Base
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {
+            name: _normalize(item) for name, item in value.items() if item is not None
+        }
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sorted((_normalize(item) for item in value), key=repr)
+    return value
+
+
+def request_key_builder(
+    func: Callable[..., Any],
+    namespace: str = "",
+    *,
+    request: Request | None = None,
+    response: Response | None = None,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> str:
+    """Builds a cache key from the endpoint and its normalized parameters."""
+    params = {
+        name: _normalize(value)
+        for name, value in kwargs.items()
+        if value is not None and not isinstance(value, (AsyncSession, Base))
+    }
+    digest = hashlib.md5(
+        json.dumps(params, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+    return f"{namespace}:{func.__module__}:{func.__name__}:{digest}"
+
+
+def version_key(namespace: str, scope: str) -> str:
+    """Returns the key holding the version token of a namespace scope."""
+    return f"{namespace}:{scope}"
+
+
+async def get_version(backend: Backend, namespace: str, scope: str) -> str:
+    """Returns the current version token of a namespace scope."""
+    token = await backend.get(version_key(namespace, scope))
+
+    return token.decode() if token else "0"
+
+
+async def list_key_builder(
+    func: Callable[..., Any],
+    namespace: str = "",
+    *,
+    request: Request | None = None,
+    response: Response | None = None,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> str:
+    """Builds the key of a list query under the current list version."""
+    version = await get_version(FastAPICache.get_backend(), namespace, "lists")
+
+    return request_key_builder(
+        func,
+        f"{namespace}:lists:{version}",
+        request=request,
+        response=response,
+        args=args,
+        kwargs=kwargs,
+    )
+
+
+def item_key_builder(parameter: str) -> Callable[..., Awaitable[str]]:
+    """Returns a key builder for single entities identified by `parameter`."""
+
+    async def key_builder(
+        func: Callable[..., Any],
+        namespace: str = "",
+        *,
+        request: Request | None = None,
+        response: Response | None = None,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> str:
+        version = await get_version(FastAPICache.get_backend(), namespace, "items")
+
+        return item_key(namespace, version, kwargs[parameter])
+
+    return key_builder
+
+
+def item_key(namespace: str, version: str, id_: Any) -> str:
+    """Returns the key of a single cached entity."""
+    return f"{namespace}:items:{version}:{id_}"
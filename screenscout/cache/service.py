@@ -0,0 +1,68 @@
+import logging
+import time
+
+from fastapi_cache import FastAPICache
+
+from .breaker import bypass_breaker
+from .keys import get_version, item_key, version_key
+
+logger = logging.getLogger(__name__)
+
+# Namespaces whose cached responses embed entities of another namespace, e.g.
+# movies carry their genre names and movie lists their movie count.
+DEPENDENTS: dict[str, tuple[str, ...]] = {
+    "genres": ("movies", "series", "persons"),
+    "countries": ("movies", "series"),
+    "languages": ("movies", "series"),
+    "career_roles": ("persons",),
+    "persons": ("series",),
+    "movies": ("movie_lists",),
+    "series": ("series_lists",),
+}
+
+
+def _dependents(namespace: str) -> list[str]:
+    found: list[str] = []
+    pending = list(DEPENDENTS.get(namespace, ()))
+    while pending:
+        dependent = pending.pop()
+        if dependent not in found:
+            found.append(dependent)
+            pending.extend(DEPENDENTS.get(dependent, ()))
+
+    return found
+
+
+async def invalidate(namespace: str, *ids: int) -> None:
+    """Drops cached responses made stale by a write to `namespace`.
+
+    The entries of `ids` are deleted and every cached list of the namespace is
+    orphaned by replacing its version. All entries of dependent namespaces are
+    orphaned the same way; orphaned entries simply expire.
+    """
+    try:
+        backend = FastAPICache.get_backend()
+        prefix = FastAPICache.get_prefix()
+    except AssertionError:
+        # The cache is not initialized, e.g. when the import CLI writes.
+        return
+
+    token = str(time.time_ns()).encode()
+    cached = f"{prefix}:{namespace}"
+
+    # Invalidations are written even while the circuit breaker skips the
+    # cache, or entries would stay stale once Redis recovers.
+    try:
+        with bypass_breaker():
+            await backend.set(version_key(cached, "lists"), token)
+            for dependent in _dependents(namespace):
+                await backend.set(version_key(f"{prefix}:{dependent}", "items"), token)
+                await backend.set(version_key(f"{prefix}:{dependent}", "lists"), token)
+
+            version = await get_version(backend, cached, "items")
+            for id_ in ids:
+                await backend.clear(key=item_key(cached, version, id_))
+    except Exception:
+        logger.warning(
+            "Could not invalidate cache namespace `%s`", namespace, exc_info=True
+        )
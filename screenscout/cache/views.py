@@ -0,0 +1,24 @@
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi_cache import FastAPICache
+
+from screenscout.auth.models import Principal
+from screenscout.auth.permissions import OwnerAdmin
+
+from .backends import CacheStats, TwoTierBackend
+
+router = APIRouter()
+
+
+@router.get("/stats", response_model=CacheStats)
+async def get_cache_stats(current_user: Principal = OwnerAdmin) -> Any:
+    """Return the hit and miss counters of each cache tier of this worker."""
+    backend = FastAPICache.get_backend()
+    if not isinstance(backend, TwoTierBackend):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="The cache backend does not keep statistics.",
+        )
+
+    return backend.stats()
@@ -0,0 +1,187 @@
+"""
+Module for warming the response cache.
+
+After a deploy or a Redis flush every popular page misses at once and all of
+those misses land on Postgres together. The warmer requests such pages ahead
+of traffic, through the app itself, so they are computed and cached exactly
+as for a client:
+
+- the URLs of cached endpoints requested most often, counted in a Redis
+  sorted set by `AccessLog`;
+- the URLs listed in `CACHE_WARM_PATHS`, such as the first catalog pages,
+  which matter before any statistics exist.
+
+At most `concurrency` requests run at once, so live traffic keeps most of the
+database pool. At startup only the worker that takes a Redis lock warms, so a
+deploy warms the cache once rather than once per worker. Reference endpoints
+are answered from memory (see `screenscout.reference`) and need no warming.
+
+Run it after a deploy with `python -m screenscout.cache.cli`.
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+
+import httpx
+from fastapi import FastAPI
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+
+from screenscout.config import settings
+from screenscout.models import ScreenScoutBase
+
+logger = logging.getLogger(__name__)
+
+# Sent with warming requests, which are not counted as accesses.
+WARMER_HEADER = "X-Cache-Warmer"
+
+
+class WarmReport(ScreenScoutBase):
+    requested: int
+    failed: int
+    seconds: float
+
+
+def _access_key() -> str:
+    return f"{FastAPICache.get_prefix()}:access"
+
+
+class AccessLog:
+    """Counts requests to cached endpoints by URL.
+
+    Counts are kept in memory and added to the shared sorted set every
+    `interval` seconds, which is trimmed to the `tracked` most requested URLs.
+    """
+
+    def __init__(self, *, interval: float = 60.0, tracked: int = 5000) -> None:
+        self.interval = interval
+        self.tracked = tracked
+        self._counts: Counter[str] = Counter()
+        self._flusher: asyncio.Task[None] | None = None
+
+    def record(self, url: str) -> None:
+        self._counts[url] += 1
+
+    async def flush(self) -> None:
+        counts, self._counts = self._counts, Counter()
+        backend = FastAPICache.get_backend()
+        if not counts or not isinstance(backend, RedisBackend):
+            return
+
+        key = _access_key()
+        async with backend.redis.pipeline(transaction=False) as pipe:
+            for url, count in counts.items():
+                pipe.zincrby(key, count, url)
+            pipe.zremrangebyrank(key, 0, -self.tracked - 1)
+            await pipe.execute()
+
+    async def start(self) -> None:
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.warning("Could not record cache access counts", exc_info=True)
+
+
+access_log = AccessLog()
+
+
+async def most_requested(top: int) -> list[str]:
+    """Returns the `top` most requested URLs of cached endpoints."""
+    backend = FastAPICache.get_backend()
+    if top <= 0 or not isinstance(backend, RedisBackend):
+        return []
+
+    urls = await backend.redis.zrevrange(_access_key(), 0, top - 1)
+    return [url.decode() for url in urls]
+
+
+async def warm(
+    client: httpx.AsyncClient, urls: list[str], *, concurrency: int
+) -> WarmReport:
+    """Requests every URL, at most `concurrency` at a time."""
+    started = time.monotonic()
+    semaphore = asyncio.Semaphore(concurrency)
+    failed = 0
+
+    async def fetch(url: str) -> None:
+        nonlocal failed
+        async with semaphore:
+            try:
+                response = await client.get(url)
+            except httpx.HTTPError:
+                logger.warning("Could not warm `%s`", url, exc_info=True)
+                failed += 1
+                return
+            if response.status_code >= 500:
+                failed += 1
+
+    await asyncio.gather(*(fetch(url) for url in urls))
+
+    return WarmReport(
+        requested=len(urls), failed=failed, seconds=time.monotonic() - started
+    )
+
+
+async def warm_app(app: FastAPI, *, top: int, concurrency: int) -> WarmReport:
+    """Warms the cache with the configured and most requested URLs of `app`."""
+    urls = [f"{settings.API_V1_STR}{path}" for path in settings.CACHE_WARM_PATHS]
+    try:
+        urls.extend(await most_requested(top))
+    except Exception:
+        logger.warning("Could not read cache access counts", exc_info=True)
+    urls = list(dict.fromkeys(urls))
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+        base_url="http://warmer",
+        headers={WARMER_HEADER: "1"},
+    ) as client:
+        report = await warm(client, urls, concurrency=concurrency)
+
+    logger.info(
+        "Warmed %d cached URLs in %.1fs, %d failed",
+        report.requested,
+        report.seconds,
+        report.failed,
+    )
+    return report
+
+
+async def warm_app_once(
+    app: FastAPI, *, top: int, concurrency: int, lock_ttl: int
+) -> WarmReport | None:
+    """Warms the cache unless another worker started doing so within `lock_ttl`.
+
+    The lock is left to expire rather than released, so workers that start
+    later in a rolling deploy do not warm the cache again.
+    """
+    backend = FastAPICache.get_backend()
+    if isinstance(backend, RedisBackend):
+        try:
+            locked = await backend.redis.set(
+                f"{FastAPICache.get_prefix()}:warm:lock", 1, nx=True, ex=lock_ttl
+            )
+        except Exception:
+            logger.warning("Could not take the cache warming lock", exc_info=True)
+            return None
+        if not locked:
+            return None
+
+    return await warm_app(app, top=top, concurrency=concurrency)
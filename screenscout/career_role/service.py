@@ -1,6 +1,9 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from screenscout.cache.service import invalidate
+from screenscout.reference import notify_changed
+
 from .models import CareerRole, CareerRoleCreate, CareerRoleUpdate
 
 
@@ -34,8 +37,10 @@ async def create(
     career_role = CareerRole(**career_role_in.model_dump())
 
     db_session.add(career_role)
+    await notify_changed(db_session=db_session, table="career_roles")
     await db_session.commit()
     await db_session.refresh(career_role)
+    await invalidate("career_roles")
 
     return career_role
 
@@ -53,8 +58,10 @@ async def update(
         if field in update_data:
             setattr(career_role, field, update_data[field])
 
+    await notify_changed(db_session=db_session, table="career_roles")
     await db_session.commit()
     await db_session.refresh(career_role)
+    await invalidate("career_roles", career_role.id)
 
     return career_role
 
@@ -66,4 +73,6 @@ async def delete(*, db_session: AsyncSession, career_role_id: int) -> None:
     )
     career_role = result.scalars().first()
     await db_session.delete(career_role)
+    await notify_changed(db_session=db_session, table="career_roles")
     await db_session.commit()
+    await invalidate("career_roles", career_role_id)
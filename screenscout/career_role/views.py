@@ -1,48 +1,52 @@
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, status
-from fastapi_cache.decorator import cache
+from fastapi import APIRouter, HTTPException, Request, status
 
-from screenscout.auth.models import User
+from screenscout.auth.models import Principal
 from screenscout.auth.permissions import OwnerAdminManager
 from screenscout.database.core import SessionDep
+from screenscout.etags import conditional_response
+from screenscout.reference import reference_data
 
 from .models import CareerRoleCreate, CareerRoleRead, CareerRoleUpdate
-from .service import create, delete, get, get_all, get_by_name, update
+from .service import create, delete, get, get_by_name, update
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[CareerRoleRead])
-@cache(expire=3600)
 async def get_career_roles(
-    db_session: SessionDep, current_user: User = OwnerAdminManager
+    request: Request, current_user: Principal = OwnerAdminManager
 ) -> Any:
     """Return all career roles in the database."""
-    return await get_all(db_session=db_session)
+    career_roles = await reference_data.get("career_roles")
+
+    return conditional_response(
+        request, career_roles.body.content, career_roles.body.etag
+    )
 
 
 @router.get("/{career_role_id}", response_model=CareerRoleRead)
-@cache(expire=3600)
 async def get_career_role(
-    db_session: SessionDep, career_role_id: int, current_user: User = OwnerAdminManager
+    request: Request, career_role_id: int, current_user: Principal = OwnerAdminManager
 ) -> Any:
     """Retrieve information about a career role by its ID."""
-    career_role = await get(db_session=db_session, career_role_id=career_role_id)
-    if not career_role:
+    career_roles = await reference_data.get("career_roles")
+    body = career_roles.bodies.get(career_role_id)
+    if body is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Career role with id `{career_role_id}` does not exist.",
         )
 
-    return career_role
+    return conditional_response(request, body.content, body.etag)
 
 
 @router.post("/", response_model=CareerRoleRead, status_code=status.HTTP_201_CREATED)
 async def create_career_role(
     db_session: SessionDep,
     career_role_in: CareerRoleCreate,
-    current_user: User = OwnerAdminManager,
+    current_user: Principal = OwnerAdminManager,
 ) -> Any:
     """Create a new career role."""
     career_role = await get_by_name(db_session=db_session, name=career_role_in.name)
@@ -62,7 +66,7 @@ async def update_career_role(
     db_session: SessionDep,
     career_role_id: int,
     career_role_in: CareerRoleUpdate,
-    current_user: User = OwnerAdminManager,
+    current_user: Principal = OwnerAdminManager,
 ) -> Any:
     """Update a career role."""
     career_role = await get(db_session=db_session, career_role_id=career_role_id)
@@ -80,7 +84,9 @@ async def update_career_role(
 
 @router.delete("/{career_role_id}", response_model=None)
 async def delete_career_role(
-    db_session: SessionDep, career_role_id: int, current_user: User = OwnerAdminManager
+    db_session: SessionDep,
+    career_role_id: int,
+    current_user: Principal = OwnerAdminManager,
 ) -> None:
     """Delete a career role."""
     career_role = await get(db_session=db_session, career_role_id=career_role_id)
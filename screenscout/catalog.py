@@ -0,0 +1,146 @@
+"""
+Module for the denormalized catalog read models.
+
+`movie_catalog` and `series_catalog` keep one row per title with its genre,
+country and language ids as integer arrays behind GIN indexes, next to the
+production year. Multi-value filters become array predicates (`&&` for any-of,
+`@>` for all-of) that are answered from those indexes in one bitmap scan,
+instead of one EXISTS subquery through an association table per filter.
+
+The rows are written by statement-level triggers on the title and association
+tables, so every write path, including bulk imports and raw SQL, keeps them in
+sync within the same transaction.
+
+Facet counts for a set of filters are computed from the same arrays with one
+grouped `UNION ALL` query over the matching rows.
+"""
+
+from datetime import date
+from typing import Annotated, Any
+
+from fastapi import Depends, Query
+from pydantic import Field
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    Select,
+    cast,
+    func,
+    literal_column,
+    select,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from screenscout.enums import ScreenScoutEnum
+from screenscout.models import ScreenScoutBase
+
+
+class MatchMode(ScreenScoutEnum):
+    ANY = "any"
+    ALL = "all"
+
+
+def array_filter(
+    column: InstrumentedAttribute[Any], ids: list[int], *, match: MatchMode
+) -> ColumnElement[bool]:
+    """Matches rows whose array column holds any, or all, of `ids`."""
+    if match == MatchMode.ALL:
+        return column.contains(ids)
+
+    return column.overlap(ids)
+
+
+def catalog_filters(
+    search: str | None = Query(None, min_length=2),
+    title: str | None = None,
+    production_year: date | None = None,
+    country_id: int | None = None,
+    genre_id: int | None = None,
+    min_rating: float | None = None,
+    max_rating: float | None = None,
+    genre_ids: list[int] | None = Query(None),
+    genre_match: MatchMode = MatchMode.ANY,
+    country_ids: list[int] | None = Query(None),
+    language_ids: list[int] | None = Query(None),
+    year_from: int | None = None,
+    year_to: int | None = None,
+) -> dict[str, Any]:
+    """Query parameters shared by the catalog list and facet endpoints."""
+    return dict(
+        search=search,
+        title=title,
+        production_year=production_year,
+        country_id=country_id,
+        genre_id=genre_id,
+        min_rating=min_rating,
+        max_rating=max_rating,
+        genre_ids=genre_ids,
+        genre_match=genre_match,
+        country_ids=country_ids,
+        language_ids=language_ids,
+        year_from=year_from,
+        year_to=year_to,
+    )
+
+
+CatalogFilters = Annotated[dict[str, Any], Depends(catalog_filters)]
+
+
+class FacetCount(ScreenScoutBase):
+    value: int
+    count: int
+
+
+class CatalogFacets(ScreenScoutBase):
+    genres: list[FacetCount] = Field(default_factory=list)
+    countries: list[FacetCount] = Field(default_factory=list)
+    languages: list[FacetCount] = Field(default_factory=list)
+    years: list[FacetCount] = Field(default_factory=list)
+    # Keyed by the whole rating point, e.g. `7` counts ratings from 7.0 to 7.9.
+    ratings: list[FacetCount] = Field(default_factory=list)
+
+
+async def count_facets(
+    *, db_session: AsyncSession, matched: Select  # type: ignore[type-arg]
+) -> CatalogFacets:
+    """Counts the values of every facet over the rows of `matched`.
+
+    `matched` must select the `genre_ids`, `country_ids`, `language_ids`,
+    `year` and `rating` columns of the filtered titles.
+    """
+    rows = matched.cte("matched")
+
+    queries = []
+    for facet, column in (
+        ("genres", rows.c.genre_ids),
+        ("countries", rows.c.country_ids),
+        ("languages", rows.c.language_ids),
+    ):
+        value = func.unnest(column).column_valued("value")
+        queries.append(
+            select(literal_column(f"'{facet}'"), value, func.count())
+            .select_from(rows)
+            .group_by(value)
+        )
+
+    buckets: tuple[tuple[str, ColumnElement[Any]], ...] = (
+        ("years", rows.c.year),
+        ("ratings", cast(func.floor(rows.c.rating), Integer)),
+    )
+    for facet, bucket in buckets:
+        queries.append(
+            select(literal_column(f"'{facet}'"), bucket, func.count()).group_by(bucket)
+        )
+
+    result = await db_session.execute(union_all(*queries))
+
+    facets: dict[str, list[FacetCount]] = {}
+    for facet, value, count in result.all():
+        facets.setdefault(facet, []).append(FacetCount(value=value, count=count))
+
+    for counts in facets.values():
+        counts.sort(key=lambda facet_count: (-facet_count.count, facet_count.value))
+
+    return CatalogFacets(**facets)
@@ -0,0 +1,67 @@
+"""
+Command line entry point for bulk catalog imports.
+
+    python -m screenscout.catalog_import.cli movies titles.ndjson
+    python -m screenscout.catalog_import.cli series titles.csv --format csv
+
+Progress is printed to stderr after every committed batch; rejected rows are
+written to stdout as NDJSON, one error per line.
+"""
+
+import argparse
+import asyncio
+import sys
+
+from screenscout.config import settings
+from screenscout.database.core import async_session
+
+from .models import ImportFormat
+from .service import MOVIES, SERIES, import_rows
+
+SPECS = {"movies": MOVIES, "series": SERIES}
+
+
+async def run(kind: str, path: str, format: ImportFormat, batch_size: int) -> int:
+    processed = imported = rejected = 0
+
+    with open(path, encoding="utf-8", newline="") as lines:
+        async with async_session() as db_session:
+            async for batch in import_rows(
+                db_session=db_session,
+                lines=lines,
+                spec=SPECS[kind],
+                format=format,
+                batch_size=batch_size,
+            ):
+                processed += batch.processed
+                imported += batch.imported
+                rejected += len({error.line for error in batch.errors})
+                for error in batch.errors:
+                    sys.stdout.write(error.model_dump_json() + "\n")
+                print(
+                    f"{processed} rows processed, {imported} imported, "
+                    f"{rejected} rejected",
+                    file=sys.stderr,
+                )
+
+    return 1 if rejected else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import catalog titles.")
+    parser.add_argument("kind", choices=SPECS)
+    parser.add_argument("path")
+    parser.add_argument(
+        "--format",
+        type=ImportFormat,
+        choices=list(ImportFormat),
+        default=ImportFormat.NDJSON,
+    )
+    parser.add_argument("--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(run(args.kind, args.path, args.format, args.batch_size)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+from pydantic import Field
+
+from screenscout.enums import ScreenScoutEnum
+from screenscout.models import ScreenScoutBase
+from screenscout.movie.models import MovieBase
+from screenscout.series.models import SeriesBase
+
+
+class ImportFormat(ScreenScoutEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class MovieImportRow(MovieBase):
+    country: list[str] = Field(default_factory=list)
+    genres: list[str] = Field(default_factory=list)
+    language: list[str] = Field(default_factory=list)
+
+
+class SeriesImportRow(SeriesBase):
+    country: list[str] = Field(default_factory=list)
+    genres: list[str] = Field(default_factory=list)
+    language: list[str] = Field(default_factory=list)
+    director: list[int] = Field(default_factory=list)
+
+
+class ImportRowError(ScreenScoutBase):
+    line: int
+    error: str
+
+
+class ImportBatch(ScreenScoutBase):
+    processed: int
+    imported: int
+    errors: list[ImportRowError]
+
+
+class ImportProgress(ScreenScoutBase):
+    """Running totals of an import, with the errors of its latest batch."""
+
+    processed: int = 0
+    imported: int = 0
+    rejected: int = 0
+    errors: list[ImportRowError] = Field(default_factory=list)
@@ -0,0 +1,357 @@
+"""
+Module for bulk loading catalog titles.
+
+Rows are parsed and validated in Python, in a worker thread so the event loop
+keeps serving requests, then each batch is loaded with asyncpg's binary COPY
+into a temporary staging table. Everything else happens in SQL, in one
+transaction per batch: rows referencing unknown genres, countries, languages or
+persons, titles that already exist and titles repeated within the batch are
+reported and dropped; ids are drawn from the target table's sequence; the rows and all
+their association links are inserted with one `INSERT ... SELECT` each.
+"""
+
+import csv
+import itertools
+import json
+from collections.abc import AsyncIterator, Iterable, Iterator
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any
+
+from pydantic import ValidationError
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from screenscout.cache.service import invalidate
+
+from .models import (
+    ImportBatch,
+    ImportFormat,
+    ImportRowError,
+    MovieImportRow,
+    SeriesImportRow,
+)
+
+# Separator of multi-valued cells in CSV files, e.g. `Drama|Crime`.
+CSV_LIST_SEPARATOR = "|"
+
+
+@dataclass(frozen=True)
+class Link:
+    """An association table filled from a list column of the staging table."""
+
+    table: str
+    target_column: str
+    source: str
+    reference: str
+    key: str
+    label: str
+
+
+@dataclass(frozen=True)
+class ImportSpec:
+    """Describes how rows of one catalog table are staged and merged."""
+
+    table: str
+    label: str
+    owner_column: str
+    row_model: type[MovieImportRow] | type[SeriesImportRow]
+    # Scalar columns copied to the target table, with their staging types.
+    columns: tuple[tuple[str, str], ...]
+    links: tuple[Link, ...]
+    # Scalar foreign keys checked before merging: (column, table, label).
+    references: tuple[tuple[str, str, str], ...] = ()
+
+    @property
+    def staging_table(self) -> str:
+        return f"{self.table}_import"
+
+    @property
+    def list_fields(self) -> tuple[str, ...]:
+        return tuple(link.source for link in self.links)
+
+
+MOVIES = ImportSpec(
+    table="movies",
+    label="Movie",
+    owner_column="movie_id",
+    row_model=MovieImportRow,
+    columns=(
+        ("title", "text"),
+        ("production_year", "date"),
+        ("IMDb_rating", "numeric(3, 1)"),
+        ("description", "text"),
+        ("director_id", "integer"),
+        ("age_category", "text"),
+        ("duration", "integer"),
+        ("poster_url", "text"),
+        ("trailer_url", "text"),
+        ("budget", "integer"),
+        ("box_office", "integer"),
+    ),
+    links=(
+        Link("movie_country", "country_id", "country", "countries", "name", "Country"),
+        Link("movie_genre", "genre_id", "genres", "genres", "name", "Genre"),
+        Link(
+            "movie_language", "language_id", "language", "languages", "name", "Language"
+        ),
+    ),
+    references=(("director_id", "persons", "Person"),),
+)
+
+SERIES = ImportSpec(
+    table="series",
+    label="Series",
+    owner_column="series_id",
+    row_model=SeriesImportRow,
+    columns=(
+        ("title", "text"),
+        ("production_year", "date"),
+        ("IMDb_rating", "numeric(3, 1)"),
+        ("seasons_count", "integer"),
+        ("description", "text"),
+        ("age_category", "text"),
+        ("poster_url", "text"),
+        ("trailer_url", "text"),
+    ),
+    links=(
+        Link("series_country", "country_id", "country", "countries", "name", "Country"),
+        Link("series_genre", "genre_id", "genres", "genres", "name", "Genre"),
+        Link(
+            "series_language",
+            "language_id",
+            "language",
+            "languages",
+            "name",
+            "Language",
+        ),
+        Link("series_director", "director_id", "director", "persons", "id", "Person"),
+    ),
+)
+
+
+def parse_rows(
+    lines: Iterable[str], *, spec: ImportSpec, format: ImportFormat
+) -> Iterator[tuple[int, dict[str, Any] | None, str | None]]:
+    """Yields `(line, raw row, parse error)` for every record of the input."""
+    if format == ImportFormat.CSV:
+        reader = csv.DictReader(lines)
+        for record in reader:
+            row: dict[str, Any] = {
+                field: value if value != "" else None for field, value in record.items()
+            }
+            for field in spec.list_fields:
+                value = row.get(field)
+                row[field] = value.split(CSV_LIST_SEPARATOR) if value else []
+            yield reader.line_num, row, None
+        return
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line), None
+        except json.JSONDecodeError as exc:
+            yield line_number, None, f"Invalid JSON: {exc.msg}"
+
+
+async def import_rows(
+    *,
+    db_session: AsyncSession,
+    lines: Iterable[str],
+    spec: ImportSpec,
+    format: ImportFormat,
+    batch_size: int,
+) -> AsyncIterator[ImportBatch]:
+    """Imports catalog rows in batches, yielding a result after each commit."""
+    rows = parse_rows(lines, spec=spec, format=format)
+
+    while True:
+        records, errors, processed = await run_in_threadpool(
+            _read_batch, rows, spec=spec, batch_size=batch_size
+        )
+        if not processed:
+            return
+
+        yield await _import_batch(
+            db_session=db_session,
+            records=records,
+            errors=errors,
+            processed=processed,
+            spec=spec,
+        )
+
+
+def _read_batch(
+    rows: Iterator[tuple[int, dict[str, Any] | None, str | None]],
+    *,
+    spec: ImportSpec,
+    batch_size: int,
+) -> tuple[list[tuple[Any, ...]], list[ImportRowError], int]:
+    """Reads and validates up to `batch_size` rows; runs in a worker thread."""
+    records: list[tuple[Any, ...]] = []
+    errors: list[ImportRowError] = []
+    processed = 0
+
+    for line, raw, parse_error in itertools.islice(rows, batch_size):
+        processed += 1
+        try:
+            if parse_error is not None:
+                raise ValueError(parse_error)
+            row = spec.row_model.model_validate(raw)
+        except (ValidationError, ValueError) as exc:
+            errors.append(ImportRowError(line=line, error=str(exc)))
+        else:
+            records.append(_to_record(row, line=line, spec=spec))
+
+    return records, errors, processed
+
+
+def _to_record(
+    row: MovieImportRow | SeriesImportRow, *, line: int, spec: ImportSpec
+) -> tuple[Any, ...]:
+    """Orders a validated row the way the staging table lays out its columns."""
+    values = row.model_dump()
+    # Binary COPY encodes `numeric` from `Decimal` only.
+    values["IMDb_rating"] = Decimal(str(values["IMDb_rating"]))
+
+    return (
+        line,
+        *(values[column] for column, _ in spec.columns),
+        *(values[link.source] for link in spec.links),
+    )
+
+
+async def _import_batch(
+    *,
+    db_session: AsyncSession,
+    records: list[tuple[Any, ...]],
+    errors: list[ImportRowError],
+    processed: int,
+    spec: ImportSpec,
+) -> ImportBatch:
+    """Stages one batch with COPY and merges the valid rows."""
+    if not records:
+        return ImportBatch(processed=processed, imported=0, errors=errors)
+
+    staging = spec.staging_table
+    link_columns = [
+        (link.source, "text[]" if link.key == "name" else "integer[]")
+        for link in spec.links
+    ]
+    staging_columns = [("line", "integer"), *spec.columns, *link_columns]
+    column_ddl = ", ".join(f'"{name}" {type_}' for name, type_ in staging_columns)
+
+    await db_session.execute(
+        text(f"CREATE TEMP TABLE {staging} ({column_ddl}, id integer) ON COMMIT DROP")
+    )
+
+    connection = await db_session.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(  # type: ignore
+        staging,
+        records=records,
+        columns=[name for name, _ in staging_columns],
+    )
+
+    rejected = await _validate_staging(db_session=db_session, spec=spec)
+    if rejected:
+        await db_session.execute(
+            text(f"DELETE FROM {staging} WHERE line = ANY(:lines)"),
+            {"lines": list(rejected)},
+        )
+        errors.extend(
+            ImportRowError(line=line, error=error)
+            for line, messages in rejected.items()
+            for error in messages
+        )
+
+    await db_session.execute(
+        text(
+            f"UPDATE {staging} "
+            f"SET id = nextval(pg_get_serial_sequence('{spec.table}', 'id'))"
+        )
+    )
+
+    columns = ", ".join(f'"{name}"' for name, _ in spec.columns)
+    result = await db_session.execute(
+        text(
+            f"INSERT INTO {spec.table} (id, {columns}) "
+            f"SELECT id, {columns} FROM {staging}"
+        )
+    )
+    imported = result.rowcount  # type: ignore[attr-defined]
+
+    for link in spec.links:
+        await db_session.execute(
+            text(
+                f"INSERT INTO {link.table} ({spec.owner_column}, {link.target_column}) "
+                f"SELECT DISTINCT s.id, r.id FROM {staging} s "
+                f"CROSS JOIN LATERAL unnest(s.{link.source}) AS v(value) "
+                f"JOIN {link.reference} r ON r.{link.key} = v.value "
+                "ON CONFLICT DO NOTHING"
+            )
+        )
+
+    await db_session.commit()
+    await invalidate(spec.table)
+
+    errors.sort(key=lambda error: error.line)
+
+    return ImportBatch(processed=processed, imported=imported, errors=errors)
+
+
+async def _validate_staging(
+    *, db_session: AsyncSession, spec: ImportSpec
+) -> dict[int, list[str]]:
+    """Returns the error messages of staged rows that cannot be merged."""
+    staging = spec.staging_table
+    checks = [
+        f"SELECT s.line, format('{spec.label} `%s` (%s) already exists', s.title, "
+        f"extract(year FROM s.production_year)) FROM {staging} s "
+        f"WHERE EXISTS (SELECT 1 FROM {spec.table} t WHERE t.title = s.title "
+        "AND t.production_year = s.production_year)",
+    ]
+
+    for column, reference, label in spec.references:
+        checks.append(
+            f"SELECT s.line, format('{label} with id `%s` does not exist', "
+            f"s.{column}) FROM {staging} s "
+            f"LEFT JOIN {reference} r ON r.id = s.{column} WHERE r.id IS NULL"
+        )
+
+    for link in spec.links:
+        checks.append(
+            f"SELECT s.line, format('{link.label} `%s` does not exist', v.value) "
+            f"FROM {staging} s CROSS JOIN LATERAL unnest(s.{link.source}) AS v(value) "
+            f"LEFT JOIN {link.reference} r ON r.{link.key} = v.value "
+            "WHERE r.id IS NULL"
+        )
+
+    result = await db_session.execute(text(" UNION ALL ".join(checks)))
+
+    rejected: dict[int, list[str]] = {}
+    for line, error in result.all():
+        rejected.setdefault(line, []).append(error)
+
+    # Titles from earlier batches are caught above, repeats within this batch
+    # here. Only rows that passed the other checks take part, so the first
+    # valid row of a title is kept rather than one rejected anyway.
+    result = await db_session.execute(
+        text(
+            f"SELECT s.line, format('{spec.label} `%s` (%s) duplicates line %s', "
+            "s.title, extract(year FROM s.production_year), s.first_line) "
+            "FROM (SELECT line, title, production_year, "
+            "row_number() OVER same_title AS position, "
+            "first_value(line) OVER same_title AS first_line "
+            f"FROM {staging} WHERE line <> ALL(CAST(:rejected AS integer[])) "
+            "WINDOW same_title AS (PARTITION BY title, production_year ORDER BY line)"
+            ") s WHERE s.position > 1"
+        ),
+        {"rejected": list(rejected)},
+    )
+    for line, error in result.all():
+        rejected.setdefault(line, []).append(error)
+
+    return rejected
@@ -0,0 +1,103 @@
+import io
+import shutil
+import tempfile
+from collections.abc import AsyncIterator
+from typing import IO, Any
+
+from fastapi import APIRouter, File, UploadFile
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from screenscout.auth.models import Principal
+from screenscout.auth.permissions import OwnerAdmin
+from screenscout.config import settings
+from screenscout.database.core import async_session
+
+from .models import ImportFormat, ImportProgress
+from .service import MOVIES, SERIES, ImportSpec, import_rows
+
+router = APIRouter()
+
+
+def _copy_upload(file: UploadFile) -> IO[bytes]:
+    """Copies an upload, which is closed when the endpoint returns, for streaming."""
+    copy = tempfile.TemporaryFile()
+    file.file.seek(0)
+    shutil.copyfileobj(file.file, copy)
+    copy.seek(0)
+
+    return copy
+
+
+async def _stream_import(
+    *, source: IO[bytes], spec: ImportSpec, format: ImportFormat
+) -> AsyncIterator[bytes]:
+    """Runs an import batch by batch, writing the progress as NDJSON.
+
+    The import has its own session, as the request's is closed before the
+    response is streamed.
+    """
+    progress = ImportProgress()
+
+    with io.TextIOWrapper(source, encoding="utf-8", newline="") as lines:
+        async with async_session() as db_session:
+            async for batch in import_rows(
+                db_session=db_session,
+                lines=lines,
+                spec=spec,
+                format=format,
+                batch_size=settings.IMPORT_BATCH_SIZE,
+            ):
+                progress = ImportProgress(
+                    processed=progress.processed + batch.processed,
+                    imported=progress.imported + batch.imported,
+                    rejected=progress.rejected
+                    + len({error.line for error in batch.errors}),
+                    errors=batch.errors,
+                )
+                yield progress.model_dump_json().encode() + b"\n"
+
+
+async def _run_import(
+    *, file: UploadFile, spec: ImportSpec, format: ImportFormat
+) -> StreamingResponse:
+    source = await run_in_threadpool(_copy_upload, file)
+
+    return StreamingResponse(
+        _stream_import(source=source, spec=spec, format=format),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.post("/movies", response_class=StreamingResponse)
+async def import_movies(
+    file: UploadFile = File(...),
+    format: ImportFormat = ImportFormat.NDJSON,
+    current_user: Principal = OwnerAdmin,
+) -> Any:
+    """
+    Bulk import movies from an NDJSON or CSV file.
+
+    Genres, countries and languages are given by name. Rows that fail
+    validation or reference unknown entities are skipped. The response is
+    NDJSON with one `ImportProgress` line per committed batch: running totals
+    and the errors of that batch, by line.
+    """
+    return await _run_import(file=file, spec=MOVIES, format=format)
+
+
+@router.post("/series", response_class=StreamingResponse)
+async def import_series(
+    file: UploadFile = File(...),
+    format: ImportFormat = ImportFormat.NDJSON,
+    current_user: Principal = OwnerAdmin,
+) -> Any:
+    """
+    Bulk import series from an NDJSON or CSV file.
+
+    Genres, countries and languages are given by name, directors by person id.
+    Rows that fail validation or reference unknown entities are skipped. The
+    response is NDJSON with one `ImportProgress` line per committed batch:
+    running totals and the errors of that batch, by line.
+    """
+    return await _run_import(file=file, spec=SERIES, format=format)
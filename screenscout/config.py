@@ -1,6 +1,8 @@
 from pydantic import EmailStr, PostgresDsn
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from screenscout.cache.coder import Compression
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -28,6 +30,77 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    # Revoked token ids are checked in memory against a Bloom filter sized for
+    # this many ids; a match is confirmed in Redis.
+    REVOKED_TOKENS_CAPACITY: int = 100_000
+    REVOKED_TOKENS_ERROR_RATE: float = 0.001
+
+    # Cost of new password hashes; hashes of another cost are replaced on
+    # sign-in. Hashing runs on PASSWORD_HASH_WORKERS threads at most.
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+
+    # Sign-ins, and separately sign-ups, allowed per client IP and per account
+    # from each IP: bursts of up to *_BURST requests, refilled at *_PER_MINUTE.
+    AUTH_RATE_LIMIT_IP_BURST: int = 20
+    AUTH_RATE_LIMIT_IP_PER_MINUTE: float = 10.0
+    AUTH_RATE_LIMIT_ACCOUNT_BURST: int = 5
+    AUTH_RATE_LIMIT_ACCOUNT_PER_MINUTE: float = 2.0
+
+    IMPORT_BATCH_SIZE: int = 5000
+
+    REDIS_URL: str = "redis://localhost"
+    REDIS_MAX_CONNECTIONS: int = 64
+    REDIS_SOCKET_TIMEOUT: float = 0.25
+    REDIS_CONNECT_TIMEOUT: float = 0.5
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+
+    # The cache is skipped for CACHE_BREAKER_RESET seconds once this share of
+    # the last CACHE_BREAKER_WINDOW Redis calls failed or were slow.
+    CACHE_BREAKER_WINDOW: int = 50
+    CACHE_BREAKER_MIN_CALLS: int = 10
+    CACHE_BREAKER_FAILURE_RATE: float = 0.5
+    CACHE_BREAKER_SLOW_CALL: float = 0.1
+    CACHE_BREAKER_RESET: float = 5.0
+
+    # Cache warming, at startup and with `python -m screenscout.cache.cli`:
+    # these paths, relative to API_V1_STR, then the most requested URLs. At
+    # startup, one worker warms and the others skip it for CACHE_WARM_LOCK_TTL
+    # seconds.
+    CACHE_WARM_ON_STARTUP: bool = True
+    CACHE_WARM_LOCK_TTL: int = 600
+    CACHE_WARM_TOP: int = 200
+    CACHE_WARM_CONCURRENCY: int = 4
+    CACHE_WARM_PATHS: list[str] = [
+        "/movies/",
+        "/movies/?sort=rating&order=desc",
+        "/movies/facets",
+        "/series/",
+        "/series/?sort=rating&order=desc",
+        "/series/facets",
+        "/persons/",
+        "/lists/movies/",
+        "/lists/series/",
+    ]
+
+    # Cached payloads of at least CACHE_COMPRESSION_MIN_SIZE bytes are stored
+    # compressed: `zlib`, `zstd` (needs `zstandard`), `lz4` (needs `lz4`) or
+    # `none`.
+    CACHE_COMPRESSION: Compression = Compression.ZLIB
+    CACHE_COMPRESSION_MIN_SIZE: int = 1024
+
+    # Per-worker cache tier in front of Redis.
+    CACHE_LOCAL_MAXSIZE: int = 10000
+    CACHE_LOCAL_TTL: float = 30.0
+
+    # Cached watchlists and titles expire after this many seconds without reads.
+    WATCHLIST_CACHE_TTL: int = 7 * 24 * 3600
+
+    # Seconds the role and status of an authenticated user are cached for.
+    PRINCIPAL_CACHE_TTL: int = 60
+    # Authorize from the role in access tokens, checking only their version.
+    AUTH_TRUST_TOKEN_CLAIMS: bool = False
 
     FIRST_OWNER_USERNAME: str
     FIRST_OWNER_EMAIL: EmailStr
@@ -1,6 +1,9 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from screenscout.cache.service import invalidate
+from screenscout.reference import notify_changed
+
 from .models import Country, CountryCreate, CountryUpdate
 
 
@@ -30,8 +33,10 @@ async def create(*, db_session: AsyncSession, country_in: CountryCreate) -> Coun
     country = Country(**country_in.model_dump())
 
     db_session.add(country)
+    await notify_changed(db_session=db_session, table="countries")
     await db_session.commit()
     await db_session.refresh(country)
+    await invalidate("countries")
 
     return country
 
@@ -46,8 +51,10 @@ async def update(
         if field in update_data:
             setattr(country, field, update_data[field])
 
+    await notify_changed(db_session=db_session, table="countries")
     await db_session.commit()
     await db_session.refresh(country)
+    await invalidate("countries", country.id)
 
     return country
 
@@ -57,4 +64,6 @@ async def delete(*, db_session: AsyncSession, country_id: int) -> None:
     result = await db_session.execute(select(Country).where(Country.id == country_id))
     country = result.scalars().first()
     await db_session.delete(country)
+    await notify_changed(db_session=db_session, table="countries")
     await db_session.commit()
+    await invalidate("countries", country_id)
@@ -1,48 +1,50 @@
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, status
-from fastapi_cache.decorator import cache
+from fastapi import APIRouter, HTTPException, Request, status
 
-from screenscout.auth.models import User
+from screenscout.auth.models import Principal
 from screenscout.auth.permissions import OwnerAdminManager
 from screenscout.database.core import SessionDep
+from screenscout.etags import conditional_response
+from screenscout.reference import reference_data
 
 from .models import CountryCreate, CountryRead, CountryUpdate
-from .service import create, delete, get, get_all, get_by_name, update
+from .service import create, delete, get, get_by_name, update
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[CountryRead])
-@cache(expire=3600)
 async def get_countries(
-    db_session: SessionDep, current_user: User = OwnerAdminManager
+    request: Request, current_user: Principal = OwnerAdminManager
 ) -> Any:
     """Return all countries in the database."""
-    return await get_all(db_session=db_session)
+    countries = await reference_data.get("countries")
+
+    return conditional_response(request, countries.body.content, countries.body.etag)
 
 
 @router.get("/{country_id}", response_model=CountryRead)
-@cache(expire=3600)
 async def get_country(
-    db_session: SessionDep, country_id: int, current_user: User = OwnerAdminManager
+    request: Request, country_id: int, current_user: Principal = OwnerAdminManager
 ) -> Any:
     """Retrieve information about a country by its ID."""
-    country = await get(db_session=db_session, country_id=country_id)
-    if not country:
+    countries = await reference_data.get("countries")
+    body = countries.bodies.get(country_id)
+    if body is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Country with id `{country_id}` does not exist.",
         )
 
-    return country
+    return conditional_response(request, body.content, body.etag)
 
 
 @router.post("/", response_model=CountryRead, status_code=status.HTTP_201_CREATED)
 async def create_country(
     db_session: SessionDep,
     country_in: CountryCreate,
-    current_user: User = OwnerAdminManager,
+    current_user: Principal = OwnerAdminManager,
 ) -> Any:
     """Create a new country."""
     country = await get_by_name(db_session=db_session, name=country_in.name)
@@ -62,7 +64,7 @@ async def update_country(
     db_session: SessionDep,
     country_id: int,
     country_in: CountryUpdate,
-    current_user: User = OwnerAdminManager,
+    current_user: Principal = OwnerAdminManager,
 ) -> Any:
     """Update a country."""
     country = await get(db_session=db_session, country_id=country_id)
@@ -80,7 +82,7 @@ async def update_country(
 
 @router.delete("/{country_id}", response_model=None)
 async def delete_country(
-    db_session: SessionDep, country_id: int, current_user: User = OwnerAdminManager
+    db_session: SessionDep, country_id: int, current_user: Principal = OwnerAdminManager
 ) -> None:
     """Delete a country."""
     country = await get(db_session=db_session, country_id=country_id)
@@ -42,8 +42,15 @@ class Base(DeclarativeBase):
     )
 
     def dict(self) -> dict[str, Any]:
-        """Returns a dict representation of a model."""
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        """Returns a dict representation of a model.
+
+        Deferred columns are skipped, as reading them would trigger a lazy load.
+        """
+        return {
+            attr.key: getattr(self, attr.key)
+            for attr in self.__mapper__.column_attrs
+            if not attr.deferred
+        }
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -0,0 +1,88 @@
+from collections.abc import Iterable, Sequence
+from typing import TypeVar
+
+from sqlalchemy import Table, delete, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from screenscout.exceptions import EntityDoesNotExist
+
+from .core import Base
+
+ModelT = TypeVar("ModelT", bound=Base)
+
+FOREIGN_KEY_VIOLATION = "23503"
+
+
+async def get_by_ids(
+    *, db_session: AsyncSession, model: type[ModelT], ids: Iterable[int]
+) -> list[ModelT]:
+    """Returns the rows with the given ids in one query, in the order requested.
+
+    Raises `EntityDoesNotExist` naming every id that has no row.
+    """
+    unique_ids = list(dict.fromkeys(ids))
+    if not unique_ids:
+        return []
+
+    query = select(model).where(model.id.in_(unique_ids))  # type: ignore
+    result = await db_session.execute(query)
+    found = {row.id: row for row in result.scalars().all()}  # type: ignore
+
+    missing = [id_ for id_ in unique_ids if id_ not in found]
+    if len(missing) == 1:
+        raise EntityDoesNotExist(
+            f"{model.__name__} with id `{missing[0]}` does not exist!"
+        )
+    if missing:
+        raise EntityDoesNotExist(
+            f"{model.__name__} with ids `{', '.join(map(str, missing))}` "
+            "do not exist!"
+        )
+
+    return [found[id_] for id_ in unique_ids]
+
+
+async def set_links(
+    *,
+    db_session: AsyncSession,
+    table: Table,
+    owner_column: str,
+    owner_id: int,
+    target_column: str,
+    targets: Sequence[Base],
+    replace: bool = False,
+) -> None:
+    """Writes the rows of an association table with one multi-row insert.
+
+    With `replace`, the owner's existing links are deleted first. Nothing is
+    committed, so callers can write all of an entity's links in one transaction.
+
+    Targets are usually validated against a snapshot (see `screenscout.reference`)
+    that may still hold rows deleted since. If the insert then violates a
+    foreign key, the transaction is rolled back and the missing targets are
+    reported as `EntityDoesNotExist`, like ids that were never valid.
+    """
+    if replace:
+        await db_session.execute(delete(table).where(table.c[owner_column] == owner_id))
+
+    if targets:
+        rows = [
+            {owner_column: owner_id, target_column: target.id}  # type: ignore
+            for target in targets
+        ]
+        try:
+            await db_session.execute(insert(table).values(rows))
+        except IntegrityError as error:
+            # asyncpg's error, with the SQLSTATE, is the cause of the DBAPI one.
+            cause = getattr(error.orig, "__cause__", None)
+            if getattr(cause, "sqlstate", None) != FOREIGN_KEY_VIOLATION:
+                raise
+            await db_session.rollback()
+            await get_by_ids(
+                db_session=db_session,
+                model=type(targets[0]),
+                ids=[target.id for target in targets],  # type: ignore
+            )
+            raise
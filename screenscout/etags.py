@@ -0,0 +1,107 @@
+"""
+Module for conditional GET on entity detail endpoints.
+
+The ETag of an entity combines its `updated_at` row version with the items
+version of its cache namespace, which is replaced whenever an entity it embeds,
+such as a genre, is written (see `screenscout.cache.service`). Both are read
+without loading the entity or its relationships.
+
+Detail endpoints pass `entity_etag` to `@cache`, which stores the ETag with the
+cached response. Hits therefore carry it, and answer a matching
+`If-None-Match` with a 304, without touching the database. The ETag is only
+looked up on a miss: to be stored with the response, or first on its own when
+the client sent `If-None-Match`, so that a 304 skips computing the body.
+"""
+
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from fastapi_cache import FastAPICache
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from starlette.requests import Request
+from starlette.responses import Response
+
+from screenscout.cache.keys import get_version
+from screenscout.database.core import Base
+from screenscout.responses import JSONBytesResponse
+
+logger = logging.getLogger(__name__)
+
+# Returns the ETag of the entity an endpoint call responds with, given the
+# call's arguments, or `None` if there is no such entity.
+ETagFunction = Callable[[dict[str, Any]], Awaitable[str | None]]
+
+
+async def _namespace_version(namespace: str) -> str:
+    try:
+        backend = FastAPICache.get_backend()
+        prefix = FastAPICache.get_prefix()
+    except AssertionError:
+        return "0"
+
+    try:
+        return await get_version(backend, f"{prefix}:{namespace}", "items")
+    except Exception:
+        logger.warning("Could not read the version of `%s`", namespace, exc_info=True)
+        return "0"
+
+
+async def get_etag(
+    *, db_session: AsyncSession, model: type[Base], id_: Any, namespace: str
+) -> str | None:
+    """Returns the strong ETag of an entity, or `None` if it does not exist."""
+    query = select(model.updated_at).where(model.id == id_)  # type: ignore
+    updated_at = await db_session.scalar(query)
+    if updated_at is None:
+        return None
+
+    version = await _namespace_version(namespace)
+    row_version = int(updated_at.timestamp() * 1_000_000)
+
+    return f'"{row_version:x}-{version}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Tells whether an `If-None-Match` header matches `etag`."""
+    if if_none_match.strip() == "*":
+        return True
+
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def conditional_response(request: Request, body: bytes, etag: str) -> Response:
+    """Returns a JSON `body`, or an empty 304 if the client has it already."""
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    return JSONBytesResponse(body, headers={"ETag": etag})
+
+
+def entity_etag(model: type[Base], *, namespace: str, parameter: str) -> ETagFunction:
+    """Returns an ETag function for the `@cache` of a detail endpoint.
+
+    `parameter` names the path parameter holding the entity id.
+    """
+
+    async def etag(kwargs: dict[str, Any]) -> str | None:
+        db_session = next(
+            value for value in kwargs.values() if isinstance(value, AsyncSession)
+        )
+
+        return await get_etag(
+            db_session=db_session,
+            model=model,
+            id_=kwargs[parameter],
+            namespace=namespace,
+        )
+
+    return etag
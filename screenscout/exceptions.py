@@ -13,6 +13,18 @@ class EntityAlreadyExists(Exception):
     """
 
 
+class InvalidCursor(Exception):
+    """
+    Pagination cursor is malformed or does not match the requested ordering.
+    """
+
+
+class InvalidFieldset(Exception):
+    """
+    Requested fields or relationships do not exist on the resource.
+    """
+
+
 class CredentialsException(HTTPException):
     """
     Exception raised when credentials could not be validated.
@@ -36,3 +48,28 @@ class UserDeactivatedException(HTTPException):
             status_code=status.HTTP_403_FORBIDDEN,
             detail="User account is deactivated",
         )
+
+
+class TokenStoreUnavailable(HTTPException):
+    """
+    Exception raised when refresh tokens cannot be read or written.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Token store is unavailable, try again later",
+        )
+
+
+class RateLimitExceeded(HTTPException):
+    """
+    Exception raised when a client made too many requests.
+    """
+
+    def __init__(self, retry_after: str) -> None:
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, try again later",
+            headers={"Retry-After": retry_after},
+        )
@@ -0,0 +1,96 @@
+"""
+Module for sparse fieldsets on list endpoints.
+
+Clients pass `fields=title,production_year` to choose the columns of each item
+and `include=genres` to choose the relationships that are embedded. Only those
+columns are selected (`load_only`) and only those relationships are eagerly
+loaded, so a grid view that needs no relationships costs a single query and
+does not transfer large text columns it never shows. The `id` is always
+returned. Without either parameter the full representation is returned.
+"""
+
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy.orm import InstrumentedAttribute, load_only, selectinload
+from sqlalchemy.sql.base import ExecutableOption
+
+from screenscout.exceptions import InvalidFieldset
+from screenscout.models import ScreenScoutBase
+
+
+class Fieldset(ScreenScoutBase):
+    columns: list[str]
+    relations: list[str]
+
+    def select(self, row: Any) -> dict[str, Any]:
+        """Returns the requested attributes of a loaded row."""
+        names = ["id", *self.columns, *self.relations]
+
+        return {name: getattr(row, name) for name in names}
+
+
+def _split(value: str, *, allowed: Sequence[str], parameter: str) -> list[str]:
+    names = list(dict.fromkeys(name.strip() for name in value.split(",")))
+    names = [name for name in names if name and name != "id"]
+
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise InvalidFieldset(
+            f"Unknown value(s) for `{parameter}`: {', '.join(unknown)}. "
+            f"Allowed: {', '.join(allowed)}."
+        )
+
+    return names
+
+
+def parse_fieldset(
+    fields: str | None,
+    include: str | None,
+    *,
+    columns: Sequence[str],
+    relations: Sequence[str],
+) -> Fieldset | None:
+    """Parses comma-separated `fields` and `include` query parameters.
+
+    Returns `None` when neither is given. Omitting `fields` selects every
+    column, omitting `include` embeds no relationships.
+    """
+    if fields is None and include is None:
+        return None
+
+    return Fieldset(
+        columns=(
+            _split(fields, allowed=columns, parameter="fields")
+            if fields is not None
+            else list(columns)
+        ),
+        relations=(
+            _split(include, allowed=relations, parameter="include")
+            if include is not None
+            else []
+        ),
+    )
+
+
+def load_options(
+    model: type[Any],
+    *,
+    fieldset: Fieldset | None,
+    relations: Sequence[str],
+    required: Sequence[InstrumentedAttribute[Any]] = (),
+) -> list[ExecutableOption]:
+    """Returns the loader options that fetch only what `fieldset` asks for.
+
+    Without a fieldset every relationship in `relations` is eagerly loaded.
+    `required` columns, such as a pagination sort key, are always selected.
+    """
+    if fieldset is None:
+        return [selectinload(getattr(model, name)) for name in relations]
+
+    loaded = [model.id, *required, *(getattr(model, name) for name in fieldset.columns)]
+    unique = {column.key: column for column in loaded}
+    options: list[ExecutableOption] = [load_only(*unique.values())]
+    options.extend(selectinload(getattr(model, name)) for name in fieldset.relations)
+
+    return options
@@ -1,6 +1,9 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from screenscout.cache.service import invalidate
+from screenscout.reference import notify_changed
+
 from .models import Genre, GenreCreate, GenreUpdate
 
 
@@ -30,8 +33,10 @@ async def create(*, db_session: AsyncSession, genre_in: GenreCreate) -> Genre:
     genre = Genre(**genre_in.model_dump())
 
     db_session.add(genre)
+    await notify_changed(db_session=db_session, table="genres")
     await db_session.commit()
     await db_session.refresh(genre)
+    await invalidate("genres")
 
     return genre
 
@@ -46,8 +51,10 @@ async def update(
         if field in update_data:
             setattr(genre, field, update_data[field])
 
+    await notify_changed(db_session=db_session, table="genres")
     await db_session.commit()
     await db_session.refresh(genre)
+    await invalidate("genres", genre.id)
 
     return genre
 
@@ -57,4 +64,6 @@ async def delete(*, db_session: AsyncSession, genre_id: int) -> None:
     result = await db_session.execute(select(Genre).where(Genre.id == genre_id))
     genre = result.scalars().first()
     await db_session.delete(genre)
+    await notify_changed(db_session=db_session, table="genres")
     await db_session.commit()
+    await invalidate("genres", genre_id)
@@ -1,48 +1,50 @@
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, status
-from fastapi_cache.decorator import cache
+from fastapi import APIRouter, HTTPException, Request, status
 
-from screenscout.auth.models import User
+from screenscout.auth.models import Principal
 from screenscout.auth.permissions import OwnerAdminManager
 from screenscout.database.core import SessionDep
+from screenscout.etags import conditional_response
+from screenscout.reference import reference_data
 
 from .models import GenreCreate, GenreRead, GenreUpdate
-from .service import create, delete, get, get_all, get_by_name, update
+from .service import create, delete, get, get_by_name, update
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[GenreRead])
-@cache(expire=3600)
 async def get_genres(
-    db_session: SessionDep, current_user: User = OwnerAdminManager
+    request: Request, current_user: Principal = OwnerAdminManager
 ) -> Any:
     """Return all genres in the database."""
-    return await get_all(db_session=db_session)
+    genres = await reference_data.get("genres")
+
+    return conditional_response(request, genres.body.content, genres.body.etag)
 
 
 @router.get("/{genre_id}", response_model=GenreRead)
-@cache(expire=3600)
 async def get_genre(
-    db_session: SessionDep, genre_id: int, current_user: User = OwnerAdminManager
+    request: Request, genre_id: int, current_user: Principal = OwnerAdminManager
 ) -> Any:
     """Retrieve information about a genre by its ID."""
-    genre = await get(db_session=db_session, genre_id=genre_id)
-    if not genre:
+    genres = await reference_data.get("genres")
+    body = genres.bodies.get(genre_id)
+    if body is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Genre with id `{genre_id}` does not exist.",
         )
 
-    return genre
+    return conditional_response(request, body.content, body.etag)
 
 
 @router.post("/", response_model=GenreRead, status_code=status.HTTP_201_CREATED)
 async def create_genre(
     db_session: SessionDep,
     genre_in: GenreCreate,
-    current_user: User = OwnerAdminManager,
+    current_user: Principal = OwnerAdminManager,
 ) -> Any:
     """Create a new genre."""
     genre = await get_by_name(db_session=db_session, name=genre_in.name)
@@ -62,7 +64,7 @@ async def update_genre(
     db_session: SessionDep,
     genre_id: int,
     genre_in: GenreUpdate,
-    current_user: User = OwnerAdminManager,
+    current_user: Principal = OwnerAdminManager,
 ) -> Any:
     """Update a genre."""
     genre = await get(db_session=db_session, genre_id=genre_id)
@@ -78,7 +80,7 @@ async def update_genre(
 
 @router.delete("/{genre_id}", response_model=None)
 async def delete_genre(
-    db_session: SessionDep, genre_id: int, current_user: User = OwnerAdminManager
+    db_session: SessionDep, genre_id: int, current_user: Principal = OwnerAdminManager
 ) -> None:
     """Delete a genre."""
     genre = await get(db_session=db_session, genre_id=genre_id)
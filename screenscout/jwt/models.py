@@ -1,10 +1,26 @@
+from screenscout.auth.enums import UserRole
 from screenscout.models import ScreenScoutBase
 
 
 class TokenData(ScreenScoutBase):
     id: int | None = None
+    role: UserRole | None = None
+    # Tokens issued before versions existed carry none.
+    token_version: int = 0
+    # The id and expiry of the token, to revoke it by.
+    jti: str | None = None
+    exp: int | None = None
 
 
 class TokenResponse(ScreenScoutBase):
     access_token: str
+    refresh_token: str | None = None
     token_type: str
+
+
+class RefreshRequest(ScreenScoutBase):
+    refresh_token: str
+
+
+class SignoutRequest(ScreenScoutBase):
+    refresh_token: str | None = None
@@ -1,6 +1,9 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
+from screenscout.cache.service import invalidate
+from screenscout.reference import notify_changed
+
 from .models import Language, LanguageCreate, LanguageUpdate
 
 
@@ -32,8 +35,10 @@ async def create(*, db_session: AsyncSession, language_in: LanguageCreate) -> La
     language = Language(**language_in.model_dump())
 
     db_session.add(language)
+    await notify_changed(db_session=db_session, table="languages")
     await db_session.commit()
     await db_session.refresh(language)
+    await invalidate("languages")
 
     return language
 
@@ -48,8 +53,10 @@ async def update(
         if field in update_data:
             setattr(language, field, update_data[field])
 
+    await notify_changed(db_session=db_session, table="languages")
     await db_session.commit()
     await db_session.refresh(language)
+    await invalidate("languages", language.id)
 
     return language
 
@@ -61,4 +68,6 @@ async def delete(*, db_session: AsyncSession, language_id: int) -> None:
     )
     language = result.scalars().first()
     await db_session.delete(language)
+    await notify_changed(db_session=db_session, table="languages")
     await db_session.commit()
+    await invalidate("languages", language_id)
@@ -1,48 +1,50 @@
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, status
-from fastapi_cache.decorator import cache
+from fastapi import APIRouter, HTTPException, Request, status
 
-from screenscout.auth.models import User
+from screenscout.auth.models import Principal
 from screenscout.auth.permissions import OwnerAdminManager
 from screenscout.database.core import SessionDep
+from screenscout.etags import conditional_response
+from screenscout.reference import reference_data
 
 from .models import LanguageCreate, LanguageRead, LanguageUpdate
-from .service import create, delete, get, get_all, get_by_name, update
+from .service import create, delete, get, get_by_name, update
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[LanguageRead])
-@cache(expire=3600)
 async def get_languages(
-    db_session: SessionDep, current_user: User = OwnerAdminManager
+    request: Request, current_user: Principal = OwnerAdminManager
 ) -> Any:
     """Return all languages in the database."""
-    return await get_all(db_session=db_session)
+    languages = await reference_data.get("languages")
+
+    return conditional_response(request, languages.body.content, languages.body.etag)
 
 
 @router.get("/{language_id}", response_model=LanguageRead)
-@cache(expire=3600)
 async def get_language(
-    db_session: SessionDep, language_id: int, current_user: User = OwnerAdminManager
+    request: Request, language_id: int, current_user: Principal = OwnerAdminManager
 ) -> Any:
     """Retrieve information about a language by its ID."""
-    language = await get(db_session=db_session, language_id=language_id)
-    if not language:
+    languages = await reference_data.get("languages")
+    body = languages.bodies.get(language_id)
+    if body is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Language with id `{language_id}` does not exist.",
         )
 
-    return language
+    return conditional_response(request, body.content, body.etag)
 
 
 @router.post("/", response_model=LanguageRead, status_code=status.HTTP_201_CREATED)
 async def create_language(
     db_session: SessionDep,
     language_in: LanguageCreate,
-    current_user: User = OwnerAdminManager,
+    current_user: Principal = OwnerAdminManager,
 ) -> Any:
     """Create a new language."""
     language = await get_by_name(db_session=db_session, name=language_in.name)
@@ -62,7 +64,7 @@ async def update_language(
     db_session: SessionDep,
     language_id: int,
     language_in: LanguageUpdate,
-    current_user: User = OwnerAdminManager,
+    current_user: Principal = OwnerAdminManager,
 ) -> Any:
     """Update a language."""
     language = await get(db_session=db_session, language_id=language_id)
@@ -80,7 +82,9 @@ async def update_language(
 
 @router.delete("/{language_id}", response_model=None)
 async def delete_language(
-    db_session: SessionDep, language_id: int, current_user: User = OwnerAdminManager
+    db_session: SessionDep,
+    language_id: int,
+    current_user: Principal = OwnerAdminManager,
 ) -> None:
     """Delete a language."""
     language = await get(db_session=db_session, language_id=language_id)
@@ -1,14 +1,23 @@
+import asyncio
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi_cache import FastAPICache
-from fastapi_cache.backends.redis import RedisBackend
 from redis import asyncio as aioredis
 from starlette.middleware.cors import CORSMiddleware
 
+from screenscout.auth.revocation import revoked_tokens, token_versions
 from screenscout.auth.service import first_owner_create
+from screenscout.cache.backends import TwoTierBackend
+from screenscout.cache.breaker import CircuitBreaker
+from screenscout.cache.coder import compressed_coder
+from screenscout.cache.keys import request_key_builder
+from screenscout.cache.warmer import access_log, warm_app_once
 from screenscout.database.core import get_db
+from screenscout.reference import reference_data
+from screenscout.security import password_hasher
 
 from .api import api_router
 from .config import settings
@@ -19,11 +28,63 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     # Startup
     async for db_session in get_db():
         await first_owner_create(db_session)
+    await reference_data.start()
 
-    redis = aioredis.from_url("redis://localhost")
-    FastAPICache.init(RedisBackend(redis), prefix="fastapi-cache")
+    # Pool exhaustion fails fast instead of queueing, like any Redis error.
+    redis = aioredis.from_url(
+        settings.REDIS_URL,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+    )
+    breaker = CircuitBreaker(
+        window=settings.CACHE_BREAKER_WINDOW,
+        min_calls=settings.CACHE_BREAKER_MIN_CALLS,
+        failure_rate=settings.CACHE_BREAKER_FAILURE_RATE,
+        slow_call=settings.CACHE_BREAKER_SLOW_CALL,
+        reset_timeout=settings.CACHE_BREAKER_RESET,
+    )
+    backend = TwoTierBackend(
+        redis,
+        maxsize=settings.CACHE_LOCAL_MAXSIZE,
+        ttl=settings.CACHE_LOCAL_TTL,
+        breaker=breaker,
+    )
+    await backend.start()
+    await token_versions.start(redis)
+    await revoked_tokens.start(redis)
+    FastAPICache.init(
+        backend,
+        prefix="fastapi-cache",
+        coder=compressed_coder(
+            settings.CACHE_COMPRESSION,
+            min_size=settings.CACHE_COMPRESSION_MIN_SIZE,
+        ),
+        key_builder=request_key_builder,
+    )
+    await access_log.start()
+    warming = None
+    if settings.CACHE_WARM_ON_STARTUP:
+        warming = asyncio.create_task(
+            warm_app_once(
+                app,
+                top=settings.CACHE_WARM_TOP,
+                concurrency=settings.CACHE_WARM_CONCURRENCY,
+                lock_ttl=settings.CACHE_WARM_LOCK_TTL,
+            )
+        )
     yield
     # Shutdown
+    if warming is not None:
+        warming.cancel()
+    await access_log.stop()
+    await backend.stop()
+    await token_versions.stop()
+    await revoked_tokens.stop()
+    await redis.close(close_connection_pool=True)
+    await reference_data.stop()
+    password_hasher.shutdown()
 
 
 # Initialize a FastAPI application with custom settings
@@ -33,6 +94,7 @@ app = FastAPI(
     docs_url=settings.DOCS_URL,
     openapi_url=settings.OPENAPI_URL,
     redoc_url=settings.REDOC_URL,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
@@ -1,8 +1,20 @@
-from datetime import date
+from datetime import date, datetime
 from typing import TYPE_CHECKING
 
 from pydantic import Field
-from sqlalchemy import DECIMAL, Column, ForeignKey, Table, Text
+from sqlalchemy import (
+    DECIMAL,
+    TIMESTAMP,
+    Column,
+    Computed,
+    ForeignKey,
+    Index,
+    Integer,
+    Table,
+    Text,
+    func,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from screenscout.country.models import Country, CountryRead
@@ -10,6 +22,7 @@ from screenscout.database.core import Base
 from screenscout.genre.models import Genre, GenreRead
 from screenscout.language.models import Language, LanguageRead
 from screenscout.models import ScreenScoutBase
+from screenscout.search import SEARCH_VECTOR
 
 if TYPE_CHECKING:
     from screenscout.watchlist.models import UserWatchlistMovieAssociation
@@ -18,27 +31,42 @@ if TYPE_CHECKING:
 movie_genre_association = Table(
     "movie_genre",
     Base.metadata,
-    Column("movie_id", ForeignKey("movies.id")),
-    Column("genre_id", ForeignKey("genres.id")),
+    Column("movie_id", ForeignKey("movies.id"), primary_key=True),
+    Column("genre_id", ForeignKey("genres.id"), primary_key=True),
+    Index("ix_movie_genre_genre_id_movie_id", "genre_id", "movie_id"),
 )
 
 movie_country_association = Table(
     "movie_country",
     Base.metadata,
-    Column("movie_id", ForeignKey("movies.id")),
-    Column("country_id", ForeignKey("countries.id")),
+    Column("movie_id", ForeignKey("movies.id"), primary_key=True),
+    Column("country_id", ForeignKey("countries.id"), primary_key=True),
+    Index("ix_movie_country_country_id_movie_id", "country_id", "movie_id"),
 )
 
 movie_language_association = Table(
     "movie_language",
     Base.metadata,
-    Column("movie_id", ForeignKey("movies.id")),
-    Column("language_id", ForeignKey("languages.id")),
+    Column("movie_id", ForeignKey("movies.id"), primary_key=True),
+    Column("language_id", ForeignKey("languages.id"), primary_key=True),
+    Index("ix_movie_language_language_id_movie_id", "language_id", "movie_id"),
 )
 
 
 class Movie(Base):
     __tablename__ = "movies"
+    __table_args__ = (
+        Index("ix_movies_title_id", "title", "id"),
+        Index("ix_movies_production_year_id", "production_year", "id"),
+        Index("ix_movies_IMDb_rating_id", "IMDb_rating", "id"),
+        Index("ix_movies_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_movies_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(unique=False, nullable=False)
@@ -48,7 +76,7 @@ class Movie(Base):
         secondary=movie_language_association
     )
     genres: Mapped[list["Genre"]] = relationship(secondary=movie_genre_association)
-    director_id: Mapped[int] = mapped_column(ForeignKey("persons.id"))
+    director_id: Mapped[int] = mapped_column(ForeignKey("persons.id"), index=True)
     budget: Mapped[int] = mapped_column(unique=False, nullable=True)
     box_office: Mapped[int] = mapped_column(unique=False, nullable=True)
     IMDb_rating: Mapped[float] = mapped_column(
@@ -59,12 +87,46 @@ class Movie(Base):
     duration: Mapped[int] = mapped_column(unique=False, nullable=False)
     poster_url: Mapped[str] = mapped_column(unique=False, nullable=True)
     trailer_url: Mapped[str] = mapped_column(unique=False, nullable=True)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR, Computed(SEARCH_VECTOR, persisted=True), deferred=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
 
     users: Mapped[list["UserWatchlistMovieAssociation"]] = relationship(
         back_populates="movie"
     )
 
 
+class MovieCatalog(Base):
+    """Filter columns of a movie, denormalized and kept in sync by triggers."""
+
+    __tablename__ = "movie_catalog"
+    __table_args__ = (
+        Index("ix_movie_catalog_genre_ids", "genre_ids", postgresql_using="gin"),
+        Index("ix_movie_catalog_country_ids", "country_ids", postgresql_using="gin"),
+        Index("ix_movie_catalog_language_ids", "language_ids", postgresql_using="gin"),
+    )
+
+    movie_id: Mapped[int] = mapped_column(
+        ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True
+    )
+    year: Mapped[int] = mapped_column(index=True, nullable=False)
+    genre_ids: Mapped[list[int]] = mapped_column(
+        ARRAY(Integer), nullable=False, server_default="{}"
+    )
+    country_ids: Mapped[list[int]] = mapped_column(
+        ARRAY(Integer), nullable=False, server_default="{}"
+    )
+    language_ids: Mapped[list[int]] = mapped_column(
+        ARRAY(Integer), nullable=False, server_default="{}"
+    )
+
+
 class MovieBase(ScreenScoutBase):
     title: str
     production_year: date
@@ -107,3 +169,18 @@ class MovieRead(MovieBase):
     country: list[CountryRead]
     genres: list[GenreRead]
     language: list[LanguageRead]
+
+
+class MovieSparseRead(MovieRead):
+    """A movie with only the fields requested through `fields` and `include`."""
+
+    title: str | None = None  # type: ignore
+    production_year: date | None = None  # type: ignore
+    IMDb_rating: float | None = None  # type: ignore
+    description: str | None = None  # type: ignore
+    director_id: int | None = None  # type: ignore
+    age_category: str | None = None  # type: ignore
+    duration: int | None = None  # type: ignore
+    country: list[CountryRead] | None = None  # type: ignore
+    genres: list[GenreRead] | None = None  # type: ignore
+    language: list[LanguageRead] | None = None  # type: ignore
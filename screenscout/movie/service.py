@@ -1,16 +1,41 @@
 from datetime import date
+from typing import Any
 
-from sqlalchemy import and_
+from sqlalchemy import ColumnElement, Select, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from screenscout import reference
+from screenscout.cache.service import invalidate
+from screenscout.catalog import CatalogFacets, MatchMode, array_filter, count_facets
 from screenscout.country.models import Country
-from screenscout.exceptions import EntityDoesNotExist
+from screenscout.database.service import get_by_ids, set_links
+from screenscout.fieldsets import Fieldset, load_options
 from screenscout.genre.models import Genre
 from screenscout.language.models import Language
-from screenscout.movie.models import Movie, MovieCreate, MovieUpdate
-from screenscout.person.service import get as get_person
+from screenscout.movie.models import (
+    Movie,
+    MovieBase,
+    MovieCatalog,
+    MovieCreate,
+    MovieUpdate,
+    movie_country_association,
+    movie_genre_association,
+    movie_language_association,
+)
+from screenscout.pagination import (
+    CatalogSort,
+    Cursor,
+    SortOrder,
+    next_cursor,
+    order_by,
+    paginate,
+)
+from screenscout.person.models import Person
+from screenscout.search import search_filter, search_rank
+from screenscout.watchlist import cache as watchlist_cache
 
 
 async def get(*, db_session: AsyncSession, movie_id: int) -> Movie | None:
@@ -29,96 +54,271 @@ async def get(*, db_session: AsyncSession, movie_id: int) -> Movie | None:
     return result.scalars().first()
 
 
-async def get_all(
+# Attributes that can be requested with sparse fieldsets.
+COLUMNS = tuple(MovieBase.model_fields)
+RELATIONS = ("country", "genres", "language")
+
+SORT_COLUMNS = {
+    CatalogSort.ID: Movie.id,
+    CatalogSort.TITLE: Movie.title,
+    CatalogSort.PRODUCTION_YEAR: Movie.production_year,
+    CatalogSort.RATING: Movie.IMDb_rating,
+}
+
+
+def _filters(
     *,
-    db_session: AsyncSession,
+    search: str | None = None,
     title: str | None = None,
     production_year: date | None = None,
     country_id: int | None = None,
     genre_id: int | None = None,
     min_rating: float | None = None,
     max_rating: float | None = None,
-    limit: int = 20,
-    offset: int = 0,
-) -> list[Movie]:
-    """Return a paginated list of movies with optional filters."""
-
-    query = select(Movie).options(
-        selectinload(Movie.country),
-        selectinload(Movie.genres),
-        selectinload(Movie.language),
-    )
-
+    genre_ids: list[int] | None = None,
+    genre_match: MatchMode = MatchMode.ANY,
+    country_ids: list[int] | None = None,
+    language_ids: list[int] | None = None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+) -> list[ColumnElement[bool]]:
+    """Builds the WHERE clauses shared by the catalog queries."""
     filters = []
 
+    if search:
+        filters.append(
+            search_filter(
+                search_vector=Movie.search_vector, title=Movie.title, term=search
+            )
+        )
+
     if title:
         filters.append(Movie.title.ilike(f"%{title}%"))
 
     if production_year:
-        filters.append(Movie.production_year == production_year)  # type: ignore
+        filters.append(Movie.production_year == production_year)
 
-    if country_id:
-        filters.append(Movie.country.any(Country.id == country_id))  # type: ignore
+    if min_rating is not None:
+        filters.append(Movie.IMDb_rating >= min_rating)
+
+    if max_rating is not None:
+        filters.append(Movie.IMDb_rating <= max_rating)
+
+    # Genre, country, language and year filters are answered by the read model.
+    catalog_filters = []
 
     if genre_id:
-        filters.append(Movie.genres.any(Genre.id == genre_id))  # type: ignore
+        catalog_filters.append(MovieCatalog.genre_ids.contains([genre_id]))
 
-    if min_rating is not None:
-        filters.append(Movie.IMDb_rating >= min_rating)  # type: ignore
+    if genre_ids:
+        catalog_filters.append(
+            array_filter(MovieCatalog.genre_ids, genre_ids, match=genre_match)
+        )
 
-    if max_rating is not None:
-        filters.append(Movie.IMDb_rating <= max_rating)  # type: ignore
+    if country_id:
+        catalog_filters.append(MovieCatalog.country_ids.contains([country_id]))
+
+    if country_ids:
+        catalog_filters.append(MovieCatalog.country_ids.overlap(country_ids))
+
+    if language_ids:
+        catalog_filters.append(MovieCatalog.language_ids.overlap(language_ids))
+
+    if year_from is not None:
+        catalog_filters.append(MovieCatalog.year >= year_from)
+
+    if year_to is not None:
+        catalog_filters.append(MovieCatalog.year <= year_to)
 
+    if catalog_filters:
+        filters.append(
+            Movie.id.in_(select(MovieCatalog.movie_id).where(*catalog_filters))
+        )
+
+    return filters
+
+
+def _catalog_query(**filter_args: Any) -> Select[tuple[Movie]]:
+    query = select(Movie)
+
+    filters = _filters(**filter_args)
     if filters:
         query = query.where(and_(*filters))
 
+    return query
+
+
+async def get_all(
+    *,
+    db_session: AsyncSession,
+    search: str | None = None,
+    title: str | None = None,
+    production_year: date | None = None,
+    country_id: int | None = None,
+    genre_id: int | None = None,
+    min_rating: float | None = None,
+    max_rating: float | None = None,
+    genre_ids: list[int] | None = None,
+    genre_match: MatchMode = MatchMode.ANY,
+    country_ids: list[int] | None = None,
+    language_ids: list[int] | None = None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    sort: CatalogSort = CatalogSort.ID,
+    order: SortOrder = SortOrder.ASC,
+    limit: int = 20,
+    offset: int = 0,
+    fieldset: Fieldset | None = None,
+) -> list[Movie]:
+    """Return a paginated list of movies with optional filters.
+
+    When `search` is given, results are ordered by relevance instead of `sort`.
+    """
+    query = _catalog_query(
+        search=search,
+        title=title,
+        production_year=production_year,
+        country_id=country_id,
+        genre_id=genre_id,
+        min_rating=min_rating,
+        max_rating=max_rating,
+        genre_ids=genre_ids,
+        genre_match=genre_match,
+        country_ids=country_ids,
+        language_ids=language_ids,
+        year_from=year_from,
+        year_to=year_to,
+    )
+
+    if search:
+        rank = search_rank(
+            search_vector=Movie.search_vector, title=Movie.title, term=search
+        )
+        query = query.order_by(rank.desc(), Movie.id)
+    else:
+        query = order_by(
+            query, sort_column=SORT_COLUMNS[sort], id_column=Movie.id, order=order
+        )
     query = query.limit(limit).offset(offset)
+    query = query.options(*load_options(Movie, fieldset=fieldset, relations=RELATIONS))
 
     result = await db_session.execute(query)
 
     return result.scalars().all()  # type: ignore
 
 
+async def get_page(
+    *,
+    db_session: AsyncSession,
+    search: str | None = None,
+    title: str | None = None,
+    production_year: date | None = None,
+    country_id: int | None = None,
+    genre_id: int | None = None,
+    min_rating: float | None = None,
+    max_rating: float | None = None,
+    genre_ids: list[int] | None = None,
+    genre_match: MatchMode = MatchMode.ANY,
+    country_ids: list[int] | None = None,
+    language_ids: list[int] | None = None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    sort: CatalogSort = CatalogSort.ID,
+    order: SortOrder = SortOrder.ASC,
+    after: Cursor | None = None,
+    limit: int = 20,
+    fieldset: Fieldset | None = None,
+) -> tuple[list[Movie], str | None]:
+    """Return the page of movies following `after` and the cursor for the next one.
+
+    Unlike `get_all`, the cost of a page does not depend on how deep it is.
+    A `search` term only filters here, since relevance is not a stable key.
+    """
+    query = _catalog_query(
+        search=search,
+        title=title,
+        production_year=production_year,
+        country_id=country_id,
+        genre_id=genre_id,
+        min_rating=min_rating,
+        max_rating=max_rating,
+        genre_ids=genre_ids,
+        genre_match=genre_match,
+        country_ids=country_ids,
+        language_ids=language_ids,
+        year_from=year_from,
+        year_to=year_to,
+    )
+
+    sort_column = SORT_COLUMNS[sort]
+    query = paginate(
+        query,
+        sort_column=sort_column,
+        id_column=Movie.id,
+        order=order,
+        after=after,
+        limit=limit,
+    )
+    query = query.options(
+        *load_options(
+            Movie, fieldset=fieldset, relations=RELATIONS, required=[sort_column]
+        )
+    )
+
+    result = await db_session.execute(query)
+    movies = list(result.scalars().all())
+
+    cursor = next_cursor(
+        movies, sort=sort, order=order, sort_column=sort_column, limit=limit
+    )
+
+    return movies, cursor
+
+
+async def get_facets(*, db_session: AsyncSession, **filter_args: Any) -> CatalogFacets:
+    """Returns facet counts over the movies matching the given filters."""
+    query = select(
+        MovieCatalog.genre_ids,
+        MovieCatalog.country_ids,
+        MovieCatalog.language_ids,
+        MovieCatalog.year,
+        Movie.IMDb_rating.label("rating"),
+    ).join(Movie, Movie.id == MovieCatalog.movie_id)
+
+    filters = _filters(**filter_args)
+    if filters:
+        query = query.where(and_(*filters))
+
+    return await count_facets(db_session=db_session, matched=query)
+
+
 async def create(*, db_session: AsyncSession, movie_in: MovieCreate) -> Movie:
     """Creates a new movie."""
     movie_data = movie_in.model_dump()
-    director = await get_person(db_session=db_session, person_id=movie_in.director_id)
-    if not director:
-        raise EntityDoesNotExist(
-            f"Person with id `{movie_in.director_id}` does not exist!"
-        )
-    country = movie_data.pop("country")
-    genres = movie_data.pop("genres")
-    languages = movie_data.pop("language")
+    await get_by_ids(db_session=db_session, model=Person, ids=[movie_in.director_id])
+    countries = await reference.get_by_ids(
+        db_session=db_session, model=Country, ids=movie_data.pop("country") or []
+    )
+    genres = await reference.get_by_ids(
+        db_session=db_session, model=Genre, ids=movie_data.pop("genres") or []
+    )
+    languages = await reference.get_by_ids(
+        db_session=db_session, model=Language, ids=movie_data.pop("language") or []
+    )
     movie = Movie(**movie_data)
 
     db_session.add(movie)
+    await db_session.flush()
+
+    await _set_relations(
+        db_session=db_session,
+        movie=movie,
+        countries=countries,
+        genres=genres,
+        languages=languages,
+    )
     await db_session.commit()
-    await db_session.refresh(movie, ["country", "genres", "language"])
-
-    for country_id in country:
-        result = await db_session.execute(
-            select(Country).where(Country.id == country_id)
-        )
-        country = result.scalars().first()
-        if country is not None:
-            movie.country.append(country)
-
-    for genre_id in genres:
-        result = await db_session.execute(select(Genre).where(Genre.id == genre_id))
-        genre = result.scalars().first()
-        if genre is not None:
-            movie.genres.append(genre)  # type: ignore
-
-    for language_id in languages:
-        result = await db_session.execute(
-            select(Language).where(Language.id == language_id)
-        )
-        language = result.scalars().first()
-        if language is not None:
-            movie.language.append(language)  # type: ignore
-
-    await db_session.commit()
+    await invalidate("movies")
 
     return movie
 
@@ -130,44 +330,78 @@ async def update(
     movie_data = movie.dict()
     update_data = movie_in.model_dump(exclude_unset=True)
 
-    for field in movie_data:
-        if field in update_data:
-            setattr(movie, field, update_data[field])
+    if movie_in.director_id is not None:
+        await get_by_ids(
+            db_session=db_session, model=Person, ids=[movie_in.director_id]
+        )
 
+    countries = genres = languages = None
     if movie_in.country is not None:
-        movie.country.clear()
-        for country_id in movie_in.country:
-            result = await db_session.execute(
-                select(Country).where(Country.id == country_id)
-            )
-            country = result.scalars().first()
-            if country:
-                movie.country.append(country)
-
+        countries = await reference.get_by_ids(
+            db_session=db_session, model=Country, ids=movie_in.country
+        )
     if movie_in.genres is not None:
-        movie.genres.clear()
-        for genre_id in movie_in.genres:
-            result = await db_session.execute(select(Genre).where(Genre.id == genre_id))
-            genre = result.scalars().first()
-            if genre:
-                movie.genres.append(genre)  # type: ignore
-
+        genres = await reference.get_by_ids(
+            db_session=db_session, model=Genre, ids=movie_in.genres
+        )
     if movie_in.language is not None:
-        movie.language.clear()
-        for language_id in movie_in.language:
-            result = await db_session.execute(
-                select(Language).where(Language.id == language_id)
-            )
-            language = result.scalars().first()
-            if language:
-                movie.language.append(language)  # type: ignore
+        languages = await reference.get_by_ids(
+            db_session=db_session, model=Language, ids=movie_in.language
+        )
 
+    for field in movie_data:
+        if field in update_data:
+            setattr(movie, field, update_data[field])
+    # Bumped even when only links change, as it versions the whole response.
+    movie.updated_at = func.now()
+
+    await db_session.flush()
+
+    await _set_relations(
+        db_session=db_session,
+        movie=movie,
+        countries=countries,
+        genres=genres,
+        languages=languages,
+        replace=True,
+    )
     await db_session.commit()
-    await db_session.refresh(movie)
+    await invalidate("movies", movie.id)
+    await watchlist_cache.forget_title(type_="movie", item_id=movie.id)
 
     return movie
 
 
+async def _set_relations(
+    *,
+    db_session: AsyncSession,
+    movie: Movie,
+    countries: list[Country] | None,
+    genres: list[Genre] | None,
+    languages: list[Language] | None,
+    replace: bool = False,
+) -> None:
+    """Writes the given relations of a movie, leaving `None` ones untouched."""
+    for attribute, table, column, targets in (
+        ("country", movie_country_association, "country_id", countries),
+        ("genres", movie_genre_association, "genre_id", genres),
+        ("language", movie_language_association, "language_id", languages),
+    ):
+        if targets is None:
+            continue
+
+        await set_links(
+            db_session=db_session,
+            table=table,
+            owner_column="movie_id",
+            owner_id=movie.id,
+            target_column=column,
+            targets=targets,
+            replace=replace,
+        )
+        set_committed_value(movie, attribute, targets)
+
+
 async def delete(*, db_session: AsyncSession, movie_id: int) -> None:
     """Deletes an existing movie."""
     result = await db_session.execute(select(Movie).where(Movie.id == movie_id))
@@ -175,3 +409,5 @@ async def delete(*, db_session: AsyncSession, movie_id: int) -> None:
 
     await db_session.delete(movie)
     await db_session.commit()
+    await invalidate("movies", movie_id)
+    await watchlist_cache.forget_title(type_="movie", item_id=movie_id)
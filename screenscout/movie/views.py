@@ -1,50 +1,159 @@
-from datetime import date
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, Query, status
-from fastapi_cache.decorator import cache
 
-from screenscout.auth.models import User
+from screenscout.auth.models import Principal
 from screenscout.auth.permissions import OwnerAdminManager
+from screenscout.cache.decorator import cache
+from screenscout.cache.keys import item_key_builder, list_key_builder
+from screenscout.catalog import CatalogFacets, CatalogFilters
 from screenscout.database.core import SessionDep
-from screenscout.exceptions import EntityDoesNotExist
-
-from .models import MovieCreate, MovieRead, MovieUpdate
-from .service import create, delete, get, get_all, update
+from screenscout.etags import entity_etag
+from screenscout.exceptions import EntityDoesNotExist, InvalidCursor, InvalidFieldset
+from screenscout.fieldsets import parse_fieldset
+from screenscout.pagination import (
+    CatalogSort,
+    CursorPage,
+    PaginationMode,
+    SortOrder,
+    decode_cursor,
+)
+from screenscout.responses import json_response
+
+from .models import Movie, MovieCreate, MovieRead, MovieSparseRead, MovieUpdate
+from .service import (
+    COLUMNS,
+    RELATIONS,
+    create,
+    delete,
+    get,
+    get_all,
+    get_facets,
+    get_page,
+    update,
+)
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[MovieRead])
-@cache(expire=300)
+@router.get(
+    "/",
+    response_model=list[MovieRead]
+    | list[MovieSparseRead]
+    | CursorPage[MovieRead]
+    | CursorPage[MovieSparseRead],
+)
+@cache(
+    expire=21600,
+    namespace="movies",
+    key_builder=list_key_builder,
+    stale_while_revalidate=86400,
+)
 async def get_movies(
     db_session: SessionDep,
-    title: str | None = None,
-    production_year: date | None = None,
-    country_id: int | None = None,
-    genre_id: int | None = None,
-    min_rating: float | None = None,
-    max_rating: float | None = None,
+    filters: CatalogFilters,
+    sort: CatalogSort = CatalogSort.ID,
+    order: SortOrder = SortOrder.ASC,
+    paginate: PaginationMode = PaginationMode.OFFSET,
+    after: str | None = None,
     limit: int = Query(20, gt=0),
     offset: int = Query(0, ge=0),
+    fields: str | None = None,
+    include: str | None = None,
 ) -> Any:
-    """Return all movies in the database with optional filters."""
+    """
+    Return all movies in the database with optional filters.
+
+    `search` matches titles and descriptions, tolerates typos and orders the
+    results by relevance. With `paginate=cursor` the response is a page object
+    whose `next_cursor` is passed back as `after` to fetch the following page.
+
+    `genre_ids`, `country_ids` and `language_ids` can be repeated and match any
+    of the given values; with `genre_match=all` every genre must match.
+    `year_from` and `year_to` bound the production year, both inclusive.
+
+    `fields` and `include` take comma-separated column and relationship names
+    and restrict every item to them, e.g. `fields=title,poster_url&include=genres`.
+    """
+    try:
+        fieldset = parse_fieldset(fields, include, columns=COLUMNS, relations=RELATIONS)
+    except InvalidFieldset as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    if paginate == PaginationMode.CURSOR:
+        try:
+            cursor = decode_cursor(after, sort=sort, order=order) if after else None
+        except InvalidCursor as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+            )
+
+        movies, next_cursor = await get_page(
+            db_session=db_session,
+            **filters,
+            sort=sort,
+            order=order,
+            after=cursor,
+            limit=limit,
+            fieldset=fieldset,
+        )
+        if fieldset:
+            return json_response(
+                CursorPage[MovieSparseRead],
+                {
+                    "items": [fieldset.select(item) for item in movies],
+                    "next_cursor": next_cursor,
+                },
+                exclude_unset=True,
+            )
+        return json_response(
+            CursorPage[MovieRead],
+            {"items": movies, "next_cursor": next_cursor},
+        )
+
     movies = await get_all(
         db_session=db_session,
-        title=title,
-        production_year=production_year,
-        country_id=country_id,
-        genre_id=genre_id,
-        min_rating=min_rating,
-        max_rating=max_rating,
+        **filters,
+        sort=sort,
+        order=order,
         limit=limit,
         offset=offset,
+        fieldset=fieldset,
     )
-    return movies
+    if fieldset:
+        return json_response(
+            list[MovieSparseRead],
+            [fieldset.select(item) for item in movies],
+            exclude_unset=True,
+        )
+    return json_response(list[MovieRead], movies)
+
+
+@router.get("/facets", response_model=CatalogFacets)
+@cache(
+    expire=21600,
+    namespace="movies",
+    key_builder=list_key_builder,
+    stale_while_revalidate=86400,
+)
+async def get_movie_facets(db_session: SessionDep, filters: CatalogFilters) -> Any:
+    """
+    Return how many movies match the given filters per genre, country,
+    language, production year and whole rating point, in one round trip.
+    """
+    facets = await get_facets(db_session=db_session, **filters)
+
+    return json_response(CatalogFacets, facets)
 
 
 @router.get("/{movie_id}", response_model=MovieRead)
-@cache(expire=300)
+@cache(
+    expire=21600,
+    namespace="movies",
+    key_builder=item_key_builder("movie_id"),
+    stale_while_revalidate=86400,
+    etag=entity_etag(Movie, namespace="movies", parameter="movie_id"),
+)
 async def get_movie(db_session: SessionDep, movie_id: int) -> Any:
     """Retrieve information about a movie by its ID."""
     movie = await get(db_session=db_session, movie_id=movie_id)
@@ -54,22 +163,22 @@ async def get_movie(db_session: SessionDep, movie_id: int) -> Any:
             detail=f"Movie with id `{movie_id}` does not exist.",
         )
 
-    return movie
+    return json_response(MovieRead, movie)
 
 
 @router.post("/", response_model=MovieRead, status_code=status.HTTP_201_CREATED)
 async def create_movie(
     db_session: SessionDep,
     movie_in: MovieCreate,
-    current_user: User = OwnerAdminManager,
+    current_user: Principal = OwnerAdminManager,
 ) -> Any:
     """Create a new movie."""
     try:
         movie = await create(db_session=db_session, movie_in=movie_in)
-    except EntityDoesNotExist:
+    except EntityDoesNotExist as exc:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Person with id `{movie_in.director_id}` does not exist!",
+            detail=str(exc),
         )
 
     return movie
@@ -80,7 +189,7 @@ async def update_movie(
     db_session: SessionDep,
     movie_id: int,
     movie_in: MovieUpdate,
-    current_user: User = OwnerAdminManager,
+    current_user: Principal = OwnerAdminManager,
 ) -> Any:
     """Update a movie."""
     movie = await get(db_session=db_session, movie_id=movie_id)
@@ -90,14 +199,20 @@ async def update_movie(
             detail=f"Movie with id `{movie_id}` does not exist.",
         )
 
-    movie = await update(db_session=db_session, movie=movie, movie_in=movie_in)
+    try:
+        movie = await update(db_session=db_session, movie=movie, movie_in=movie_in)
+    except EntityDoesNotExist as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        )
 
     return movie
 
 
 @router.delete("/{movie_id}", response_model=None)
 async def delete_movie(
-    db_session: SessionDep, movie_id: int, current_user: User = OwnerAdminManager
+    db_session: SessionDep, movie_id: int, current_user: Principal = OwnerAdminManager
 ) -> None:
     """Delete a movie."""
     movie = await get(db_session=db_session, movie_id=movie_id)
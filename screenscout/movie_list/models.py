@@ -1,5 +1,7 @@
+from datetime import datetime
+
 from pydantic import Field
-from sqlalchemy import Column, ForeignKey, Table, Text
+from sqlalchemy import TIMESTAMP, Column, ForeignKey, Index, Table, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from screenscout.database.core import Base
@@ -9,8 +11,9 @@ from screenscout.movie.models import Movie
 movie_list_movie_association = Table(
     "movie_list_movie",
     Base.metadata,
-    Column("movie_list_id", ForeignKey("movie_lists.id")),
-    Column("movie_id", ForeignKey("movies.id")),
+    Column("movie_list_id", ForeignKey("movie_lists.id"), primary_key=True),
+    Column("movie_id", ForeignKey("movies.id"), primary_key=True),
+    Index("ix_movie_list_movie_movie_id_movie_list_id", "movie_id", "movie_list_id"),
 )
 
 
@@ -20,6 +23,12 @@ class MovieList(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
 
     movies: Mapped[list["Movie"]] = relationship(secondary=movie_list_movie_association)
 
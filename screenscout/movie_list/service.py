@@ -1,10 +1,19 @@
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from screenscout.cache.service import invalidate
+from screenscout.database.service import get_by_ids, set_links
 from screenscout.movie.models import Movie
 
-from .models import MovieList, MovieListCreate, MovieListUpdate
+from .models import (
+    MovieList,
+    MovieListCreate,
+    MovieListUpdate,
+    movie_list_movie_association,
+)
 
 
 async def get(*, db_session: AsyncSession, movie_list_id: int) -> MovieList | None:
@@ -32,20 +41,25 @@ async def create(
 ) -> MovieList:
     """Creates a new movie list."""
     movie_list_data = movie_list_in.model_dump()
-    movies = movie_list_data.pop("movies")
+    movies = await get_by_ids(
+        db_session=db_session, model=Movie, ids=movie_list_data.pop("movies") or []
+    )
     movie_list = MovieList(**movie_list_data)
 
     db_session.add(movie_list)
+    await db_session.flush()
+
+    await set_links(
+        db_session=db_session,
+        table=movie_list_movie_association,
+        owner_column="movie_list_id",
+        owner_id=movie_list.id,
+        target_column="movie_id",
+        targets=movies,
+    )
+    set_committed_value(movie_list, "movies", movies)
     await db_session.commit()
-    await db_session.refresh(movie_list, ["movies"])
-
-    for movie_id in movies:
-        result = await db_session.execute(select(Movie).where(Movie.id == movie_id))
-        movie = result.scalars().first()
-        if movie is not None:
-            movie_list.movies.append(movie)
-
-    await db_session.commit()
+    await invalidate("movie_lists")
 
     return movie_list
 
@@ -57,20 +71,33 @@ async def update(
     movie_list_data = movie_list.dict()
     update_data = movie_list_in.model_dump(exclude_unset=True)
 
+    movies = None
+    if movie_list_in.movies is not None:
+        movies = await get_by_ids(
+            db_session=db_session, model=Movie, ids=movie_list_in.movies
+        )
+
     for field in movie_list_data:
         if field in update_data:
             setattr(movie_list, field, update_data[field])
-
-    if movie_list_in.movies is not None:
-        movie_list.movies.clear()
-        for movie_id in movie_list_in.movies:
-            result = await db_session.execute(select(Movie).where(Movie.id == movie_id))
-            movie = result.scalars().first()
-            if movie:
-                movie_list.movies.append(movie)
-
+    # Bumped even when only links change, as it versions the whole response.
+    movie_list.updated_at = func.now()
+
+    await db_session.flush()
+
+    if movies is not None:
+        await set_links(
+            db_session=db_session,
+            table=movie_list_movie_association,
+            owner_column="movie_list_id",
+            owner_id=movie_list.id,
+            target_column="movie_id",
+            targets=movies,
+            replace=True,
+        )
+        set_committed_value(movie_list, "movies", movies)
     await db_session.commit()
-    await db_session.refresh(movie_list)
+    await invalidate("movie_lists", movie_list.id)
 
     return movie_list
 
@@ -84,3 +111,4 @@ async def delete(*, db_session: AsyncSession, movie_list_id: int) -> None:
 
     await db_session.delete(movie_list)
     await db_session.commit()
+    await invalidate("movie_lists", movie_list_id)
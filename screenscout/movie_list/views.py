@@ -1,29 +1,38 @@
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, status
-from fastapi_cache.decorator import cache
 
-from screenscout.auth.models import User
+from screenscout.auth.models import Principal
 from screenscout.auth.permissions import OwnerAdminManager
+from screenscout.cache.decorator import cache
+from screenscout.cache.keys import item_key_builder, list_key_builder
 from screenscout.database.core import SessionDep
+from screenscout.etags import entity_etag
+from screenscout.exceptions import EntityDoesNotExist
+from screenscout.responses import json_response
 
-from .models import MovieListCreate, MovieListRead, MovieListUpdate
+from .models import MovieList, MovieListCreate, MovieListRead, MovieListUpdate
 from .service import create, delete, get, get_all, update
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[MovieListRead])
-@cache(expire=300)
+@cache(expire=21600, namespace="movie_lists", key_builder=list_key_builder)
 async def get_movie_lists(db_session: SessionDep) -> Any:
     """Return all movie lists in the database."""
     movie_lists = await get_all(db_session=db_session)
 
-    return movie_lists
+    return json_response(list[MovieListRead], movie_lists)
 
 
 @router.get("/{movie_list_id}", response_model=MovieListRead)
-@cache(expire=300)
+@cache(
+    expire=21600,
+    namespace="movie_lists",
+    key_builder=item_key_builder("movie_list_id"),
+    etag=entity_etag(MovieList, namespace="movie_lists", parameter="movie_list_id"),
+)
 async def get_movie_list(db_session: SessionDep, movie_list_id: int) -> Any:
     """Retrieve information about a movie list by its ID."""
     movie_list = await get(db_session=db_session, movie_list_id=movie_list_id)
@@ -33,17 +42,23 @@ async def get_movie_list(db_session: SessionDep, movie_list_id: int) -> Any:
             detail=f"Movie list with id `{movie_list_id}` does not exist.",
         )
 
-    return movie_list
+    return json_response(MovieListRead, movie_list)
 
 
 @router.post("/", response_model=MovieListRead, status_code=status.HTTP_201_CREATED)
 async def create_movie_list(
     db_session: SessionDep,
     movie_list_in: MovieListCreate,
-    current_user: User = OwnerAdminManager,
+    current_user: Principal = OwnerAdminManager,
 ) -> Any:
     """Create a new movie list."""
-    movie_list = await create(db_session=db_session, movie_list_in=movie_list_in)
+    try:
+        movie_list = await create(db_session=db_session, movie_list_in=movie_list_in)
+    except EntityDoesNotExist as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        )
 
     return movie_list
 
@@ -53,7 +68,7 @@ async def update_movie_list(
     db_session: SessionDep,
     movie_list_id: int,
     movie_list_in: MovieListUpdate,
-    current_user: User = OwnerAdminManager,
+    current_user: Principal = OwnerAdminManager,
 ) -> Any:
     """Update a movie list."""
     movie_list = await get(db_session=db_session, movie_list_id=movie_list_id)
@@ -63,16 +78,24 @@ async def update_movie_list(
             detail=f"Movie list with id `{movie_list_id}` does not exist.",
         )
 
-    movie_list = await update(
-        db_session=db_session, movie_list=movie_list, movie_list_in=movie_list_in
-    )
+    try:
+        movie_list = await update(
+            db_session=db_session, movie_list=movie_list, movie_list_in=movie_list_in
+        )
+    except EntityDoesNotExist as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        )
 
     return movie_list
 
 
 @router.delete("/{movie_list_id}", response_model=None)
 async def delete_movie_list(
-    db_session: SessionDep, movie_list_id: int, current_user: User = OwnerAdminManager
+    db_session: SessionDep,
+    movie_list_id: int,
+    current_user: Principal = OwnerAdminManager,
 ) -> None:
     """Delete a movie list."""
     movie_list = await get(db_session=db_session, movie_list_id=movie_list_id)
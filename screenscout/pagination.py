@@ -0,0 +1,171 @@
+"""
+Module for keyset (cursor) pagination of catalog queries.
+
+Offset pagination makes Postgres walk and discard every row before the
+requested page, so deep pages get slower the further a client scrolls.
+Keyset pagination instead remembers the sort key and id of the last row
+returned and continues from there with a `(sort_key, id) > (:key, :id)`
+predicate, which an index on `(sort_key, id)` answers in constant time.
+
+The position is handed to clients as an opaque, URL-safe `after` token.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Generic, TypeVar
+
+from sqlalchemy import Select, literal, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+from screenscout.enums import ScreenScoutEnum
+from screenscout.exceptions import InvalidCursor
+from screenscout.models import ScreenScoutBase
+
+T = TypeVar("T")
+
+
+class PaginationMode(ScreenScoutEnum):
+    OFFSET = "offset"
+    CURSOR = "cursor"
+
+
+class CatalogSort(ScreenScoutEnum):
+    ID = "id"
+    TITLE = "title"
+    PRODUCTION_YEAR = "production_year"
+    RATING = "rating"
+
+
+class SortOrder(ScreenScoutEnum):
+    ASC = "asc"
+    DESC = "desc"
+
+
+class Cursor(ScreenScoutBase):
+    sort: CatalogSort
+    order: SortOrder
+    key: Any
+    id: int
+
+
+class CursorPage(ScreenScoutBase, Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+
+
+_KEY_PARSERS: dict[CatalogSort, Callable[[Any], Any]] = {
+    CatalogSort.ID: int,
+    CatalogSort.TITLE: str,
+    CatalogSort.PRODUCTION_YEAR: date.fromisoformat,
+    CatalogSort.RATING: Decimal,
+}
+
+
+def encode_cursor(*, sort: CatalogSort, order: SortOrder, key: Any, id: int) -> str:
+    """Encodes the position after a row into an opaque token."""
+    if isinstance(key, date):
+        key = key.isoformat()
+    elif isinstance(key, Decimal | float):
+        key = str(key)
+
+    payload = json.dumps([sort.value, order.value, key, id], separators=(",", ":"))
+
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, *, sort: CatalogSort, order: SortOrder) -> Cursor:
+    """Decodes an `after` token produced by `encode_cursor`.
+
+    The token must have been issued for the same sort column and direction,
+    otherwise continuing from it would skip or repeat rows.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw_sort, raw_order, raw_key, raw_id = json.loads(
+            base64.urlsafe_b64decode(padded.encode())
+        )
+        cursor = Cursor(
+            sort=CatalogSort(raw_sort),
+            order=SortOrder(raw_order),
+            key=_KEY_PARSERS[CatalogSort(raw_sort)](raw_key),
+            id=int(raw_id),
+        )
+    except (
+        binascii.Error,
+        InvalidOperation,
+        KeyError,
+        TypeError,
+        UnicodeDecodeError,
+        ValueError,
+    ):
+        raise InvalidCursor("Malformed pagination cursor")
+
+    if cursor.sort != sort or cursor.order != order:
+        raise InvalidCursor("Pagination cursor was issued for a different sort order")
+
+    return cursor
+
+
+def order_by(
+    query: Select,  # type: ignore[type-arg]
+    *,
+    sort_column: InstrumentedAttribute[Any],
+    id_column: InstrumentedAttribute[int],
+    order: SortOrder,
+) -> Select:  # type: ignore[type-arg]
+    """Applies a deterministic `(sort_column, id)` ordering to a query."""
+    if order == SortOrder.DESC:
+        return query.order_by(sort_column.desc(), id_column.desc())
+
+    return query.order_by(sort_column.asc(), id_column.asc())
+
+
+def paginate(
+    query: Select,  # type: ignore[type-arg]
+    *,
+    sort_column: InstrumentedAttribute[Any],
+    id_column: InstrumentedAttribute[int],
+    order: SortOrder,
+    after: Cursor | None,
+    limit: int,
+) -> Select:  # type: ignore[type-arg]
+    """Restricts a query to the page that follows `after`.
+
+    One extra row is fetched so the caller can tell whether a next page exists
+    without issuing a separate count query.
+    """
+    if after is not None:
+        position = tuple_(sort_column, id_column)
+        bound = tuple_(
+            literal(after.key, sort_column.type), literal(after.id, id_column.type)
+        )
+        query = query.where(
+            position < bound if order == SortOrder.DESC else position > bound
+        )
+
+    query = order_by(query, sort_column=sort_column, id_column=id_column, order=order)
+
+    return query.limit(limit + 1)
+
+
+def next_cursor(
+    rows: list[Any],
+    *,
+    sort: CatalogSort,
+    order: SortOrder,
+    sort_column: InstrumentedAttribute[Any],
+    limit: int,
+) -> str | None:
+    """Returns the token for the page after `rows`, trimming the lookahead row."""
+    if len(rows) <= limit:
+        return None
+
+    del rows[limit:]
+    last = rows[-1]
+
+    return encode_cursor(
+        sort=sort, order=order, key=getattr(last, sort_column.key), id=last.id
+    )
@@ -1,7 +1,7 @@
-from datetime import date
+from datetime import date, datetime
 
 from pydantic import Field
-from sqlalchemy import DATE, Column, ForeignKey, Table
+from sqlalchemy import DATE, TIMESTAMP, Column, ForeignKey, Index, Table, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from screenscout.career_role.models import CareerRole, CareerRoleRead
@@ -13,16 +13,20 @@ from screenscout.movie.models import Movie
 person_genre_association = Table(
     "person_genre",
     Base.metadata,
-    Column("person_id", ForeignKey("persons.id")),
-    Column("genre_id", ForeignKey("genres.id")),
+    Column("person_id", ForeignKey("persons.id"), primary_key=True),
+    Column("genre_id", ForeignKey("genres.id"), primary_key=True),
+    Index("ix_person_genre_genre_id_person_id", "genre_id", "person_id"),
 )
 
 
 person_career_role_association = Table(
     "person_career_role",
     Base.metadata,
-    Column("person_id", ForeignKey("persons.id")),
-    Column("career_role_id", ForeignKey("career_roles.id")),
+    Column("person_id", ForeignKey("persons.id"), primary_key=True),
+    Column("career_role_id", ForeignKey("career_roles.id"), primary_key=True),
+    Index(
+        "ix_person_career_role_career_role_id_person_id", "career_role_id", "person_id"
+    ),
 )
 
 
@@ -34,6 +38,12 @@ class Person(Base):
     height: Mapped[int] = mapped_column(unique=False, nullable=True)
     directed_movies: Mapped[list[Movie]] = relationship()
     birthday: Mapped[date] = mapped_column(DATE, unique=False, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
     career_roles: Mapped[list["CareerRole"]] = relationship(
         secondary=person_career_role_association
     )
@@ -62,6 +72,14 @@ class PersonRead(PersonBase):
     genres: list[GenreRead]
 
 
+class PersonSparseRead(PersonRead):
+    """A person with only the fields requested through `fields` and `include`."""
+
+    name: str | None = None  # type: ignore
+    career_roles: list[CareerRoleRead] | None = None  # type: ignore
+    genres: list[GenreRead] | None = None  # type: ignore
+
+
 class PersonSeriesDirectorRead(ScreenScoutBase):
     id: int
     name: str
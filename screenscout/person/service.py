@@ -1,11 +1,24 @@
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from screenscout import reference
+from screenscout.cache.service import invalidate
 from screenscout.career_role.models import CareerRole
+from screenscout.database.service import set_links
+from screenscout.fieldsets import Fieldset, load_options
 from screenscout.genre.models import Genre
 
-from .models import Person, PersonCreate, PersonUpdate
+from .models import (
+    Person,
+    PersonBase,
+    PersonCreate,
+    PersonUpdate,
+    person_career_role_association,
+    person_genre_association,
+)
 
 
 async def get(*, db_session: AsyncSession, person_id: int) -> Person | None:
@@ -20,10 +33,17 @@ async def get(*, db_session: AsyncSession, person_id: int) -> Person | None:
     return result.scalars().first()
 
 
-async def get_all(*, db_session: AsyncSession) -> list[Person]:
+# Attributes that can be requested with sparse fieldsets.
+COLUMNS = tuple(PersonBase.model_fields)
+RELATIONS = ("career_roles", "genres")
+
+
+async def get_all(
+    *, db_session: AsyncSession, fieldset: Fieldset | None = None
+) -> list[Person]:
     """Return all persons."""
     query = select(Person).options(
-        selectinload(Person.genres), selectinload(Person.career_roles)
+        *load_options(Person, fieldset=fieldset, relations=RELATIONS)
     )
     result = await db_session.execute(query)
 
@@ -33,29 +53,27 @@ async def get_all(*, db_session: AsyncSession) -> list[Person]:
 async def create(*, db_session: AsyncSession, person_in: PersonCreate) -> Person:
     """Creates a new person."""
     person_data = person_in.model_dump()
-    career_roles = person_data.pop("career_roles")
-    genres = person_data.pop("genres")
+    career_roles = await reference.get_by_ids(
+        db_session=db_session,
+        model=CareerRole,
+        ids=person_data.pop("career_roles") or [],
+    )
+    genres = await reference.get_by_ids(
+        db_session=db_session, model=Genre, ids=person_data.pop("genres") or []
+    )
     person = Person(**person_data)
 
     db_session.add(person)
-    await db_session.commit()
-    await db_session.refresh(person, ["career_roles", "genres"])
-
-    for career_role_id in career_roles:
-        result = await db_session.execute(
-            select(CareerRole).where(CareerRole.id == career_role_id)
-        )
-        career_role = result.scalars().first()
-        if career_role is not None:
-            person.career_roles.append(career_role)
-
-    for genre_id in genres:
-        result = await db_session.execute(select(Genre).where(Genre.id == genre_id))
-        genre = result.scalars().first()
-        if genre is not None:
-            person.genres.append(genre)  # type: ignore
+    await db_session.flush()
 
+    await _set_relations(
+        db_session=db_session,
+        person=person,
+        career_roles=career_roles,
+        genres=genres,
+    )
     await db_session.commit()
+    await invalidate("persons")
 
     return person
 
@@ -66,37 +84,75 @@ async def update(
     """Updates a person."""
     person_data = person.dict()
     update_data = person_in.model_dump(exclude_unset=True)
+
+    career_roles = genres = None
+    if person_in.career_roles is not None:
+        career_roles = await reference.get_by_ids(
+            db_session=db_session, model=CareerRole, ids=person_in.career_roles
+        )
+    if person_in.genres is not None:
+        genres = await reference.get_by_ids(
+            db_session=db_session, model=Genre, ids=person_in.genres
+        )
+
     for field in person_data:
         if field in update_data:
             setattr(person, field, update_data[field])
+    # Bumped even when only links change, as it versions the whole response.
+    person.updated_at = func.now()
 
-    if person_in.career_roles is not None:
-        person.career_roles.clear()
-        for career_role_id in person_in.career_roles:
-            result = await db_session.execute(
-                select(CareerRole).where(CareerRole.id == career_role_id)
-            )
-            career_role = result.scalars().first()
-            if career_role:
-                person.career_roles.append(career_role)
-
-    if person_in.genres is not None:
-        person.genres.clear()
-        for genre_id in person_in.genres:
-            result = await db_session.execute(select(Genre).where(Genre.id == genre_id))
-            genre = result.scalars().first()
-            if genre:
-                person.genres.append(genre)  # type: ignore
+    await db_session.flush()
 
+    await _set_relations(
+        db_session=db_session,
+        person=person,
+        career_roles=career_roles,
+        genres=genres,
+        replace=True,
+    )
     await db_session.commit()
-    await db_session.refresh(person)
+    await invalidate("persons", person.id)
 
     return person
 
 
+async def _set_relations(
+    *,
+    db_session: AsyncSession,
+    person: Person,
+    career_roles: list[CareerRole] | None,
+    genres: list[Genre] | None,
+    replace: bool = False,
+) -> None:
+    """Writes the given relations of a person, leaving `None` ones untouched."""
+    for attribute, table, column, targets in (
+        (
+            "career_roles",
+            person_career_role_association,
+            "career_role_id",
+            career_roles,
+        ),
+        ("genres", person_genre_association, "genre_id", genres),
+    ):
+        if targets is None:
+            continue
+
+        await set_links(
+            db_session=db_session,
+            table=table,
+            owner_column="person_id",
+            owner_id=person.id,
+            target_column=column,
+            targets=targets,
+            replace=replace,
+        )
+        set_committed_value(person, attribute, targets)
+
+
 async def delete(*, db_session: AsyncSession, person_id: int) -> None:
     """Deletes an existing person."""
     result = await db_session.execute(select(Person).where(Person.id == person_id))
     person = result.scalars().first()
     await db_session.delete(person)
     await db_session.commit()
+    await invalidate("persons", person_id)
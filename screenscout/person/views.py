@@ -1,27 +1,65 @@
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, status
-from fastapi_cache.decorator import cache
 
-from screenscout.auth.models import User
+from screenscout.auth.models import Principal
 from screenscout.auth.permissions import OwnerAdminManager
+from screenscout.cache.decorator import cache
+from screenscout.cache.keys import item_key_builder, list_key_builder
 from screenscout.database.core import SessionDep
+from screenscout.etags import entity_etag
+from screenscout.exceptions import EntityDoesNotExist, InvalidFieldset
+from screenscout.fieldsets import parse_fieldset
+from screenscout.responses import json_response
 
-from .models import PersonCreate, PersonRead, PersonUpdate
-from .service import create, delete, get, get_all, update
+from .models import Person, PersonCreate, PersonRead, PersonSparseRead, PersonUpdate
+from .service import COLUMNS, RELATIONS, create, delete, get, get_all, update
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[PersonRead])
-@cache(expire=300)
-async def get_persons(db_session: SessionDep) -> Any:
-    """Return all persons in the database."""
-    return await get_all(db_session=db_session)
+@router.get(
+    "/",
+    response_model=list[PersonRead] | list[PersonSparseRead],
+)
+@cache(
+    expire=21600,
+    namespace="persons",
+    key_builder=list_key_builder,
+    stale_while_revalidate=86400,
+)
+async def get_persons(
+    db_session: SessionDep, fields: str | None = None, include: str | None = None
+) -> Any:
+    """
+    Return all persons in the database.
+
+    `fields` and `include` take comma-separated column and relationship names
+    and restrict every person to them, e.g. `fields=name&include=career_roles`.
+    """
+    try:
+        fieldset = parse_fieldset(fields, include, columns=COLUMNS, relations=RELATIONS)
+    except InvalidFieldset as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    persons = await get_all(db_session=db_session, fieldset=fieldset)
+    if fieldset:
+        return json_response(
+            list[PersonSparseRead],
+            [fieldset.select(person) for person in persons],
+            exclude_unset=True,
+        )
+    return json_response(list[PersonRead], persons)
 
 
 @router.get("/{person_id}", response_model=PersonRead)
-@cache(expire=300)
+@cache(
+    expire=21600,
+    namespace="persons",
+    key_builder=item_key_builder("person_id"),
+    stale_while_revalidate=86400,
+    etag=entity_etag(Person, namespace="persons", parameter="person_id"),
+)
 async def get_person(db_session: SessionDep, person_id: int) -> Any:
     """Retrieve information about a person by its ID."""
     person = await get(db_session=db_session, person_id=person_id)
@@ -31,17 +69,23 @@ async def get_person(db_session: SessionDep, person_id: int) -> Any:
             detail=f"Person with id `{person_id}` does not exist.",
         )
 
-    return person
+    return json_response(PersonRead, person)
 
 
 @router.post("/", response_model=PersonRead, status_code=status.HTTP_201_CREATED)
 async def create_person(
     db_session: SessionDep,
     person_in: PersonCreate,
-    current_user: User = OwnerAdminManager,
+    current_user: Principal = OwnerAdminManager,
 ) -> Any:
     """Create a new person."""
-    person = await create(db_session=db_session, person_in=person_in)
+    try:
+        person = await create(db_session=db_session, person_in=person_in)
+    except EntityDoesNotExist as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        )
 
     return person
 
@@ -51,7 +95,7 @@ async def update_person(
     db_session: SessionDep,
     person_id: int,
     person_in: PersonUpdate,
-    current_user: User = OwnerAdminManager,
+    current_user: Principal = OwnerAdminManager,
 ) -> Any:
     """Update a person."""
     person = await get(db_session=db_session, person_id=person_id)
@@ -61,14 +105,20 @@ async def update_person(
             detail=f"Person with id `{person_id}` does not exist.",
         )
 
-    person = await update(db_session=db_session, person=person, person_in=person_in)
+    try:
+        person = await update(db_session=db_session, person=person, person_in=person_in)
+    except EntityDoesNotExist as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        )
 
     return person
 
 
 @router.delete("/{person_id}", response_model=None)
 async def delete_person(
-    db_session: SessionDep, person_id: int, current_user: User = OwnerAdminManager
+    db_session: SessionDep, person_id: int, current_user: Principal = OwnerAdminManager
 ) -> None:
     """Delete a person."""
     person = await get(db_session=db_session, person_id=person_id)
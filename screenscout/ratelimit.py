@@ -0,0 +1,166 @@
+"""
+Module for token-bucket rate limiting.
+
+Signing in and up hash a password, which costs tens of milliseconds of CPU by
+design, and needs no account, so a burst of such requests could take every
+worker down. They are limited by token buckets per client IP and per account
+from each IP, shared by all workers in Redis: each bucket holds up to `burst`
+tokens and refills at `rate` tokens per second, and a request takes one token
+from every bucket it falls in, or is refused with the seconds until it would
+succeed.
+
+The buckets are checked and updated by a Lua script, so concurrent requests
+cannot spend the same token. Once a bucket refuses a request, the worker
+remembers until when and refuses further requests for it without asking
+Redis, which keeps a flood from turning into a flood of Redis calls. While
+Redis is unavailable, each worker limits with buckets of its own instead.
+"""
+
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TypeVar
+
+from fastapi_cache import FastAPICache
+
+from screenscout.cache.backends import TwoTierBackend
+from screenscout.cache.breaker import CircuitOpen
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Takes one token from each of the buckets KEYS, whose burst and rate are
+# ARGV[2i - 1] and ARGV[2i], if all have one. Returns the seconds until each
+# bucket would have a token, all zero if the tokens were taken.
+TOKEN_BUCKETS = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local tokens = {}
+local waits = {}
+local allowed = true
+for i, key in ipairs(KEYS) do
+    local burst = tonumber(ARGV[2 * i - 1])
+    local rate = tonumber(ARGV[2 * i])
+    local bucket = redis.call('HMGET', key, 'tokens', 'at')
+    local available = tonumber(bucket[1]) or burst
+    local at = tonumber(bucket[2]) or now
+    available = math.min(burst, available + math.max(0, now - at) * rate)
+    tokens[i] = available
+    if available < 1 then
+        allowed = false
+        waits[i] = tostring((1 - available) / rate)
+    else
+        waits[i] = '0'
+    end
+end
+if allowed then
+    for i, key in ipairs(KEYS) do
+        local burst = tonumber(ARGV[2 * i - 1])
+        local rate = tonumber(ARGV[2 * i])
+        local left = tokens[i] - 1
+        redis.call('HSET', key, 'tokens', left, 'at', now)
+        redis.call('PEXPIRE', key, math.ceil((burst - left) / rate * 1000) + 1000)
+    end
+end
+return waits
+"""
+
+
+@dataclass(frozen=True)
+class Limit:
+    burst: int
+    # Tokens added per second.
+    rate: float
+
+
+class TokenBucketLimiter:
+    """Token buckets in Redis, with per-worker fast rejects and fallback."""
+
+    def __init__(self, *, prefix: str = "ratelimit", maxsize: int = 10000) -> None:
+        self.prefix = prefix
+        self.maxsize = maxsize
+        # Until when each bucket is known to be empty, by key.
+        self._blocked: OrderedDict[str, float] = OrderedDict()
+        # Buckets used while Redis is unavailable, as (tokens, at) by key.
+        self._local: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._limiting_locally = False
+
+    async def hit(self, buckets: dict[str, Limit]) -> float:
+        """Takes a token from every bucket, by key.
+
+        Returns 0 if the request may proceed, or the seconds until it may.
+        """
+        keys = {f"{self.prefix}:{key}": limit for key, limit in buckets.items()}
+
+        now = time.monotonic()
+        wait = max((self._blocked.get(key, now) - now for key in keys), default=0.0)
+        if wait > 0:
+            return wait
+
+        # While the breaker is open, the call fails without reaching Redis.
+        try:
+            waits = await self._hit_redis(keys)
+        except Exception as error:
+            # Logged once per outage, so a flood does not become a log flood.
+            if not self._limiting_locally:
+                logger.warning(
+                    "Rate limiter unavailable, limiting locally",
+                    exc_info=not isinstance(error, CircuitOpen),
+                )
+                self._limiting_locally = True
+            waits = self._hit_local(keys)
+        else:
+            if self._limiting_locally:
+                logger.info("Rate limiter available again")
+                self._limiting_locally = False
+
+        for key, key_wait in zip(keys, waits):
+            if key_wait > 0:
+                self._remember(self._blocked, key, now + key_wait)
+
+        return max(waits, default=0.0)
+
+    async def _hit_redis(self, keys: dict[str, Limit]) -> list[float]:
+        backend = FastAPICache.get_backend()
+        if not isinstance(backend, TwoTierBackend):
+            raise RuntimeError("Rate limiting needs the Redis cache backend")
+
+        args = [value for limit in keys.values() for value in (limit.burst, limit.rate)]
+        waits = await backend.call(
+            lambda: backend.redis.eval(TOKEN_BUCKETS, len(keys), *keys, *args)
+        )
+
+        return [float(wait) for wait in waits]
+
+    def _hit_local(self, keys: dict[str, Limit]) -> list[float]:
+        now = time.monotonic()
+        tokens = {}
+        for key, limit in keys.items():
+            available, at = self._local.get(key, (limit.burst, now))
+            tokens[key] = min(limit.burst, available + (now - at) * limit.rate)
+
+        waits = [
+            max(0.0, (1 - tokens[key]) / limit.rate) for key, limit in keys.items()
+        ]
+        if not any(waits):
+            for key in keys:
+                self._remember(self._local, key, (tokens[key] - 1, now))
+
+        return waits
+
+    def _remember(self, entries: OrderedDict[str, T], key: str, value: T) -> None:
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.maxsize:
+            entries.popitem(last=False)
+
+
+def retry_after(wait: float) -> str:
+    """Formats a wait in seconds as a `Retry-After` header value."""
+    return str(max(1, math.ceil(wait)))
+
+
+limiter = TokenBucketLimiter()
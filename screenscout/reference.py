@@ -0,0 +1,235 @@
+"""
+Module for the in-memory snapshot of reference data.
+
+Genres, countries, languages and career roles are small and rarely written,
+so every worker keeps all of them in memory:
+
+- services resolve the reference ids of a movie, series or person against the
+  snapshot instead of querying each table (`get_by_ids`);
+- the reference endpoints answer from JSON bodies encoded once per snapshot,
+  with ETags, without touching the database or Redis.
+
+The reference services send a `NOTIFY` naming the table in the transaction of
+every write. Each worker `LISTEN`s on a dedicated connection and reloads that
+table once the write commits. Notifications sent while the listener was
+disconnected are lost, so every table is reloaded when it reconnects.
+"""
+
+import asyncio
+import hashlib
+import logging
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, TypeVar
+
+import asyncpg
+from pydantic import TypeAdapter
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import make_transient_to_detached
+
+from screenscout.career_role.models import CareerRole, CareerRoleRead
+from screenscout.config import settings
+from screenscout.country.models import Country, CountryRead
+from screenscout.database import service as database_service
+from screenscout.database.core import Base, async_session
+from screenscout.genre.models import Genre, GenreRead
+from screenscout.language.models import Language, LanguageRead
+from screenscout.models import ScreenScoutBase
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "reference_data"
+
+# The reference tables by name, with the model their rows are read as.
+TABLES: dict[str, tuple[type[Base], type[ScreenScoutBase]]] = {
+    "genres": (Genre, GenreRead),
+    "countries": (Country, CountryRead),
+    "languages": (Language, LanguageRead),
+    "career_roles": (CareerRole, CareerRoleRead),
+}
+
+ModelT = TypeVar("ModelT", bound=Base)
+
+
+@dataclass(frozen=True)
+class EncodedBody:
+    content: bytes
+    etag: str
+
+    @classmethod
+    def of(cls, content: bytes) -> "EncodedBody":
+        return cls(content, f'"{hashlib.md5(content).hexdigest()}"')
+
+
+@dataclass(frozen=True)
+class ReferenceTable:
+    """An immutable snapshot of one reference table."""
+
+    rows: Mapping[int, ScreenScoutBase]
+    body: EncodedBody
+    bodies: Mapping[int, EncodedBody]
+
+    @classmethod
+    def build(
+        cls, rows: Iterable[Any], read: type[ScreenScoutBase]
+    ) -> "ReferenceTable":
+        item_list = list[read]  # type: ignore[valid-type]
+        adapter: TypeAdapter[list[Any]] = TypeAdapter(item_list)
+        items = adapter.validate_python(list(rows), from_attributes=True)
+
+        return cls(
+            rows=MappingProxyType({item.id: item for item in items}),
+            body=EncodedBody.of(adapter.dump_json(items)),
+            bodies=MappingProxyType(
+                {
+                    item.id: EncodedBody.of(item.model_dump_json().encode())
+                    for item in items
+                }
+            ),
+        )
+
+
+class ReferenceData:
+    """The reference tables of this process, replaced whole on every change."""
+
+    def __init__(self) -> None:
+        self._tables: dict[str, ReferenceTable] = {}
+        # Reloads run one at a time, so the last one started wins.
+        self._lock = asyncio.Lock()
+        self._reloads: set[asyncio.Task[None]] = set()
+        self._listener: asyncio.Task[None] | None = None
+
+    async def get(self, name: str) -> ReferenceTable:
+        """Returns the snapshot of a table, loading it on first use."""
+        table = self._tables.get(name)
+        if table is None:
+            table = await self.load(name)
+
+        return table
+
+    async def load(self, name: str) -> ReferenceTable:
+        """Reads a table from the database and replaces its snapshot."""
+        model, read = TABLES[name]
+        async with self._lock:
+            async with async_session() as db_session:
+                result = await db_session.execute(
+                    select(model).order_by(model.id)  # type: ignore[attr-defined]
+                )
+                table = ReferenceTable.build(result.scalars().all(), read)
+            self._tables[name] = table
+
+        return table
+
+    async def load_all(self) -> None:
+        for name in TABLES:
+            await self.load(name)
+
+    async def start(self) -> None:
+        """Loads every table and starts listening for changes."""
+        await self.load_all()
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    def _on_notification(
+        self, connection: Any, pid: int, channel: str, payload: str
+    ) -> None:
+        if payload not in TABLES:
+            return
+
+        task = asyncio.create_task(self._reload(payload))
+        self._reloads.add(task)
+        task.add_done_callback(self._reloads.discard)
+
+    async def _reload(self, name: str) -> None:
+        try:
+            await self.load(name)
+        except Exception:
+            # The stale snapshot is kept; lookups of new ids fall back to SQL.
+            logger.warning("Could not reload reference table `%s`", name, exc_info=True)
+
+    async def _listen(self) -> None:
+        delay = 1.0
+        reconnecting = False
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(
+                    host=settings.POSTGRES_HOST,
+                    port=settings.POSTGRES_PORT,
+                    user=settings.POSTGRES_USER,
+                    password=settings.POSTGRES_PASSWORD,
+                    database=settings.POSTGRES_DB,
+                )
+                closed: asyncio.Future[None] = (
+                    asyncio.get_running_loop().create_future()
+                )
+
+                def on_termination(connection: Any) -> None:
+                    if not closed.done():
+                        closed.set_result(None)
+
+                connection.add_termination_listener(on_termination)
+                await connection.add_listener(CHANNEL, self._on_notification)
+                delay = 1.0
+
+                if reconnecting:
+                    await self.load_all()
+                reconnecting = True
+
+                await closed
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Reference data channel lost, retrying in %.0fs", delay)
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+
+reference_data = ReferenceData()
+
+
+async def notify_changed(*, db_session: AsyncSession, table: str) -> None:
+    """Tells every worker to reload `table` once the transaction commits."""
+    await db_session.execute(select(func.pg_notify(CHANNEL, table)))
+
+
+async def get_by_ids(
+    *, db_session: AsyncSession, model: type[ModelT], ids: Iterable[int]
+) -> list[ModelT]:
+    """Returns reference rows by id, attached to `db_session` without a query.
+
+    Ids missing from the snapshot, such as a genre created an instant ago by
+    another worker, are looked up in the database instead, which also reports
+    ids that do not exist. Ids deleted since the snapshot was loaded pass, and
+    are reported by `set_links` once the foreign key refuses them.
+    """
+    table = await reference_data.get(model.__tablename__)
+    unique_ids = list(dict.fromkeys(ids))
+    if any(id_ not in table.rows for id_ in unique_ids):
+        return await database_service.get_by_ids(
+            db_session=db_session, model=model, ids=unique_ids
+        )
+
+    rows = []
+    for id_ in unique_ids:
+        row = model(**table.rows[id_].model_dump())
+        make_transient_to_detached(row)
+        rows.append(await db_session.merge(row, load=False))
+
+    return rows
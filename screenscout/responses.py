@@ -0,0 +1,41 @@
+"""
+Module for the fast JSON response path.
+
+FastAPI validates whatever an endpoint returns against its `response_model`,
+dumps the result to Python objects and encodes those with the stdlib `json`
+module; an already validated pydantic model is dumped and validated once more.
+`json_response` instead validates the rows once with a cached `TypeAdapter` and
+lets pydantic-core write the JSON bytes directly. Those bytes are returned
+as-is and are what the response cache stores, so a cache hit is sent without
+decoding or validating anything.
+"""
+
+from functools import lru_cache
+from typing import Any
+
+from pydantic import TypeAdapter
+from starlette.responses import Response
+
+
+class JSONBytesResponse(Response):
+    """A response whose body is already encoded JSON."""
+
+    media_type = "application/json"
+
+
+@lru_cache(maxsize=None)
+def _adapter(type_: Any) -> TypeAdapter[Any]:
+    return TypeAdapter(type_)
+
+
+def json_response(
+    type_: Any, value: Any, *, exclude_unset: bool = False, status_code: int = 200
+) -> JSONBytesResponse:
+    """Validates `value` as `type_` and returns it encoded as JSON."""
+    adapter = _adapter(type_)
+    validated = adapter.validate_python(value, from_attributes=True)
+
+    return JSONBytesResponse(
+        adapter.dump_json(validated, exclude_unset=exclude_unset),
+        status_code=status_code,
+    )
@@ -0,0 +1,49 @@
+"""
+Module for ranked title search over the movie and series catalogs.
+
+Each catalog table carries a generated `search_vector` column (title terms
+weighted above description terms) behind a GIN index, plus a `pg_trgm` GIN
+index on `title`. A search term matches a row when either the full-text query
+matches or the term is trigram-similar to a word of the title, which is what
+lets misspelled queries such as "godfahter" still find "The Godfather".
+"""
+
+from typing import Any
+
+from sqlalchemy import ColumnElement, func, or_
+from sqlalchemy.orm import InstrumentedAttribute
+
+# The `simple` configuration is used because titles are multilingual and
+# should not be stemmed as English.
+SEARCH_CONFIG = "simple"
+
+SEARCH_VECTOR = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')"
+)
+
+
+def search_filter(
+    *,
+    search_vector: InstrumentedAttribute[Any],
+    title: InstrumentedAttribute[str],
+    term: str,
+) -> ColumnElement[bool]:
+    """Matches rows by full-text query or by trigram word similarity."""
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, term)
+
+    return or_(search_vector.bool_op("@@")(ts_query), title.bool_op("%>")(term))
+
+
+def search_rank(
+    *,
+    search_vector: InstrumentedAttribute[Any],
+    title: InstrumentedAttribute[str],
+    term: str,
+) -> ColumnElement[float]:
+    """Relevance of a row for `term`, used to order search results."""
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, term)
+
+    return func.greatest(
+        func.ts_rank(search_vector, ts_query), func.word_similarity(term, title)
+    )
@@ -1,18 +1,97 @@
+"""
+Module for tokens and password hashing.
+
+bcrypt takes tens to hundreds of milliseconds per hash by design. Run inside a
+handler it would block the event loop, and with it every other request of the
+worker, so hashes are computed in a pool of `PASSWORD_HASH_WORKERS` threads
+(bcrypt releases the GIL while hashing). Calls beyond that wait in the pool's
+queue, whose depth is reported by `password_hasher.stats()`.
+
+Passwords are hashed with a cost of `BCRYPT_ROUNDS`. Hashes of any other cost
+are replaced with a new one when their user next signs in.
+"""
+
+import asyncio
+import uuid
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, TypeVar
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from screenscout.config import settings
+from screenscout.models import ScreenScoutBase
+
+T = TypeVar("T")
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+
+class HashingStats(ScreenScoutBase):
+    workers: int
+    running: int
+    queued: int
+
+
+class PasswordHasher:
+    """Runs password hashing in a bounded thread pool."""
+
+    def __init__(self, *, workers: int) -> None:
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hasher"
+        )
+        self._pending = 0
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, func, *args
+            )
+        finally:
+            self._pending -= 1
+
+    def stats(self) -> HashingStats:
+        return HashingStats(
+            workers=self.workers,
+            running=min(self._pending, self.workers),
+            queued=max(self._pending - self.workers, 0),
+        )
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(workers=settings.PASSWORD_HASH_WORKERS)
 
 
 def create_access_token(data: dict[str, Any]) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "type": "access"})
+    to_encode.setdefault("jti", uuid.uuid4().hex)
+
+    encoded_jwt = jwt.encode(
+        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
+    )
+
+    return encoded_jwt
+
+
+def create_refresh_token(data: dict[str, Any]) -> str:
+    to_encode = data.copy()
+    expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.setdefault("jti", uuid.uuid4().hex)
 
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
@@ -21,9 +100,14 @@ def create_access_token(data: dict[str, Any]) -> str:
     return encoded_jwt
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """Checks a password, returning a new hash too if the stored one is outdated."""
+    return await password_hasher.run(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
 
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+async def get_password_hash(password: str) -> str:
+    return await password_hasher.run(pwd_context.hash, password)
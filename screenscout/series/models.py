@@ -1,8 +1,20 @@
-from datetime import date
+from datetime import date, datetime
 from typing import TYPE_CHECKING
 
 from pydantic import Field
-from sqlalchemy import DECIMAL, Column, ForeignKey, Table, Text
+from sqlalchemy import (
+    DECIMAL,
+    TIMESTAMP,
+    Column,
+    Computed,
+    ForeignKey,
+    Index,
+    Integer,
+    Table,
+    Text,
+    func,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from screenscout.country.models import Country, CountryRead
@@ -11,6 +23,7 @@ from screenscout.genre.models import Genre, GenreRead
 from screenscout.language.models import Language, LanguageRead
 from screenscout.models import ScreenScoutBase
 from screenscout.person.models import Person, PersonSeriesDirectorRead
+from screenscout.search import SEARCH_VECTOR
 
 if TYPE_CHECKING:
     from screenscout.watchlist.models import UserWatchlistSeriesAssociation
@@ -19,36 +32,52 @@ if TYPE_CHECKING:
 series_genre_association = Table(
     "series_genre",
     Base.metadata,
-    Column("series_id", ForeignKey("series.id")),
-    Column("genre_id", ForeignKey("genres.id")),
+    Column("series_id", ForeignKey("series.id"), primary_key=True),
+    Column("genre_id", ForeignKey("genres.id"), primary_key=True),
+    Index("ix_series_genre_genre_id_series_id", "genre_id", "series_id"),
 )
 
 series_country_association = Table(
     "series_country",
     Base.metadata,
-    Column("series_id", ForeignKey("series.id")),
-    Column("country_id", ForeignKey("countries.id")),
+    Column("series_id", ForeignKey("series.id"), primary_key=True),
+    Column("country_id", ForeignKey("countries.id"), primary_key=True),
+    Index("ix_series_country_country_id_series_id", "country_id", "series_id"),
 )
 
 
 series_language_association = Table(
     "series_language",
     Base.metadata,
-    Column("series_id", ForeignKey("series.id")),
-    Column("language_id", ForeignKey("languages.id")),
+    Column("series_id", ForeignKey("series.id"), primary_key=True),
+    Column("language_id", ForeignKey("languages.id"), primary_key=True),
+    Index("ix_series_language_language_id_series_id", "language_id", "series_id"),
 )
 
 
 series_director_association = Table(
     "series_director",
     Base.metadata,
-    Column("series_id", ForeignKey("series.id")),
-    Column("director_id", ForeignKey("persons.id")),
+    Column("series_id", ForeignKey("series.id"), primary_key=True),
+    Column("director_id", ForeignKey("persons.id"), primary_key=True),
+    Index("ix_series_director_director_id_series_id", "director_id", "series_id"),
 )
 
 
 class Series(Base):
     __tablename__ = "series"
+    __table_args__ = (
+        Index("ix_series_title_id", "title", "id"),
+        Index("ix_series_production_year_id", "production_year", "id"),
+        Index("ix_series_IMDb_rating_id", "IMDb_rating", "id"),
+        Index("ix_series_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_series_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(unique=False, nullable=False)
@@ -71,12 +100,46 @@ class Series(Base):
     age_category: Mapped[str] = mapped_column(unique=False, nullable=False)
     poster_url: Mapped[str] = mapped_column(unique=False, nullable=True)
     trailer_url: Mapped[str] = mapped_column(unique=False, nullable=True)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR, Computed(SEARCH_VECTOR, persisted=True), deferred=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
 
     users: Mapped[list["UserWatchlistSeriesAssociation"]] = relationship(
         back_populates="series"
     )
 
 
+class SeriesCatalog(Base):
+    """Filter columns of a series, denormalized and kept in sync by triggers."""
+
+    __tablename__ = "series_catalog"
+    __table_args__ = (
+        Index("ix_series_catalog_genre_ids", "genre_ids", postgresql_using="gin"),
+        Index("ix_series_catalog_country_ids", "country_ids", postgresql_using="gin"),
+        Index("ix_series_catalog_language_ids", "language_ids", postgresql_using="gin"),
+    )
+
+    series_id: Mapped[int] = mapped_column(
+        ForeignKey("series.id", ondelete="CASCADE"), primary_key=True
+    )
+    year: Mapped[int] = mapped_column(index=True, nullable=False)
+    genre_ids: Mapped[list[int]] = mapped_column(
+        ARRAY(Integer), nullable=False, server_default="{}"
+    )
+    country_ids: Mapped[list[int]] = mapped_column(
+        ARRAY(Integer), nullable=False, server_default="{}"
+    )
+    language_ids: Mapped[list[int]] = mapped_column(
+        ARRAY(Integer), nullable=False, server_default="{}"
+    )
+
+
 class SeriesBase(ScreenScoutBase):
     title: str
     production_year: date
@@ -116,3 +179,18 @@ class SeriesRead(SeriesBase):
     genres: list[GenreRead]
     language: list[LanguageRead]
     director: list[PersonSeriesDirectorRead]
+
+
+class SeriesSparseRead(SeriesRead):
+    """A series with only the fields requested through `fields` and `include`."""
+
+    title: str | None = None  # type: ignore
+    production_year: date | None = None  # type: ignore
+    IMDb_rating: float | None = None  # type: ignore
+    seasons_count: int | None = None  # type: ignore
+    description: str | None = None  # type: ignore
+    age_category: str | None = None  # type: ignore
+    country: list[CountryRead] | None = None  # type: ignore
+    genres: list[GenreRead] | None = None  # type: ignore
+    language: list[LanguageRead] | None = None  # type: ignore
+    director: list[PersonSeriesDirectorRead] | None = None  # type: ignore
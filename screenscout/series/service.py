@@ -1,16 +1,43 @@
 from datetime import date
+from typing import Any
 
-from sqlalchemy import and_
+from sqlalchemy import ColumnElement, Select, and_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from screenscout import reference
+from screenscout.cache.service import invalidate
+from screenscout.catalog import CatalogFacets, MatchMode, array_filter, count_facets
 from screenscout.country.models import Country
+from screenscout.database.service import get_by_ids, set_links
+from screenscout.fieldsets import Fieldset, load_options
 from screenscout.genre.models import Genre
 from screenscout.language.models import Language
+from screenscout.pagination import (
+    CatalogSort,
+    Cursor,
+    SortOrder,
+    next_cursor,
+    order_by,
+    paginate,
+)
 from screenscout.person.models import Person
-
-from .models import Series, SeriesCreate, SeriesUpdate
+from screenscout.search import search_filter, search_rank
+from screenscout.watchlist import cache as watchlist_cache
+
+from .models import (
+    Series,
+    SeriesBase,
+    SeriesCatalog,
+    SeriesCreate,
+    SeriesUpdate,
+    series_country_association,
+    series_director_association,
+    series_genre_association,
+    series_language_association,
+)
 
 
 async def get(*, db_session: AsyncSession, series_id: int) -> Series | None:
@@ -25,100 +52,274 @@ async def get(*, db_session: AsyncSession, series_id: int) -> Series | None:
     return result.scalars().first()
 
 
-async def get_all(
+# Attributes that can be requested with sparse fieldsets.
+COLUMNS = tuple(SeriesBase.model_fields)
+RELATIONS = ("country", "genres", "language", "director")
+
+SORT_COLUMNS = {
+    CatalogSort.ID: Series.id,
+    CatalogSort.TITLE: Series.title,
+    CatalogSort.PRODUCTION_YEAR: Series.production_year,
+    CatalogSort.RATING: Series.IMDb_rating,
+}
+
+
+def _filters(
     *,
-    db_session: AsyncSession,
+    search: str | None = None,
     title: str | None = None,
     production_year: date | None = None,
     country_id: int | None = None,
     genre_id: int | None = None,
     min_rating: float | None = None,
     max_rating: float | None = None,
-    limit: int = 20,
-    offset: int = 0,
-) -> list[Series]:
-    """Return a paginated list of series with optional filters."""
-    query = select(Series).options(
-        selectinload(Series.country),
-        selectinload(Series.genres),
-        selectinload(Series.language),
-        selectinload(Series.director),
-    )
-
+    genre_ids: list[int] | None = None,
+    genre_match: MatchMode = MatchMode.ANY,
+    country_ids: list[int] | None = None,
+    language_ids: list[int] | None = None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+) -> list[ColumnElement[bool]]:
+    """Builds the WHERE clauses shared by the catalog queries."""
     filters = []
 
+    if search:
+        filters.append(
+            search_filter(
+                search_vector=Series.search_vector, title=Series.title, term=search
+            )
+        )
+
     if title:
         filters.append(Series.title.ilike(f"%{title}%"))
 
     if production_year:
-        filters.append(Series.production_year == production_year)  # type: ignore
+        filters.append(Series.production_year == production_year)
 
-    if country_id:
-        filters.append(Series.country.any(Country.id == country_id))  # type: ignore
+    if min_rating is not None:
+        filters.append(Series.IMDb_rating >= min_rating)
+
+    if max_rating is not None:
+        filters.append(Series.IMDb_rating <= max_rating)
+
+    # Genre, country, language and year filters are answered by the read model.
+    catalog_filters = []
 
     if genre_id:
-        filters.append(Series.genres.any(Genre.id == genre_id))  # type: ignore
+        catalog_filters.append(SeriesCatalog.genre_ids.contains([genre_id]))
 
-    if min_rating is not None:
-        filters.append(Series.IMDb_rating >= min_rating)  # type: ignore
+    if genre_ids:
+        catalog_filters.append(
+            array_filter(SeriesCatalog.genre_ids, genre_ids, match=genre_match)
+        )
 
-    if max_rating is not None:
-        filters.append(Series.IMDb_rating <= max_rating)  # type: ignore
+    if country_id:
+        catalog_filters.append(SeriesCatalog.country_ids.contains([country_id]))
+
+    if country_ids:
+        catalog_filters.append(SeriesCatalog.country_ids.overlap(country_ids))
+
+    if language_ids:
+        catalog_filters.append(SeriesCatalog.language_ids.overlap(language_ids))
+
+    if year_from is not None:
+        catalog_filters.append(SeriesCatalog.year >= year_from)
+
+    if year_to is not None:
+        catalog_filters.append(SeriesCatalog.year <= year_to)
+
+    if catalog_filters:
+        filters.append(
+            Series.id.in_(select(SeriesCatalog.series_id).where(*catalog_filters))
+        )
+
+    return filters
+
+
+def _catalog_query(**filter_args: Any) -> Select[tuple[Series]]:
+    query = select(Series)
 
+    filters = _filters(**filter_args)
     if filters:
         query = query.where(and_(*filters))
 
+    return query
+
+
+async def get_all(
+    *,
+    db_session: AsyncSession,
+    search: str | None = None,
+    title: str | None = None,
+    production_year: date | None = None,
+    country_id: int | None = None,
+    genre_id: int | None = None,
+    min_rating: float | None = None,
+    max_rating: float | None = None,
+    genre_ids: list[int] | None = None,
+    genre_match: MatchMode = MatchMode.ANY,
+    country_ids: list[int] | None = None,
+    language_ids: list[int] | None = None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    sort: CatalogSort = CatalogSort.ID,
+    order: SortOrder = SortOrder.ASC,
+    limit: int = 20,
+    offset: int = 0,
+    fieldset: Fieldset | None = None,
+) -> list[Series]:
+    """Return a paginated list of series with optional filters.
+
+    When `search` is given, results are ordered by relevance instead of `sort`.
+    """
+    query = _catalog_query(
+        search=search,
+        title=title,
+        production_year=production_year,
+        country_id=country_id,
+        genre_id=genre_id,
+        min_rating=min_rating,
+        max_rating=max_rating,
+        genre_ids=genre_ids,
+        genre_match=genre_match,
+        country_ids=country_ids,
+        language_ids=language_ids,
+        year_from=year_from,
+        year_to=year_to,
+    )
+
+    if search:
+        rank = search_rank(
+            search_vector=Series.search_vector, title=Series.title, term=search
+        )
+        query = query.order_by(rank.desc(), Series.id)
+    else:
+        query = order_by(
+            query, sort_column=SORT_COLUMNS[sort], id_column=Series.id, order=order
+        )
     query = query.limit(limit).offset(offset)
+    query = query.options(*load_options(Series, fieldset=fieldset, relations=RELATIONS))
 
     result = await db_session.execute(query)
 
     return result.scalars().all()  # type: ignore
 
 
+async def get_page(
+    *,
+    db_session: AsyncSession,
+    search: str | None = None,
+    title: str | None = None,
+    production_year: date | None = None,
+    country_id: int | None = None,
+    genre_id: int | None = None,
+    min_rating: float | None = None,
+    max_rating: float | None = None,
+    genre_ids: list[int] | None = None,
+    genre_match: MatchMode = MatchMode.ANY,
+    country_ids: list[int] | None = None,
+    language_ids: list[int] | None = None,
+    year_from: int | None = None,
+    year_to: int | None = None,
+    sort: CatalogSort = CatalogSort.ID,
+    order: SortOrder = SortOrder.ASC,
+    after: Cursor | None = None,
+    limit: int = 20,
+    fieldset: Fieldset | None = None,
+) -> tuple[list[Series], str | None]:
+    """Return the page of series following `after` and the cursor for the next one.
+
+    Unlike `get_all`, the cost of a page does not depend on how deep it is.
+    A `search` term only filters here, since relevance is not a stable key.
+    """
+    query = _catalog_query(
+        search=search,
+        title=title,
+        production_year=production_year,
+        country_id=country_id,
+        genre_id=genre_id,
+        min_rating=min_rating,
+        max_rating=max_rating,
+        genre_ids=genre_ids,
+        genre_match=genre_match,
+        country_ids=country_ids,
+        language_ids=language_ids,
+        year_from=year_from,
+        year_to=year_to,
+    )
+
+    sort_column = SORT_COLUMNS[sort]
+    query = paginate(
+        query,
+        sort_column=sort_column,
+        id_column=Series.id,
+        order=order,
+        after=after,
+        limit=limit,
+    )
+    query = query.options(
+        *load_options(
+            Series, fieldset=fieldset, relations=RELATIONS, required=[sort_column]
+        )
+    )
+
+    result = await db_session.execute(query)
+    series = list(result.scalars().all())
+
+    cursor = next_cursor(
+        series, sort=sort, order=order, sort_column=sort_column, limit=limit
+    )
+
+    return series, cursor
+
+
+async def get_facets(*, db_session: AsyncSession, **filter_args: Any) -> CatalogFacets:
+    """Returns facet counts over the series matching the given filters."""
+    query = select(
+        SeriesCatalog.genre_ids,
+        SeriesCatalog.country_ids,
+        SeriesCatalog.language_ids,
+        SeriesCatalog.year,
+        Series.IMDb_rating.label("rating"),
+    ).join(Series, Series.id == SeriesCatalog.series_id)
+
+    filters = _filters(**filter_args)
+    if filters:
+        query = query.where(and_(*filters))
+
+    return await count_facets(db_session=db_session, matched=query)
+
+
 async def create(*, db_session: AsyncSession, series_in: SeriesCreate) -> Series:
     """Creates a new series."""
     series_data = series_in.model_dump()
-    country = series_data.pop("country")
-    genres = series_data.pop("genres")
-    languages = series_data.pop("language")
-    director = series_data.pop("director")
+    countries = await reference.get_by_ids(
+        db_session=db_session, model=Country, ids=series_data.pop("country") or []
+    )
+    genres = await reference.get_by_ids(
+        db_session=db_session, model=Genre, ids=series_data.pop("genres") or []
+    )
+    languages = await reference.get_by_ids(
+        db_session=db_session, model=Language, ids=series_data.pop("language") or []
+    )
+    directors = await get_by_ids(
+        db_session=db_session, model=Person, ids=series_data.pop("director") or []
+    )
     series = Series(**series_data)
 
     db_session.add(series)
+    await db_session.flush()
+
+    await _set_relations(
+        db_session=db_session,
+        series=series,
+        countries=countries,
+        genres=genres,
+        languages=languages,
+        directors=directors,
+    )
     await db_session.commit()
-    await db_session.refresh(series, ["country", "genres", "language", "director"])
-
-    for country_id in country:
-        result = await db_session.execute(
-            select(Country).where(Country.id == country_id)
-        )
-        country = result.scalars().first()
-        if country is not None:
-            series.country.append(country)
-
-    for genre_id in genres:
-        result = await db_session.execute(select(Genre).where(Genre.id == genre_id))
-        genre = result.scalars().first()
-        if genre is not None:
-            series.genres.append(genre)  # type: ignore
-
-    for language_id in languages:
-        result = await db_session.execute(
-            select(Language).where(Language.id == language_id)
-        )
-        language = result.scalars().first()
-        if language is not None:
-            series.language.append(language)  # type: ignore
-
-    for director_id in director:
-        result = await db_session.execute(
-            select(Person).where(Person.id == director_id)
-        )
-        director_db = result.scalars().first()
-        if director_db is not None:
-            series.director.append(director_db)  # type: ignore
-
-    await db_session.commit()
+    await invalidate("series")
 
     return series
 
@@ -129,57 +330,86 @@ async def update(
     """Updates a series."""
     series_data = series.dict()
     update_data = series_in.model_dump(exclude_unset=True)
-    for field in series_data:
-        if field in update_data:
-            setattr(series, field, update_data[field])
 
+    countries = genres = languages = directors = None
     if series_in.country is not None:
-        series.country.clear()
-        for country_id in series_in.country:
-            result = await db_session.execute(
-                select(Country).where(Country.id == country_id)
-            )
-            country = result.scalars().first()
-            if country:
-                series.country.append(country)
-
+        countries = await reference.get_by_ids(
+            db_session=db_session, model=Country, ids=series_in.country
+        )
     if series_in.genres is not None:
-        series.genres.clear()
-        for genre_id in series_in.genres:
-            result = await db_session.execute(select(Genre).where(Genre.id == genre_id))
-            genre = result.scalars().first()
-            if genre:
-                series.genres.append(genre)  # type: ignore
-
+        genres = await reference.get_by_ids(
+            db_session=db_session, model=Genre, ids=series_in.genres
+        )
     if series_in.language is not None:
-        series.language.clear()
-        for language_id in series_in.language:
-            result = await db_session.execute(
-                select(Language).where(Language.id == language_id)
-            )
-            language = result.scalars().first()
-            if language:
-                series.language.append(language)  # type: ignore
-
+        languages = await reference.get_by_ids(
+            db_session=db_session, model=Language, ids=series_in.language
+        )
     if series_in.director is not None:
-        series.director.clear()
-        for director_id in series_in.director:
-            result = await db_session.execute(
-                select(Person).where(Person.id == director_id)
-            )
-            director_db = result.scalars().first()
-            if director_db:
-                series.director.append(director_db)  # type: ignore
+        directors = await get_by_ids(
+            db_session=db_session, model=Person, ids=series_in.director
+        )
 
+    for field in series_data:
+        if field in update_data:
+            setattr(series, field, update_data[field])
+    # Bumped even when only links change, as it versions the whole response.
+    series.updated_at = func.now()
+
+    await db_session.flush()
+
+    await _set_relations(
+        db_session=db_session,
+        series=series,
+        countries=countries,
+        genres=genres,
+        languages=languages,
+        directors=directors,
+        replace=True,
+    )
     await db_session.commit()
-    await db_session.refresh(series)
+    await invalidate("series", series.id)
+    await watchlist_cache.forget_title(type_="series", item_id=series.id)
 
     return series
 
 
+async def _set_relations(
+    *,
+    db_session: AsyncSession,
+    series: Series,
+    countries: list[Country] | None,
+    genres: list[Genre] | None,
+    languages: list[Language] | None,
+    directors: list[Person] | None,
+    replace: bool = False,
+) -> None:
+    """Writes the given relations of a series, leaving `None` ones untouched."""
+    for attribute, table, column, targets in (
+        ("country", series_country_association, "country_id", countries),
+        ("genres", series_genre_association, "genre_id", genres),
+        ("language", series_language_association, "language_id", languages),
+        ("director", series_director_association, "director_id", directors),
+    ):
+        if targets is None:
+            continue
+
+        await set_links(
+            db_session=db_session,
+            table=table,
+            owner_column="series_id",
+            owner_id=series.id,
+            target_column=column,
+            targets=targets,
+            replace=replace,
+        )
+        set_committed_value(series, attribute, targets)
+
+
 async def delete(*, db_session: AsyncSession, series_id: int) -> None:
     """Deletes an existing series."""
     result = await db_session.execute(select(Series).where(Series.id == series_id))
     series = result.scalars().first()
     await db_session.delete(series)
     await db_session.commit()
+    await invalidate("series", series_id)
+    await watchlist_cache.forget_title(type_="series", item_id=series_id)
@@ -1,49 +1,159 @@
-from datetime import date
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, Query, status
-from fastapi_cache.decorator import cache
 
-from screenscout.auth.models import User
+from screenscout.auth.models import Principal
 from screenscout.auth.permissions import OwnerAdminManager
+from screenscout.cache.decorator import cache
+from screenscout.cache.keys import item_key_builder, list_key_builder
+from screenscout.catalog import CatalogFacets, CatalogFilters
 from screenscout.database.core import SessionDep
-
-from .models import SeriesCreate, SeriesRead, SeriesUpdate
-from .service import create, delete, get, get_all, update
+from screenscout.etags import entity_etag
+from screenscout.exceptions import EntityDoesNotExist, InvalidCursor, InvalidFieldset
+from screenscout.fieldsets import parse_fieldset
+from screenscout.pagination import (
+    CatalogSort,
+    CursorPage,
+    PaginationMode,
+    SortOrder,
+    decode_cursor,
+)
+from screenscout.responses import json_response
+
+from .models import Series, SeriesCreate, SeriesRead, SeriesSparseRead, SeriesUpdate
+from .service import (
+    COLUMNS,
+    RELATIONS,
+    create,
+    delete,
+    get,
+    get_all,
+    get_facets,
+    get_page,
+    update,
+)
 
 router = APIRouter()
 
 
-@router.get("/", response_model=list[SeriesRead])
-@cache(expire=300)
+@router.get(
+    "/",
+    response_model=list[SeriesRead]
+    | list[SeriesSparseRead]
+    | CursorPage[SeriesRead]
+    | CursorPage[SeriesSparseRead],
+)
+@cache(
+    expire=21600,
+    namespace="series",
+    key_builder=list_key_builder,
+    stale_while_revalidate=86400,
+)
 async def get_all_series(
     db_session: SessionDep,
-    title: str | None = None,
-    production_year: date | None = None,
-    country_id: int | None = None,
-    genre_id: int | None = None,
-    min_rating: float | None = None,
-    max_rating: float | None = None,
+    filters: CatalogFilters,
+    sort: CatalogSort = CatalogSort.ID,
+    order: SortOrder = SortOrder.ASC,
+    paginate: PaginationMode = PaginationMode.OFFSET,
+    after: str | None = None,
     limit: int = Query(20, gt=0),
     offset: int = Query(0, ge=0),
+    fields: str | None = None,
+    include: str | None = None,
 ) -> Any:
-    """Return a paginated list of series with optional filters."""
+    """
+    Return a paginated list of series with optional filters.
+
+    `search` matches titles and descriptions, tolerates typos and orders the
+    results by relevance. With `paginate=cursor` the response is a page object
+    whose `next_cursor` is passed back as `after` to fetch the following page.
+
+    `genre_ids`, `country_ids` and `language_ids` can be repeated and match any
+    of the given values; with `genre_match=all` every genre must match.
+    `year_from` and `year_to` bound the production year, both inclusive.
+
+    `fields` and `include` take comma-separated column and relationship names
+    and restrict every item to them, e.g. `fields=title,poster_url&include=genres`.
+    """
+    try:
+        fieldset = parse_fieldset(fields, include, columns=COLUMNS, relations=RELATIONS)
+    except InvalidFieldset as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    if paginate == PaginationMode.CURSOR:
+        try:
+            cursor = decode_cursor(after, sort=sort, order=order) if after else None
+        except InvalidCursor as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+            )
+
+        series, next_cursor = await get_page(
+            db_session=db_session,
+            **filters,
+            sort=sort,
+            order=order,
+            after=cursor,
+            limit=limit,
+            fieldset=fieldset,
+        )
+        if fieldset:
+            return json_response(
+                CursorPage[SeriesSparseRead],
+                {
+                    "items": [fieldset.select(item) for item in series],
+                    "next_cursor": next_cursor,
+                },
+                exclude_unset=True,
+            )
+        return json_response(
+            CursorPage[SeriesRead],
+            {"items": series, "next_cursor": next_cursor},
+        )
+
     series = await get_all(
         db_session=db_session,
-        title=title,
-        production_year=production_year,
-        country_id=country_id,
-        genre_id=genre_id,
-        min_rating=min_rating,
-        max_rating=max_rating,
+        **filters,
+        sort=sort,
+        order=order,
         limit=limit,
         offset=offset,
+        fieldset=fieldset,
     )
-    return series
+    if fieldset:
+        return json_response(
+            list[SeriesSparseRead],
+            [fieldset.select(item) for item in series],
+            exclude_unset=True,
+        )
+    return json_response(list[SeriesRead], series)
+
+
+@router.get("/facets", response_model=CatalogFacets)
+@cache(
+    expire=21600,
+    namespace="series",
+    key_builder=list_key_builder,
+    stale_while_revalidate=86400,
+)
+async def get_series_facets(db_session: SessionDep, filters: CatalogFilters) -> Any:
+    """
+    Return how many series match the given filters per genre, country,
+    language, production year and whole rating point, in one round trip.
+    """
+    facets = await get_facets(db_session=db_session, **filters)
+
+    return json_response(CatalogFacets, facets)
 
 
 @router.get("/{series_id}", response_model=SeriesRead)
-@cache(expire=300)
+@cache(
+    expire=21600,
+    namespace="series",
+    key_builder=item_key_builder("series_id"),
+    stale_while_revalidate=86400,
+    etag=entity_etag(Series, namespace="series", parameter="series_id"),
+)
 async def get_series(db_session: SessionDep, series_id: int) -> Any:
     """Retrieve information about a series by its ID."""
     series = await get(db_session=db_session, series_id=series_id)
@@ -53,17 +163,23 @@ async def get_series(db_session: SessionDep, series_id: int) -> Any:
             detail=f"Series with id `{series_id}` does not exist.",
         )
 
-    return series
+    return json_response(SeriesRead, series)
 
 
 @router.post("/", response_model=SeriesRead, status_code=status.HTTP_201_CREATED)
 async def create_series(
     db_session: SessionDep,
     series_in: SeriesCreate,
-    current_user: User = OwnerAdminManager,
+    current_user: Principal = OwnerAdminManager,
 ) -> Any:
     """Create a new series."""
-    series = await create(db_session=db_session, series_in=series_in)
+    try:
+        series = await create(db_session=db_session, series_in=series_in)
+    except EntityDoesNotExist as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        )
 
     return series
 
@@ -73,7 +189,7 @@ async def update_series(
     db_session: SessionDep,
     series_id: int,
     series_in: SeriesUpdate,
-    current_user: User = OwnerAdminManager,
+    current_user: Principal = OwnerAdminManager,
 ) -> Any:
     """Update a series."""
     series = await get(db_session=db_session, series_id=series_id)
@@ -83,14 +199,20 @@ async def update_series(
             detail=f"Series with id `{series_id}` does not exist.",
         )
 
-    series = await update(db_session=db_session, series=series, series_in=series_in)
+    try:
+        series = await update(db_session=db_session, series=series, series_in=series_in)
+    except EntityDoesNotExist as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        )
 
     return series
 
 
 @router.delete("/{series_id}", response_model=None)
 async def delete_series(
-    db_session: SessionDep, series_id: int, current_user: User = OwnerAdminManager
+    db_session: SessionDep, series_id: int, current_user: Principal = OwnerAdminManager
 ) -> None:
     """Delete a series."""
     series = await get(db_session=db_session, series_id=series_id)
@@ -1,5 +1,7 @@
+from datetime import datetime
+
 from pydantic import Field
-from sqlalchemy import Column, ForeignKey, Table, Text
+from sqlalchemy import TIMESTAMP, Column, ForeignKey, Index, Table, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from screenscout.database.core import Base
@@ -9,8 +11,11 @@ from screenscout.series.models import Series
 series_list_series_association = Table(
     "series_list_series",
     Base.metadata,
-    Column("series_list_id", ForeignKey("series_lists.id")),
-    Column("series_id", ForeignKey("series.id")),
+    Column("series_list_id", ForeignKey("series_lists.id"), primary_key=True),
+    Column("series_id", ForeignKey("series.id"), primary_key=True),
+    Index(
+        "ix_series_list_series_series_id_series_list_id", "series_id", "series_list_id"
+    ),
 )
 
 
@@ -20,6 +25,12 @@ class SeriesList(Base):
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
 
     series: Mapped[list["Series"]] = relationship(
         secondary=series_list_series_association
@@ -1,10 +1,19 @@
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from screenscout.cache.service import invalidate
+from screenscout.database.service import get_by_ids, set_links
 from screenscout.series.models import Series
 
-from .models import SeriesList, SeriesListCreate, SeriesListUpdate
+from .models import (
+    SeriesList,
+    SeriesListCreate,
+    SeriesListUpdate,
+    series_list_series_association,
+)
 
 
 async def get(*, db_session: AsyncSession, series_list_id: int) -> SeriesList | None:
@@ -32,20 +41,25 @@ async def create(
 ) -> SeriesList:
     """Creates a new series list."""
     series_list_data = series_list_in.model_dump()
-    series = series_list_data.pop("series")
+    series = await get_by_ids(
+        db_session=db_session, model=Series, ids=series_list_data.pop("series") or []
+    )
     series_list = SeriesList(**series_list_data)
 
     db_session.add(series_list)
+    await db_session.flush()
+
+    await set_links(
+        db_session=db_session,
+        table=series_list_series_association,
+        owner_column="series_list_id",
+        owner_id=series_list.id,
+        target_column="series_id",
+        targets=series,
+    )
+    set_committed_value(series_list, "series", series)
     await db_session.commit()
-    await db_session.refresh(series_list, ["series"])
-
-    for series_id in series:
-        result = await db_session.execute(select(Series).where(Series.id == series_id))
-        series = result.scalars().first()
-        if series is not None:
-            series_list.series.append(series)
-
-    await db_session.commit()
+    await invalidate("series_lists")
 
     return series_list
 
@@ -60,22 +74,33 @@ async def update(
     series_list_data = series_list.dict()
     update_data = series_list_in.model_dump(exclude_unset=True)
 
+    series = None
+    if series_list_in.series is not None:
+        series = await get_by_ids(
+            db_session=db_session, model=Series, ids=series_list_in.series
+        )
+
     for field in series_list_data:
         if field in update_data:
             setattr(series_list, field, update_data[field])
-
-    if series_list_in.series is not None:
-        series_list.series.clear()
-        for series_id in series_list_in.series:
-            result = await db_session.execute(
-                select(Series).where(Series.id == series_id)
-            )
-            series = result.scalars().first()
-            if series:
-                series_list.series.append(series)
-
+    # Bumped even when only links change, as it versions the whole response.
+    series_list.updated_at = func.now()
+
+    await db_session.flush()
+
+    if series is not None:
+        await set_links(
+            db_session=db_session,
+            table=series_list_series_association,
+            owner_column="series_list_id",
+            owner_id=series_list.id,
+            target_column="series_id",
+            targets=series,
+            replace=True,
+        )
+        set_committed_value(series_list, "series", series)
     await db_session.commit()
-    await db_session.refresh(series_list)
+    await invalidate("series_lists", series_list.id)
 
     return series_list
 
@@ -89,3 +114,4 @@ async def delete(*, db_session: AsyncSession, series_list_id: int) -> None:
 
     await db_session.delete(series_list)
     await db_session.commit()
+    await invalidate("series_lists", series_list_id)
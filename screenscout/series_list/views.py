@@ -1,29 +1,38 @@
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, status
-from fastapi_cache.decorator import cache
 
-from screenscout.auth.models import User
+from screenscout.auth.models import Principal
 from screenscout.auth.permissions import OwnerAdminManager
+from screenscout.cache.decorator import cache
+from screenscout.cache.keys import item_key_builder, list_key_builder
 from screenscout.database.core import SessionDep
+from screenscout.etags import entity_etag
+from screenscout.exceptions import EntityDoesNotExist
+from screenscout.responses import json_response
 
-from .models import SeriesListCreate, SeriesListRead, SeriesListUpdate
+from .models import SeriesList, SeriesListCreate, SeriesListRead, SeriesListUpdate
 from .service import create, delete, get, get_all, update
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[SeriesListRead])
-@cache(expire=300)
+@cache(expire=21600, namespace="series_lists", key_builder=list_key_builder)
 async def get_series_lists(db_session: SessionDep) -> Any:
     """Return all series lists in the database."""
     series_lists = await get_all(db_session=db_session)
 
-    return series_lists
+    return json_response(list[SeriesListRead], series_lists)
 
 
 @router.get("/{series_list_id}", response_model=SeriesListRead)
-@cache(expire=300)
+@cache(
+    expire=21600,
+    namespace="series_lists",
+    key_builder=item_key_builder("series_list_id"),
+    etag=entity_etag(SeriesList, namespace="series_lists", parameter="series_list_id"),
+)
 async def get_series_list(db_session: SessionDep, series_list_id: int) -> Any:
     """Retrieve information about a series list by its ID."""
     series_list = await get(db_session=db_session, series_list_id=series_list_id)
@@ -33,17 +42,23 @@ async def get_series_list(db_session: SessionDep, series_list_id: int) -> Any:
             detail=f"Series list with id `{series_list_id}` does not exist.",
         )
 
-    return series_list
+    return json_response(SeriesListRead, series_list)
 
 
 @router.post("/", response_model=SeriesListRead, status_code=status.HTTP_201_CREATED)
 async def create_series_list(
     db_session: SessionDep,
     series_list_in: SeriesListCreate,
-    current_user: User = OwnerAdminManager,
+    current_user: Principal = OwnerAdminManager,
 ) -> Any:
     """Create a new series list."""
-    series_list = await create(db_session=db_session, series_list_in=series_list_in)
+    try:
+        series_list = await create(db_session=db_session, series_list_in=series_list_in)
+    except EntityDoesNotExist as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        )
 
     return series_list
 
@@ -53,7 +68,7 @@ async def update_series_list(
     db_session: SessionDep,
     series_list_id: int,
     series_list_in: SeriesListUpdate,
-    current_user: User = OwnerAdminManager,
+    current_user: Principal = OwnerAdminManager,
 ) -> Any:
     """Update a series list."""
     series_list = await get(db_session=db_session, series_list_id=series_list_id)
@@ -63,16 +78,26 @@ async def update_series_list(
             detail=f"Series list with id `{series_list_id}` does not exist.",
         )
 
-    series_list = await update(
-        db_session=db_session, series_list=series_list, series_list_in=series_list_in
-    )
+    try:
+        series_list = await update(
+            db_session=db_session,
+            series_list=series_list,
+            series_list_in=series_list_in,
+        )
+    except EntityDoesNotExist as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        )
 
     return series_list
 
 
 @router.delete("/{series_list_id}", response_model=None)
 async def delete_series_list(
-    db_session: SessionDep, series_list_id: int, current_user: User = OwnerAdminManager
+    db_session: SessionDep,
+    series_list_id: int,
+    current_user: Principal = OwnerAdminManager,
 ) -> None:
     """Delete a series list."""
     series_list = await get(db_session=db_session, series_list_id=series_list_id)
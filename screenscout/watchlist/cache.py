@@ -0,0 +1,262 @@
+"""
+Module for the write-through watchlist cache.
+
+Each user's watchlist is a Redis sorted set of `{type}:{id}` members scored by
+when they were added, so reading it in order is a single `ZRANGE`. A sentinel
+member tells a loaded empty watchlist from one that is not cached. The add
+and remove services update the set after committing; it is loaded from
+Postgres on the first read and expires after `WATCHLIST_CACHE_TTL` seconds
+without reads.
+
+The first load runs under `WATCH`, so a write made meanwhile aborts it rather
+than being overwritten by the older rows. Removals always modify the key, even
+when it is not cached, for the same reason.
+
+Titles are kept in one Redis hash per item type, shared by all users. Movie
+and series updates remove their entry. If Redis is unavailable, everything is
+read from Postgres.
+"""
+
+import logging
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TypeVar
+
+from fastapi_cache import FastAPICache
+from redis.exceptions import WatchError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from screenscout.cache.backends import TwoTierBackend
+from screenscout.config import settings
+from screenscout.movie.models import Movie
+from screenscout.series.models import Series
+
+from .models import UserWatchlistMovieAssociation, UserWatchlistSeriesAssociation
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Scored below any real `added_at`, so it is always the first member.
+LOADED = "*"
+# Added and removed in one transaction by `remove_entry`, never read.
+REMOVED = "-"
+
+TITLED_MODELS: dict[str, type[Movie] | type[Series]] = {
+    "movie": Movie,
+    "series": Series,
+}
+
+
+@dataclass(frozen=True)
+class WatchlistEntry:
+    type: str
+    item_id: int
+    added_at: datetime
+
+    @property
+    def member(self) -> str:
+        return f"{self.type}:{self.item_id}"
+
+
+def _backend() -> TwoTierBackend | None:
+    try:
+        backend = FastAPICache.get_backend()
+    except AssertionError:
+        return None
+
+    return backend if isinstance(backend, TwoTierBackend) else None
+
+
+def _key(user_id: int) -> str:
+    return f"{FastAPICache.get_prefix()}:watchlist:{user_id}"
+
+
+def _titles_key(type_: str) -> str:
+    return f"{FastAPICache.get_prefix()}:watchlist:titles:{type_}"
+
+
+async def _guarded(
+    backend: TwoTierBackend, operation: Callable[[], Awaitable[T]], default: T
+) -> T:
+    try:
+        return await backend.call(operation)
+    except Exception:
+        logger.warning("Watchlist cache unavailable", exc_info=True)
+        return default
+
+
+async def _load_entries(
+    *, db_session: AsyncSession, user_id: int
+) -> list[WatchlistEntry]:
+    movies = await db_session.execute(
+        select(
+            UserWatchlistMovieAssociation.movie_id,
+            UserWatchlistMovieAssociation.added_at,
+        ).where(UserWatchlistMovieAssociation.user_id == user_id)
+    )
+    series = await db_session.execute(
+        select(
+            UserWatchlistSeriesAssociation.series_id,
+            UserWatchlistSeriesAssociation.added_at,
+        ).where(UserWatchlistSeriesAssociation.user_id == user_id)
+    )
+    entries = [
+        *(WatchlistEntry("movie", id_, added_at) for id_, added_at in movies.all()),
+        *(WatchlistEntry("series", id_, added_at) for id_, added_at in series.all()),
+    ]
+
+    return sorted(entries, key=lambda entry: entry.added_at)
+
+
+async def get_entries(
+    *, db_session: AsyncSession, user_id: int
+) -> list[WatchlistEntry]:
+    """Returns a user's watchlist entries, oldest first."""
+    backend = _backend()
+    if backend is None:
+        return await _load_entries(db_session=db_session, user_id=user_id)
+
+    redis = backend.redis
+    key = _key(user_id)
+
+    async def read() -> list[tuple[bytes, float]]:
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.zrange(key, 0, -1, withscores=True)
+            pipe.expire(key, settings.WATCHLIST_CACHE_TTL)
+            members, _ = await pipe.execute()
+            return list(members)
+
+    cached: list[tuple[bytes, float]] = await _guarded(backend, read, [])
+    if cached and cached[0][0].decode() == LOADED:
+        entries = []
+        for member, score in cached[1:]:
+            type_, _, item_id = member.decode().partition(":")
+            added_at = datetime.fromtimestamp(score, tz=timezone.utc)
+            entries.append(WatchlistEntry(type_, int(item_id), added_at))
+        return entries
+
+    # Only the Redis commands go through the breaker, so a slow query is not
+    # counted against Redis. The pipeline keeps its connection, and the watch,
+    # across the query.
+    async with redis.pipeline(transaction=True) as pipe:
+        try:
+            await backend.call(lambda: pipe.watch(key))
+        except Exception:
+            logger.warning("Watchlist cache unavailable", exc_info=True)
+            return await _load_entries(db_session=db_session, user_id=user_id)
+
+        entries = await _load_entries(db_session=db_session, user_id=user_id)
+
+        async def fill() -> None:
+            pipe.multi()
+            pipe.delete(key)
+            pipe.zadd(
+                key,
+                {
+                    LOADED: 0,
+                    **{e.member: e.added_at.timestamp() for e in entries},
+                },
+            )
+            pipe.expire(key, settings.WATCHLIST_CACHE_TTL)
+            try:
+                await pipe.execute()
+            except WatchError:
+                pass
+
+        await _guarded(backend, fill, None)
+
+    return entries
+
+
+async def add_entry(*, user_id: int, entry: WatchlistEntry) -> None:
+    """Writes an entry added in Postgres through to the cached watchlist."""
+    backend = _backend()
+    if backend is None:
+        return
+
+    key = _key(user_id)
+
+    async def write() -> None:
+        # A set created here has no sentinel and is reloaded on the next read.
+        async with backend.redis.pipeline(transaction=False) as pipe:
+            pipe.zadd(key, {entry.member: entry.added_at.timestamp()})
+            pipe.expire(key, settings.WATCHLIST_CACHE_TTL)
+            await pipe.execute()
+
+    await _guarded(backend, write, None)
+
+
+async def remove_entry(*, user_id: int, type_: str, item_id: int) -> None:
+    """Removes an entry deleted in Postgres from the cached watchlist."""
+    backend = _backend()
+    if backend is None:
+        return
+
+    key = _key(user_id)
+
+    async def write() -> None:
+        # Removing a member from a missing set changes nothing, so it would not
+        # abort a concurrent first load. Adding the placeholder first always
+        # modifies the key; the set is deleted again if it ends up empty.
+        async with backend.redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(key, {REMOVED: 0})
+            pipe.zrem(key, REMOVED, f"{type_}:{item_id}")
+            await pipe.execute()
+
+    await _guarded(backend, write, None)
+
+
+async def get_titles(
+    *, db_session: AsyncSession, type_: str, ids: list[int]
+) -> dict[int, str]:
+    """Returns the titles of movies or series by id, skipping deleted ones."""
+    if not ids:
+        return {}
+
+    backend = _backend()
+    titles: dict[int, str] = {}
+    if backend is not None:
+        not_cached: list[bytes | None] = [None] * len(ids)
+        cached = await _guarded(
+            backend, lambda: backend.redis.hmget(_titles_key(type_), ids), not_cached
+        )
+        titles = {
+            id_: title.decode() for id_, title in zip(ids, cached) if title is not None
+        }
+
+    missing = [id_ for id_ in ids if id_ not in titles]
+    if not missing:
+        return titles
+
+    model = TITLED_MODELS[type_]
+    result = await db_session.execute(
+        select(model.id, model.title).where(model.id.in_(missing))
+    )
+    loaded = dict(result.tuples().all())
+    titles.update(loaded)
+
+    if backend is not None and loaded:
+
+        async def fill() -> None:
+            async with backend.redis.pipeline(transaction=False) as pipe:
+                pipe.hset(_titles_key(type_), mapping=loaded)
+                pipe.expire(_titles_key(type_), settings.WATCHLIST_CACHE_TTL)
+                await pipe.execute()
+
+        await _guarded(backend, fill, None)
+
+    return titles
+
+
+async def forget_title(*, type_: str, item_id: int) -> None:
+    """Drops the cached title of a movie or series that changed."""
+    backend = _backend()
+    if backend is None:
+        return
+
+    await _guarded(
+        backend, lambda: backend.redis.hdel(_titles_key(type_), str(item_id)), None
+    )
@@ -17,7 +17,9 @@ class UserWatchlistMovieAssociation(Base):
     __tablename__ = "user_watchlist_movies"
 
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
-    movie_id: Mapped[int] = mapped_column(ForeignKey("movies.id"), primary_key=True)
+    movie_id: Mapped[int] = mapped_column(
+        ForeignKey("movies.id"), primary_key=True, index=True
+    )
     added_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), default=func.now(), nullable=False
     )
@@ -30,7 +32,9 @@ class UserWatchlistSeriesAssociation(Base):
     __tablename__ = "user_watchlist_series"
 
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
-    series_id: Mapped[int] = mapped_column(ForeignKey("series.id"), primary_key=True)
+    series_id: Mapped[int] = mapped_column(
+        ForeignKey("series.id"), primary_key=True, index=True
+    )
     added_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), default=func.now(), nullable=False
     )
@@ -5,11 +5,10 @@ from sqlalchemy import exists
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
 
-from screenscout.auth.models import User
 from screenscout.exceptions import EntityAlreadyExists
 
+from . import cache
 from .models import UserWatchlistMovieAssociation, UserWatchlistSeriesAssociation
 
 
@@ -36,6 +35,10 @@ async def create_movie_watchlist_item(
 
     db_session.add(new_entry)
     await db_session.commit()
+    await cache.add_entry(
+        user_id=user_id,
+        entry=cache.WatchlistEntry("movie", movie_id, new_entry.added_at),
+    )
 
     return {"message": "Movie added to watchlist successfully"}
 
@@ -63,6 +66,10 @@ async def create_series_watchlist_item(
 
     db_session.add(new_entry)
     await db_session.commit()
+    await cache.add_entry(
+        user_id=user_id,
+        entry=cache.WatchlistEntry("series", series_id, new_entry.added_at),
+    )
 
     return {"message": "Series added to watchlist successfully"}
 
@@ -73,49 +80,30 @@ async def get_user_watchlist(
     """
     Retrieves the user's watchlist, including both movies and series.
 
-    This function fetches the user's watchlist from the database, including both movies
-    and series that the user has added. The results are returned in a sorted list by
-    the date they were added.
+    The entries are read from the user's cached watchlist, which is loaded from
+    the database on first use, and the titles from the shared title cache. The
+    results are returned in a sorted list by the date they were added.
     """
-    result = await db_session.execute(
-        select(User)
-        .options(
-            selectinload(User.watchlist_movies).selectinload(
-                UserWatchlistMovieAssociation.movie
-            ),
-            selectinload(User.watchlist_series).selectinload(
-                UserWatchlistSeriesAssociation.series
-            ),
-        )
-        .where(User.id == user_id)
-    )
-    user = result.scalars().first()
-
-    watchlist = []
-    if user:
-        for assoc in user.watchlist_movies:
-            watchlist.append(
-                {
-                    "type": "movie",
-                    "title": assoc.movie.title,
-                    "added_at": assoc.added_at,
-                    # "details": assoc.movie,
-                }
-            )
-
-        for assoc in user.watchlist_series:  # type: ignore
-            watchlist.append(
-                {
-                    "type": "series",
-                    "title": assoc.series.title,  # type: ignore
-                    "added_at": assoc.added_at,
-                    # "details": assoc.series,
-                }
-            )
+    entries = await cache.get_entries(db_session=db_session, user_id=user_id)
 
-        watchlist.sort(key=lambda x: x["added_at"])  # type: ignore
+    titles = {
+        type_: await cache.get_titles(
+            db_session=db_session,
+            type_=type_,
+            ids=[entry.item_id for entry in entries if entry.type == type_],
+        )
+        for type_ in cache.TITLED_MODELS
+    }
 
-    return watchlist
+    return [
+        {
+            "type": entry.type,
+            "title": titles[entry.type][entry.item_id],
+            "added_at": entry.added_at,
+        }
+        for entry in entries
+        if entry.item_id in titles[entry.type]
+    ]
 
 
 async def delete_watchlist_item(
@@ -151,6 +139,7 @@ async def delete_watchlist_item(
 
         await db_session.delete(association)
         await db_session.commit()
+        await cache.remove_entry(user_id=user_id, type_=item_type, item_id=item_id)
     except NoResultFound:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Item not found in watchlist"
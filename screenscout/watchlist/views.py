@@ -2,7 +2,7 @@ from typing import Any
 
 from fastapi import APIRouter, HTTPException, status
 
-from screenscout.auth.models import User
+from screenscout.auth.models import Principal
 from screenscout.auth.permissions import OwnerAdminManagerMember
 from screenscout.database.core import SessionDep
 from screenscout.exceptions import EntityAlreadyExists
@@ -22,7 +22,9 @@ router = APIRouter()
 
 @router.post("/movies/{movie_id}")
 async def add_movie_to_watchlist(
-    db_session: SessionDep, movie_id: int, current_user: User = OwnerAdminManagerMember
+    db_session: SessionDep,
+    movie_id: int,
+    current_user: Principal = OwnerAdminManagerMember,
 ) -> dict[str, str]:
     """
     Adds a movie to the current user's watchlist.
@@ -47,7 +49,9 @@ async def add_movie_to_watchlist(
 
 @router.post("/series/{series_id}")
 async def add_series_to_watchlist(
-    db_session: SessionDep, series_id: int, current_user: User = OwnerAdminManagerMember
+    db_session: SessionDep,
+    series_id: int,
+    current_user: Principal = OwnerAdminManagerMember,
 ) -> dict[str, str]:
     """
     Adds a series to the current user's watchlist.
@@ -72,7 +76,7 @@ async def add_series_to_watchlist(
 
 @router.get("/", response_model=WatchlistRead)
 async def get_watchlist(
-    db_session: SessionDep, current_user: User = OwnerAdminManagerMember
+    db_session: SessionDep, current_user: Principal = OwnerAdminManagerMember
 ) -> Any:
     """
     Retrieves the current user's watchlist.
@@ -95,7 +99,7 @@ async def remove_from_watchlist(
     db_session: SessionDep,
     item_id: int,
     item_type: str,
-    current_user: User = OwnerAdminManagerMember,
+    current_user: Principal = OwnerAdminManagerMember,
 ) -> None:
     """
     Removes an item (movie or series) from the current user's watchlist.
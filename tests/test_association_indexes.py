@@ -0,0 +1,166 @@
+"""
+The catalog filters, relationship loads and foreign key lookups must be
+answered by the primary keys and indexes added to the association tables.
+
+Sequential scans are disabled for each query, so that the planner picks an
+index whenever one can answer it, however few rows the test database has.
+"""
+
+import json
+from typing import Any
+
+import pytest
+from sqlalchemy import Select, Table, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from screenscout.country.models import Country
+from screenscout.genre.models import Genre
+from screenscout.movie.models import (
+    Movie,
+    movie_country_association,
+    movie_genre_association,
+    movie_language_association,
+)
+from screenscout.movie_list.models import movie_list_movie_association
+from screenscout.person.models import (
+    person_career_role_association,
+    person_genre_association,
+)
+from screenscout.series.models import (
+    Series,
+    series_country_association,
+    series_director_association,
+    series_genre_association,
+    series_language_association,
+)
+from screenscout.series_list.models import series_list_series_association
+from screenscout.watchlist.models import (
+    UserWatchlistMovieAssociation,
+    UserWatchlistSeriesAssociation,
+)
+
+# (table, owner column, target column)
+ASSOCIATION_TABLES = [
+    (movie_genre_association, "movie_id", "genre_id"),
+    (movie_country_association, "movie_id", "country_id"),
+    (movie_language_association, "movie_id", "language_id"),
+    (series_genre_association, "series_id", "genre_id"),
+    (series_country_association, "series_id", "country_id"),
+    (series_language_association, "series_id", "language_id"),
+    (series_director_association, "series_id", "director_id"),
+    (person_genre_association, "person_id", "genre_id"),
+    (person_career_role_association, "person_id", "career_role_id"),
+    (movie_list_movie_association, "movie_list_id", "movie_id"),
+    (series_list_series_association, "series_list_id", "series_id"),
+]
+
+
+def _index_names(node: dict[str, Any]) -> set[str]:
+    names = {node["Index Name"]} if "Index Name" in node else set()
+    for child in node.get("Plans", []):
+        names |= _index_names(child)
+
+    return names
+
+
+async def used_indexes(
+    db_session: AsyncSession, query: Select  # type: ignore[type-arg]
+) -> set[str]:
+    """Returns the names of the indexes in the plan of `query`."""
+    await db_session.execute(text("SET LOCAL enable_seqscan = off"))
+
+    sql = query.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    result = await db_session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return _index_names(plan[0]["Plan"])
+
+
+@pytest.mark.parametrize(
+    "table, owner, target",
+    ASSOCIATION_TABLES,
+    ids=[table.name for table, _, _ in ASSOCIATION_TABLES],
+)
+async def test_links_are_loaded_by_owner_through_the_primary_key(
+    db_session: AsyncSession, table: Table, owner: str, target: str
+) -> None:
+    # The query selectinload issues for a page of owners.
+    query = select(table.c[owner], table.c[target]).where(table.c[owner].in_([1, 2, 3]))
+
+    assert f"pk_{table.name}" in await used_indexes(db_session, query)
+
+
+@pytest.mark.parametrize(
+    "table, owner, target",
+    ASSOCIATION_TABLES,
+    ids=[table.name for table, _, _ in ASSOCIATION_TABLES],
+)
+async def test_links_are_found_by_target_through_the_reverse_index(
+    db_session: AsyncSession, table: Table, owner: str, target: str
+) -> None:
+    query = select(table.c[owner]).where(table.c[target] == 1)
+
+    assert f"ix_{table.name}_{target}_{owner}" in await used_indexes(db_session, query)
+
+
+@pytest.mark.parametrize(
+    "query, table",
+    [
+        (
+            select(Movie.id).where(Movie.genres.any(Genre.id == 1)),
+            movie_genre_association,
+        ),
+        (
+            select(Movie.id).where(Movie.country.any(Country.id == 1)),
+            movie_country_association,
+        ),
+        (
+            select(Series.id).where(Series.genres.any(Genre.id == 1)),
+            series_genre_association,
+        ),
+        (
+            select(Series.id).where(Series.country.any(Country.id == 1)),
+            series_country_association,
+        ),
+    ],
+    ids=["movie-genre", "movie-country", "series-genre", "series-country"],
+)
+async def test_relation_filters_do_not_scan_the_link_table(
+    db_session: AsyncSession, query: Select, table: Table  # type: ignore[type-arg]
+) -> None:
+    # Depending on the plan, links are probed by (owner, target) through the
+    # primary key or by target through the reverse index.
+    indexes = {f"pk_{table.name}", *(index.name for index in table.indexes)}
+
+    assert indexes & await used_indexes(db_session, query)
+
+
+@pytest.mark.parametrize(
+    "query, index",
+    [
+        (select(Movie.id).where(Movie.director_id == 1), "ix_movies_director_id"),
+        (
+            select(UserWatchlistMovieAssociation.user_id).where(
+                UserWatchlistMovieAssociation.movie_id == 1
+            ),
+            "ix_user_watchlist_movies_movie_id",
+        ),
+        (
+            select(UserWatchlistSeriesAssociation.user_id).where(
+                UserWatchlistSeriesAssociation.series_id == 1
+            ),
+            "ix_user_watchlist_series_series_id",
+        ),
+    ],
+    ids=["movies.director_id", "watchlist.movie_id", "watchlist.series_id"],
+)
+async def test_foreign_key_lookups_use_an_index(
+    db_session: AsyncSession, query: Select, index: str  # type: ignore[type-arg]
+) -> None:
+    assert index in await used_indexes(db_session, query)
@@ -0,0 +1,116 @@
+"""
+Signing up and updating a profile must each write the user in one statement,
+without looking it up first or reading it back after committing.
+
+Requests go through the app with its database session replaced by the test
+session, whose statements are counted. Savepoints, which stand in for the
+commits of a rolled back test, are not counted.
+"""
+
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+
+import httpx
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from screenscout.auth.models import User
+from screenscout.config import settings
+from screenscout.database.core import get_db
+from screenscout.main import app
+from screenscout.security import create_access_token
+
+TRANSACTION_CONTROL = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+@pytest.fixture
+def queries(db_session: AsyncSession) -> Iterator[list[str]]:
+    """The statements the test session executes, as they are run."""
+    statements: list[str] = []
+
+    def record(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        if not statement.lstrip().upper().startswith(TRANSACTION_CONTROL):
+            statements.append(statement)
+
+    connection = db_session.bind.sync_connection  # type: ignore[union-attr]
+    event.listen(connection, "before_cursor_execute", record)
+    yield statements
+    event.remove(connection, "before_cursor_execute", record)
+
+
+@pytest.fixture
+async def client(db_session: AsyncSession) -> AsyncIterator[httpx.AsyncClient]:
+    async def get_test_db() -> AsyncIterator[AsyncSession]:
+        yield db_session
+
+    app.dependency_overrides[get_db] = get_test_db
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url=f"http://test{settings.API_V1_STR}",
+    ) as client:
+        yield client
+    app.dependency_overrides.pop(get_db)
+
+
+@pytest.fixture
+async def user(db_session: AsyncSession) -> User:
+    user = User(username="reader", email="reader@example.com", password="-")
+    db_session.add(user)
+    await db_session.flush()
+
+    return user
+
+
+def auth_headers(user: User) -> dict[str, str]:
+    token = create_access_token(
+        {"user_id": user.id, "role": user.role, "token_version": user.token_version}
+    )
+
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def test_signup_inserts_the_user_in_one_statement(
+    client: httpx.AsyncClient, queries: list[str]
+) -> None:
+    response = await client.post(
+        "/auth/signup",
+        json={
+            "username": "newcomer",
+            "email": "newcomer@example.com",
+            "password": "password",
+        },
+    )
+
+    assert response.status_code == 201
+    assert response.json()["username"] == "newcomer"
+    assert len(queries) == 1
+
+
+@pytest.mark.parametrize(
+    "taken", [{"username": "reader"}, {"email": "reader@example.com"}]
+)
+async def test_signup_reports_a_taken_field_from_the_one_statement(
+    client: httpx.AsyncClient, user: User, queries: list[str], taken: dict[str, str]
+) -> None:
+    body = {"username": "newcomer", "email": "newcomer@example.com"} | taken
+    response = await client.post("/auth/signup", json=body | {"password": "password"})
+
+    assert response.status_code == 400
+    assert next(iter(taken.values())) in response.json()["detail"]
+    assert len(queries) == 1
+
+
+async def test_profile_update_updates_the_user_in_one_statement(
+    client: httpx.AsyncClient, user: User, queries: list[str]
+) -> None:
+    response = await client.put(
+        f"/users/{user.id}",
+        json={"username": "renamed", "email": None, "password": None},
+        headers=auth_headers(user),
+    )
+
+    assert response.status_code == 200
+    assert response.json()["username"] == "renamed"
+    # Loading the principal, without a cache, and the update itself.
+    assert len(queries) == 2
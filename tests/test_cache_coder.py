@@ -0,0 +1,33 @@
+import pytest
+
+from screenscout.cache.coder import Compression, compressed_coder
+from screenscout.responses import JSONBytesResponse
+
+BODY = b'[{"title":"' + b"A long enough title to compress " * 8 + b'"}]'
+
+
+@pytest.mark.parametrize("compression", [Compression.NONE, Compression.ZLIB])
+def test_entries_written_compressed_are_read_after_compression_changes(
+    compression: Compression,
+) -> None:
+    written = compressed_coder(Compression.ZLIB, min_size=0).encode(
+        JSONBytesResponse(BODY)
+    )
+    coder = compressed_coder(compression, min_size=0)
+
+    assert written != BODY
+    assert coder.decode_as_type(written, type_=None).body == BODY
+    assert coder.decode(written) == [{"title": BODY[11:-3].decode()}]
+
+
+def test_uncompressed_entries_are_read_unchanged() -> None:
+    coder = compressed_coder(Compression.ZLIB, min_size=len(BODY) + 1)
+    written = coder.encode(JSONBytesResponse(BODY))
+
+    assert written == BODY
+    assert (
+        compressed_coder(Compression.NONE, min_size=0)
+        .decode_as_type(written, type_=None)
+        .body
+        == BODY
+    )
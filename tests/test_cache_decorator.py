@@ -0,0 +1,132 @@
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from starlette.requests import Request
+
+from screenscout.cache.coder import ORJSONCoder
+from screenscout.cache.decorator import cache
+from screenscout.cache.keys import item_key_builder, list_key_builder
+from screenscout.responses import JSONBytesResponse
+
+
+class UnavailableBackend(InMemoryBackend):
+    async def get(self, key: str) -> Any:
+        raise ConnectionError("Redis is down")
+
+    async def get_with_ttl(self, key: str) -> Any:
+        raise ConnectionError("Redis is down")
+
+    async def set(self, key: str, value: Any, expire: int | None = None) -> None:
+        raise ConnectionError("Redis is down")
+
+
+@pytest.fixture
+def unavailable_cache() -> Iterator[None]:
+    FastAPICache.init(UnavailableBackend(), prefix="test", coder=ORJSONCoder)
+    yield
+    FastAPICache.reset()
+
+
+@pytest.mark.parametrize("key_builder", [list_key_builder, item_key_builder("item_id")])
+async def test_endpoint_is_called_uncached_when_the_key_cannot_be_built(
+    unavailable_cache: None, key_builder: Any
+) -> None:
+    calls = 0
+
+    @cache(expire=60, namespace="items", key_builder=key_builder)
+    async def get_item(item_id: int) -> JSONBytesResponse:
+        nonlocal calls
+        calls += 1
+        return JSONBytesResponse(b'{"id": %d}' % item_id)
+
+    response = await get_item(item_id=1)
+
+    assert response.body == b'{"id": 1}'
+    assert calls == 1
+
+
+@pytest.fixture
+def memory_cache() -> Iterator[None]:
+    backend = InMemoryBackend()
+    FastAPICache.init(backend, prefix="test", coder=ORJSONCoder)
+    yield
+    FastAPICache.reset()
+    # The store is shared by every instance.
+    backend._store.clear()
+
+
+def get_request(path: str, **headers: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "scheme": "http",
+            "server": ("testserver", 80),
+            "path": path,
+            "query_string": b"",
+            "headers": [
+                (name.replace("_", "-").encode(), value.encode())
+                for name, value in headers.items()
+            ],
+        }
+    )
+
+
+class CountingEndpoint:
+    """A cached detail endpoint that counts its calls and ETag lookups."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.etag_lookups = 0
+
+        async def etag(kwargs: dict[str, Any]) -> str | None:
+            self.etag_lookups += 1
+            return '"v1"'
+
+        @cache(
+            expire=60,
+            namespace="items",
+            key_builder=item_key_builder("item_id"),
+            etag=etag,
+        )
+        async def get_item(item_id: int) -> JSONBytesResponse:
+            self.calls += 1
+            return JSONBytesResponse(b'{"id": %d}' % item_id)
+
+        self.get_item = get_item
+
+
+async def test_hits_carry_the_stored_etag_without_looking_it_up(
+    memory_cache: None,
+) -> None:
+    endpoint = CountingEndpoint()
+
+    miss = await endpoint.get_item(item_id=1, __cache_request=get_request("/items/1"))
+    hit = await endpoint.get_item(item_id=1, __cache_request=get_request("/items/1"))
+    revalidated = await endpoint.get_item(
+        item_id=1, __cache_request=get_request("/items/1", if_none_match='"v1"')
+    )
+
+    assert miss.headers["ETag"] == hit.headers["ETag"] == '"v1"'
+    assert hit.body == b'{"id": 1}'
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == '"v1"'
+    assert endpoint.calls == 1
+    assert endpoint.etag_lookups == 1
+
+
+async def test_matching_revalidation_of_an_uncached_entity_skips_the_endpoint(
+    memory_cache: None,
+) -> None:
+    endpoint = CountingEndpoint()
+
+    response = await endpoint.get_item(
+        item_id=1, __cache_request=get_request("/items/1", if_none_match='"v1"')
+    )
+
+    assert response.status_code == 304
+    assert endpoint.calls == 0
+    assert endpoint.etag_lookups == 1
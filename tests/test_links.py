@@ -0,0 +1,34 @@
+"""
+Link targets are validated against in-memory reference snapshots, which may
+still hold rows deleted since. Writing a link to such a row must report it as
+missing rather than fail with the foreign key violation.
+"""
+
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from screenscout.database.service import set_links
+from screenscout.exceptions import EntityDoesNotExist
+from screenscout.genre.models import Genre
+from screenscout.person.models import Person, person_genre_association
+
+
+async def test_links_to_deleted_targets_are_reported_as_missing(
+    db_session: AsyncSession,
+) -> None:
+    person = Person(name="Link Test Director")
+    genre = Genre(name="Link Test Vanished Genre")
+    db_session.add_all([person, genre])
+    await db_session.flush()
+    await db_session.execute(delete(Genre).where(Genre.id == genre.id))
+
+    with pytest.raises(EntityDoesNotExist, match=f"Genre with id `{genre.id}`"):
+        await set_links(
+            db_session=db_session,
+            table=person_genre_association,
+            owner_column="person_id",
+            owner_id=person.id,
+            target_column="genre_id",
+            targets=[genre],
+        )
@@ -0,0 +1,19 @@
+import logging
+
+import pytest
+
+from screenscout.ratelimit import Limit, TokenBucketLimiter
+
+
+async def test_local_fallback_is_logged_once_per_outage(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    limiter = TokenBucketLimiter()
+    limit = Limit(burst=3, rate=1.0)
+
+    with caplog.at_level(logging.WARNING, logger="screenscout.ratelimit"):
+        waits = [await limiter.hit({"client": limit}) for _ in range(4)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] > 0
+    assert len(caplog.records) == 1